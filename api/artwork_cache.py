@@ -0,0 +1,237 @@
+"""
+Artwork Cache for OG Image Generation
+Shared, bounded cache of decoded artwork tiles backed by a disk cache
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+from PIL import Image
+
+
+class ArtworkCache:
+    """
+    Two-level cache for playlist cover artwork.
+
+    - Memory: LRU of decoded RGBA tiles already resized to `tile_size`
+    - Disk: raw downloaded bytes keyed by a hash of the URL, capped at
+      `max_disk_bytes`; the least recently used files (by mtime) are
+      evicted when a write goes over the cap
+
+    Downloads share one pooled aiohttp session, run concurrently, and are
+    single-flight per URL, so simultaneous renders of playlists with the
+    same chart artwork fetch and decode it only once.
+    """
+
+    def __init__(
+        self,
+        tile_size: int,
+        max_tiles: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None
+    ):
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles or int(os.getenv("ARTWORK_CACHE_SIZE", "256"))
+        self.cache_dir = cache_dir or os.getenv("ARTWORK_CACHE_DIR", "/tmp/og-artwork-cache")
+        self.max_disk_bytes = max_disk_bytes or int(
+            os.getenv("ARTWORK_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+        )
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Disk usage, counted on the first write and kept up to date after
+        self._disk_bytes: Optional[int] = None
+        self._disk_lock = threading.Lock()
+
+        self._tiles: "OrderedDict[str, Tuple[Image.Image, int]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {
+            "requests": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "downloads": 0,
+            "failures": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+            "disk_evictions": 0,
+        }
+
+    def get_stats(self) -> Dict:
+        """Cache hit rate and bytes saved"""
+        stats = dict(self.stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = round(hits / stats["requests"], 3) if stats["requests"] else 0.0
+        stats["tiles_cached"] = len(self._tiles)
+        return stats
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Long-lived session with a bounded connection pool"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+            )
+        return self._session
+
+    def _disk_path(self, url: str) -> str:
+        """Disk cache location for a URL"""
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest())
+
+    async def get_tiles(self, urls: List[str], executor: Optional[Executor] = None) -> List[Image.Image]:
+        """
+        Fetch tiles for several URLs concurrently, preserving order.
+        Artwork that fails to download or decode is left out.
+        """
+        tiles = await asyncio.gather(*(self.get_tile(url, executor) for url in urls))
+        return [tile for tile in tiles if tile is not None]
+
+    async def get_tile(self, url: str, executor: Optional[Executor] = None) -> Optional[Image.Image]:
+        """Get a decoded, resized tile for a URL (single-flight per URL)"""
+        self.stats["requests"] += 1
+
+        cached = self._tiles.get(url)
+        if cached is not None:
+            self._tiles.move_to_end(url)
+            self.stats["memory_hits"] += 1
+            self.stats["bytes_saved"] += cached[1]
+            return cached[0]
+
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            tile = await self._load(url, executor)
+            future.set_result(tile)
+            return tile
+        except Exception as e:
+            print(f"Failed to load artwork {url}: {e}")
+            self.stats["failures"] += 1
+            future.set_result(None)
+            return None
+        finally:
+            # On cancellation, release callers waiting on this load
+            if not future.done():
+                future.set_result(None)
+            self._inflight.pop(url, None)
+
+    async def _load(self, url: str, executor: Optional[Executor]) -> Optional[Image.Image]:
+        """Load raw bytes from disk or network, then decode off the event loop"""
+        loop = asyncio.get_running_loop()
+        path = self._disk_path(url)
+
+        data = await loop.run_in_executor(executor, self._read_disk, path)
+        if data is not None:
+            self.stats["disk_hits"] += 1
+            self.stats["bytes_saved"] += len(data)
+        else:
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}")
+                data = await response.read()
+            self.stats["downloads"] += 1
+            self.stats["bytes_downloaded"] += len(data)
+            await loop.run_in_executor(executor, self._write_disk, path, data)
+
+        tile = await loop.run_in_executor(executor, self._decode_tile, data)
+
+        self._tiles[url] = (tile, len(data))
+        self._tiles.move_to_end(url)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+
+        return tile
+
+    def _decode_tile(self, data: bytes) -> Image.Image:
+        """Decode artwork and resize it to the grid tile size"""
+        img = Image.open(BytesIO(data)).convert("RGBA")
+        return img.resize((self.tile_size, self.tile_size), Image.LANCZOS)
+
+    def _read_disk(self, path: str) -> Optional[bytes]:
+        """Read cached bytes, or None on a miss"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        # Mark as recently used so eviction keeps popular artwork
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write_disk(self, path: str, data: bytes):
+        """Write bytes atomically so readers never see partial files"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to write artwork cache {path}: {e}")
+            return
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+            else:
+                self._disk_bytes += len(data)
+
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _scan_disk(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every cached file"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError as e:
+            print(f"Failed to scan artwork cache {self.cache_dir}: {e}")
+        return entries
+
+    def _evict_disk(self):
+        """
+        Delete the oldest files until usage is back under 90% of the cap.
+        Recounts from disk, since other workers may share the directory.
+        """
+        entries = self._scan_disk()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 0.9
+
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.stats["disk_evictions"] += 1
+
+        self._disk_bytes = total
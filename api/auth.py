@@ -2,13 +2,17 @@
 Google OAuth and JWT authentication module
 """
 
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from fastapi import HTTPException, Header
-from google.oauth2 import id_token
-from google.auth.transport import requests
+from google.auth import jwt as google_jwt
+import aiohttp
+import asyncio
 import jwt
 import os
+import re
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,16 +20,115 @@ load_dotenv()
 
 # Configuration
 GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
+# Google's public signing certs (key id -> PEM); override to point at a local stand-in
+GOOGLE_CERTS_URL = os.environ.get("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
 JWT_SECRET = os.environ.get("JWT_SECRET", "dev-jwt-secret-change-me-in-production")
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_TOKEN_EXPIRE_DAYS = 30
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "4096"))
+
+# Verified token -> decoded payload, most recently used last
+_token_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+
+class GoogleCertCache:
+    """
+    Google signing certificates, cached for the Cache-Control max-age of
+    the certs response and fetched over a pooled aiohttp session.
+
+    Concurrent logins share a single refresh. If a refresh fails, the
+    previous certs keep being used until Google is reachable again.
+    """
+
+    DEFAULT_MAX_AGE = 3600
+    # Minimum gap between refreshes forced by an unknown key id
+    MIN_REFRESH_INTERVAL = 60
+
+    def __init__(self, url: str = GOOGLE_CERTS_URL):
+        self.url = url
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Long-lived session so cert fetches reuse connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=4)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_certs(self, kid: Optional[str] = None) -> Dict[str, str]:
+        """
+        Return cached certs, refreshing when expired or when `kid` is
+        unknown (Google rotated its keys).
+        """
+        if self._is_fresh(kid):
+            return self._certs
+
+        async with self._lock:
+            # Another request may have refreshed while we waited
+            if self._is_fresh(kid):
+                return self._certs
+
+            if self._certs and time.monotonic() - self._fetched_at < self.MIN_REFRESH_INTERVAL:
+                return self._certs
+
+            try:
+                await self._refresh()
+            except Exception as e:
+                if not self._certs:
+                    raise
+                print(f"Failed to refresh Google certs, using cached copy: {e}")
+
+        return self._certs
+
+    def _is_fresh(self, kid: Optional[str]) -> bool:
+        if not self._certs or time.monotonic() >= self._expires_at:
+            return False
+        return kid is None or kid in self._certs
+
+    async def _refresh(self):
+        async with self._get_session().get(self.url) as response:
+            response.raise_for_status()
+            certs = await response.json(content_type=None)
+            cache_control = response.headers.get("Cache-Control", "")
+
+        match = re.search(r"max-age=(\d+)", cache_control)
+        max_age = int(match.group(1)) if match else self.DEFAULT_MAX_AGE
+
+        now = time.monotonic()
+        self._certs = certs
+        self._fetched_at = now
+        self._expires_at = now + max_age
+
+
+_google_certs = GoogleCertCache()
+
+
+async def close_google_certs():
+    """Close the Google cert cache's HTTP session (app shutdown)"""
+    await _google_certs.close()
 
 
 async def verify_google_token(token: str) -> Dict:
     """
     Verify Google ID token and return user info.
 
+    The signature is checked locally against cached Google certs, in a
+    worker thread so RSA verification doesn't block the event loop.
+
     Args:
         token: Google ID token from client-side sign-in
 
@@ -34,14 +137,28 @@ async def verify_google_token(token: str) -> Dict:
 
     Raises:
         HTTPException 401 if token is invalid
+        HTTPException 503 if Google's certs can't be fetched
     """
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token, requests.Request(), GOOGLE_CLIENT_ID
+        kid = jwt.get_unverified_header(token).get("kid")
+    except jwt.InvalidTokenError as e:
+        raise HTTPException(status_code=401, detail=f"Invalid Google token: {str(e)}")
+
+    try:
+        certs = await _google_certs.get_certs(kid)
+    except Exception as e:
+        print(f"Failed to fetch Google certs: {e}")
+        raise HTTPException(status_code=503, detail="Unable to verify Google token")
+
+    try:
+        loop = asyncio.get_running_loop()
+        idinfo = await loop.run_in_executor(
+            None,
+            lambda: google_jwt.decode(token, certs=certs, audience=GOOGLE_CLIENT_ID)
         )
 
         # Verify the token is from Google
-        if idinfo["iss"] not in ["accounts.google.com", "https://accounts.google.com"]:
+        if idinfo["iss"] not in GOOGLE_ISSUERS:
             raise ValueError("Invalid issuer")
 
         return {
@@ -100,6 +217,9 @@ def verify_token(token: str) -> Dict:
     """
     Verify and decode JWT token.
 
+    Successfully verified tokens are kept in a bounded LRU until they
+    expire, so repeat requests with the same token skip the signature check.
+
     Args:
         token: JWT token string
 
@@ -109,14 +229,26 @@ def verify_token(token: str) -> Dict:
     Raises:
         HTTPException 401 if token is invalid or expired
     """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if cached.get("exp", 0) > time.time():
+            _token_cache.move_to_end(token)
+            return dict(cached)
+        # Expired - evict and let jwt.decode raise the proper error
+        _token_cache.pop(token, None)
+
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    _token_cache[token] = payload
+    while len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return dict(payload)
+
 
 async def get_current_user(authorization: Optional[str] = Header(None)) -> Dict:
     """
@@ -4,17 +4,90 @@ Uses Motor (async MongoDB driver)
 """
 
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import DESCENDING
 from dotenv import load_dotenv
 import re
 import asyncio
+import base64
+import copy
+import json
+import time
+from collections import OrderedDict
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+# ASCII-only lowercasing, matching MongoDB's $toLower for item keys
+_ASCII_LOWER = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "abcdefghijklmnopqrstuvwxyz"
+)
+
+# Maximum query words considered by song search
+SEARCH_MAX_TOKENS = 8
+
+
+def _normalize_text(s: str) -> str:
+    """Normalize text for matching: lowercase, strip punctuation, collapse whitespace."""
+    import unicodedata
+    s = (s or "").lower().strip()
+    s = unicodedata.normalize('NFKD', s)
+    s = re.sub(r'[^\w\s]', '', s)
+    s = re.sub(r'\s+', ' ', s)
+    return s
+
+
+def _trigrams(token: str) -> List[str]:
+    """All 3-character substrings of a token."""
+    return [token[i:i + 3] for i in range(len(token) - 2)]
+
+
+def _search_grams(text: str) -> List[str]:
+    """
+    Index terms for a normalized string.
+
+    Each word contributes its 1- and 2-character prefixes (for short
+    prefix queries) and all of its trigrams (for substring queries).
+    """
+    grams = set()
+    for token in text.split():
+        grams.add(token[:1])
+        grams.add(token[:2])
+        grams.update(_trigrams(token))
+    return sorted(grams)
+
+
+def _songs_summary_expr(songs: str) -> Dict:
+    """Aggregation expression summarizing a chart's song array."""
+    return {
+        "total_entries": {"$size": {"$ifNull": [songs, []]}},
+        "top_song_title": {"$arrayElemAt": [f"{songs}.title", 0]},
+        "top_song_artist": {"$arrayElemAt": [f"{songs}.artist", 0]}
+    }
+
+
+# Projection turning a chart document into its `chart_summaries` entry
+CHART_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "week": 1,
+    "generated_at": 1,
+    "india": _songs_summary_expr("$chart"),
+    "global": _songs_summary_expr("$global_chart"),
+    "regional": {"$map": {
+        "input": {"$objectToArray": {"$ifNull": ["$regional", {}]}},
+        "as": "r",
+        "in": {
+            "key": "$$r.k",
+            "name": "$$r.v.name",
+            **_songs_summary_expr("$$r.v.songs")
+        }
+    }}
+}
+
+
 # Global reference to OG worker (set by main.py after startup)
 _og_worker_ref = None
 
@@ -39,9 +112,21 @@ async def _trigger_og_regeneration(playlist_id: str, is_public: bool):
 class Database:
     """Async MongoDB database handler."""
 
+    # How long cached count estimates stay valid (seconds)
+    COUNT_CACHE_TTL = 60
+
+    # Number of sync change batches kept on each user document
+    SYNC_LOG_LIMIT = 200
+
+    # Short-lived user profile cache (seconds / max entries)
+    USER_CACHE_TTL = 10
+    USER_CACHE_SIZE = 1000
+
     def __init__(self):
         self.client: Optional[AsyncIOMotorClient] = None
         self.db = None
+        self._count_cache: Dict[str, tuple] = {}
+        self._user_cache: "OrderedDict[str, tuple]" = OrderedDict()
 
     async def connect(self):
         """Connect to MongoDB."""
@@ -70,13 +155,15 @@ class Database:
         """Create necessary indexes for efficient queries."""
         # Charts collection - index by week
         await self.db.charts.create_index("week", unique=True)
+        await self.db.chart_summaries.create_index("week", unique=True)
 
-        # Songs collection - text index for search
-        await self.db.songs.create_index([
-            ("title", "text"),
-            ("artist", "text")
-        ])
-        await self.db.songs.create_index("week")
+        # Song catalog - one document per song, searched via n-grams
+        await self.db.song_catalog.create_index([("search_grams", 1), ("week", -1), ("rank", 1)])
+        await self.db.song_catalog.create_index([("search_grams", 1), ("main_week", -1), ("main_rank", 1)])
+
+        # Chart entries - slim per-week appearances of catalog songs
+        await self.db.chart_entries.create_index("week")
+        await self.db.chart_entries.create_index([("song_id", 1), ("week", -1)])
 
         # YouTube cache - index by cache_key
         await self.db.youtube_cache.create_index("cache_key", unique=True)
@@ -90,9 +177,14 @@ class Database:
 
         # Playlists collection - indexes for queries
         await self.db.playlists.create_index("owner_id")
-        await self.db.playlists.create_index([("is_public", 1), ("follower_count", -1)])
         await self.db.playlists.create_index([("is_public", 1), ("created_at", -1)])
-        await self.db.playlists.create_index([("is_public", 1), ("weekly_plays", -1)])
+        # Keyset pagination indexes: (sort key, _id) for each browse order
+        await self.db.playlists.create_index([("is_public", 1), ("follower_count", -1), ("_id", -1)])
+        await self.db.playlists.create_index([("is_public", 1), ("published_at", -1), ("_id", -1)])
+        await self.db.playlists.create_index([("is_public", 1), ("weekly_plays", -1), ("_id", -1)])
+        await self.db.playlists.create_index([
+            ("owner_id", 1), ("is_public", 1), ("created_at", -1), ("_id", -1)
+        ])
         await self.db.playlists.create_index("followers")
         await self.db.playlists.create_index([
             ("name", "text"),
@@ -100,6 +192,10 @@ class Database:
             ("songs.artist", "text")
         ])
 
+        # OG image job queue indexes (claim due jobs and expired leases)
+        await self.db.og_jobs.create_index([("status", 1), ("available_at", 1)])
+        await self.db.og_jobs.create_index([("status", 1), ("lease_expires_at", 1)])
+
     # ============================================================
     # CHART OPERATIONS
     # ============================================================
@@ -156,8 +252,21 @@ class Database:
         # Also save individual songs for search indexing
         await self._index_songs(chart_data)
 
+        await self._save_chart_summary(week)
+
         return True
 
+    async def _save_chart_summary(self, week: str):
+        """
+        Store the small per-week summary (entry counts, top songs, regions)
+        used for chart listings, computed server-side from the stored chart.
+        """
+        async for summary in self.db.charts.aggregate([
+            {"$match": {"week": week}},
+            {"$project": CHART_SUMMARY_PROJECTION}
+        ]):
+            await self.db.chart_summaries.replace_one({"week": week}, summary, upsert=True)
+
     def _calculate_rank_changes(self, new_chart: Dict, previous_chart: Dict) -> Dict:
         """Calculate rank changes by comparing with previous chart."""
         # Build lookup of previous positions by title+artist
@@ -210,51 +319,173 @@ class Database:
 
     def _song_key(self, title: str, artist: str) -> str:
         """Create a normalized key for song matching."""
-        # Normalize: lowercase, remove special chars, collapse whitespace
-        import unicodedata
-        def normalize(s):
-            s = s.lower().strip()
-            s = unicodedata.normalize('NFKD', s)
-            s = re.sub(r'[^\w\s]', '', s)
-            s = re.sub(r'\s+', ' ', s)
-            return s
-        return f"{normalize(title)}|{normalize(artist)}"
+        return f"{_normalize_text(title)}|{_normalize_text(artist)}"
+
+    def _song_search_fields(self, title: str, artist: str) -> Dict:
+        """Search fields stored on each indexed song (see search_songs)."""
+        search_text = f"{_normalize_text(title)} {_normalize_text(artist)}".strip()
+        return {
+            "song_key": self._song_key(title, artist),
+            "search_text": search_text,
+            "search_grams": _search_grams(search_text)
+        }
 
     async def delete_chart(self, week: str) -> bool:
         """Delete a chart by week."""
         result = await self.db.charts.delete_one({"week": week})
-        # Also remove indexed songs for this week
-        await self.db.songs.delete_many({"week": week})
+        await self.db.chart_summaries.delete_one({"week": week})
+
+        # Remove this week's chart entries, then rebuild the catalog songs it
+        # touched from the weeks they still appear in (dropping orphans)
+        song_ids = await self.db.chart_entries.distinct("song_id", {"week": week})
+        await self.db.chart_entries.delete_many({"week": week})
+        if song_ids:
+            weeks = await self.db.chart_entries.distinct("week", {"song_id": {"$in": song_ids}})
+            await self.db.song_catalog.delete_many({"_id": {"$in": song_ids}})
+            if weeks:
+                await self._reindex_catalog_songs(set(song_ids), weeks)
+
         return result.deleted_count > 0
 
-    async def _index_songs(self, chart_data: Dict):
-        """Index individual songs for search functionality."""
+    def _catalog_id(self, song_key: str):
+        """Deterministic catalog ObjectId for a normalized song key."""
+        import hashlib
+        from bson import ObjectId
+
+        return ObjectId(hashlib.sha1(song_key.encode()).hexdigest()[:24])
+
+    def _chart_appearances(self, chart_data: Dict) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """
+        Split a week's chart into slim `chart_entries` rows and, per song
+        key, the appearance that represents the song that week: its main
+        chart appearance if any, otherwise its best regional rank.
+        """
         week = chart_data.get("week")
-        songs_to_insert = []
+        appearances = []
 
         # Main chart songs
         for song in chart_data.get("chart", []):
-            songs_to_insert.append({
-                "week": week,
-                "source": "main",
-                "region": None,
-                **song
-            })
+            appearances.append(("main", None, song))
 
         # Regional songs
         for region_key, region_data in chart_data.get("regional", {}).items():
             for song in region_data.get("songs", []):
-                songs_to_insert.append({
-                    "week": week,
-                    "source": "regional",
-                    "region": region_key,
-                    **song
-                })
+                appearances.append(("regional", region_key, song))
+
+        entries = []
+        latest: Dict[str, Dict] = {}
+
+        for source, region, song in appearances:
+            search_fields = self._song_search_fields(song.get("title", ""), song.get("artist", ""))
+            song_key = search_fields["song_key"]
+            rank = song.get("rank", 0)
+
+            entries.append({
+                "week": week,
+                "song_id": self._catalog_id(song_key),
+                "rank": rank,
+                "source": source,
+                "region": region
+            })
+
+            # Main chart appearance wins, then the best regional rank
+            current = latest.get(song_key)
+            if (
+                current is None
+                or (source == "main" and current["source"] != "main")
+                or (source == current["source"] and rank < current.get("rank", 0))
+            ):
+                appearance = {**song, "week": week, "source": source, "region": region, **search_fields}
+                appearance.pop("_id", None)
+                latest[song_key] = appearance
+
+        return entries, latest
+
+    def _catalog_updates(self, week: str, latest: Dict[str, Dict]) -> List:
+        """
+        Upserts merging a week's appearances into the song catalog.
+
+        The newest week supplies the song data; `main_week`/`main_rank`
+        separately track the newest main chart appearance, so main-only
+        search never reports a regional week or rank.
+        """
+        from pymongo import UpdateOne
+
+        operations = []
+        for song_key, appearance in latest.items():
+            rank = appearance.get("rank", 0)
+            is_main = appearance["source"] == "main"
+            newer = {"$gte": [week, {"$ifNull": ["$week", ""]}]}
+            newer_main = {"$and": [is_main, {"$gte": [week, {"$ifNull": ["$main_week", ""]}]}]}
+            operations.append(UpdateOne(
+                {"_id": self._catalog_id(song_key)},
+                [
+                    # Only a newer (or re-uploaded) week replaces song data
+                    {"$replaceWith": {"$cond": [
+                        newer,
+                        {"$mergeObjects": ["$$ROOT", {"$literal": appearance}]},
+                        "$$ROOT"
+                    ]}},
+                    {"$set": {
+                        "first_week": {"$min": [{"$ifNull": ["$first_week", week]}, week]},
+                        "best_rank": {"$min": [{"$ifNull": ["$best_rank", rank]}, rank]},
+                        "in_main": {"$or": [{"$ifNull": ["$in_main", False]}, is_main]},
+                        "main_week": {"$cond": [newer_main, week, "$main_week"]},
+                        "main_rank": {"$cond": [newer_main, rank, "$main_rank"]}
+                    }}
+                ],
+                upsert=True
+            ))
+        return operations
+
+    async def _index_songs(self, chart_data: Dict):
+        """
+        Index a week's songs into the canonical song catalog.
+
+        Each song is upserted once into `song_catalog`, keyed by its
+        normalized song key; the catalog document holds the song's most
+        recent appearance (metadata, lyrics, week, rank, source). The
+        week itself is recorded as slim rows in `chart_entries`.
+        """
+        week = chart_data.get("week")
+        entries, latest = self._chart_appearances(chart_data)
+        if not entries:
+            return
 
-        # Remove old songs for this week and insert new ones
-        if songs_to_insert:
-            await self.db.songs.delete_many({"week": week})
-            await self.db.songs.insert_many(songs_to_insert)
+        await self.db.song_catalog.bulk_write(self._catalog_updates(week, latest), ordered=False)
+
+        # Replace this week's chart entries
+        await self.db.chart_entries.delete_many({"week": week})
+        await self.db.chart_entries.insert_many(entries)
+
+    async def _reindex_catalog_songs(self, song_ids: set, weeks: List[str]):
+        """Re-merge the given catalog songs from the stored charts of `weeks`."""
+        cursor = self.db.charts.find(
+            {"week": {"$in": weeks}},
+            {"_id": 0, "week": 1, "chart": 1, "regional": 1}
+        ).sort("week", 1)
+        async for chart in cursor:
+            _, latest = self._chart_appearances(chart)
+            latest = {
+                song_key: appearance for song_key, appearance in latest.items()
+                if self._catalog_id(song_key) in song_ids
+            }
+            if latest:
+                await self.db.song_catalog.bulk_write(
+                    self._catalog_updates(chart["week"], latest), ordered=False
+                )
+
+    async def rebuild_song_catalog(self) -> int:
+        """Rebuild the song catalog and chart entries from all stored charts."""
+        weeks = 0
+        cursor = self.db.charts.find(
+            {},
+            {"_id": 0, "week": 1, "chart": 1, "regional": 1}
+        ).sort("week", 1)
+        async for chart in cursor:
+            await self._index_songs(chart)
+            weeks += 1
+        return weeks
 
     # ============================================================
     # SEARCH OPERATIONS
@@ -266,31 +497,64 @@ class Database:
         limit: int = 20,
         include_regional: bool = True
     ) -> List[Dict]:
-        """Search songs by title or artist."""
-        # Build search filter
-        search_filter = {
-            "$or": [
-                {"title": {"$regex": query, "$options": "i"}},
-                {"artist": {"$regex": query, "$options": "i"}}
+        """
+        Search songs by title or artist.
+
+        Matches through the indexed `search_grams` field: query words under
+        3 characters must prefix a word, longer ones must appear as a
+        substring (all trigrams present, then confirmed against
+        `search_text`). Runs against the song catalog, so each song is
+        returned once with its most recent chart appearance, newest weeks
+        and best ranks first.
+        """
+        tokens = _normalize_text(query).split()[:SEARCH_MAX_TOKENS]
+        if not tokens:
+            return []
+
+        grams = set()
+        substrings = []
+        for token in tokens:
+            if len(token) < 3:
+                grams.add(token)
+            else:
+                grams.update(_trigrams(token))
+                substrings.append(token)
+
+        search_filter: Dict[str, Any] = {"search_grams": {"$all": sorted(grams)}}
+        if substrings:
+            # Escaped and only applied to index candidates, never a raw user regex
+            search_filter["$and"] = [
+                {"search_text": {"$regex": re.escape(token)}} for token in substrings
             ]
-        }
 
+        # Main-only search reports each song's newest main chart appearance
+        week_field, rank_field = "week", "rank"
         if not include_regional:
-            search_filter["source"] = "main"
+            search_filter["in_main"] = True
+            week_field, rank_field = "main_week", "main_rank"
 
-        cursor = self.db.songs.find(
+        cursor = self.db.song_catalog.find(
             search_filter,
-            {"_id": 0}
-        ).limit(limit).sort("week", DESCENDING)
+            {
+                "_id": 0,
+                "title": 1,
+                "artist": 1,
+                rank_field: 1,
+                week_field: 1,
+                "region": 1,
+                "youtube_video_id": 1,
+                "artwork_url": 1
+            }
+        ).sort([(week_field, DESCENDING), (rank_field, 1)]).limit(limit)
 
         results = []
         async for song in cursor:
             results.append({
                 "title": song.get("title"),
                 "artist": song.get("artist"),
-                "rank": song.get("rank"),
-                "week": song.get("week"),
-                "source": song.get("region") or "main",
+                "rank": song.get(rank_field),
+                "week": song.get(week_field),
+                "source": (song.get("region") if include_regional else None) or "main",
                 "youtube_video_id": song.get("youtube_video_id"),
                 "artwork_url": song.get("artwork_url")
             })
@@ -298,10 +562,13 @@ class Database:
         return results
 
     async def get_song_by_id(self, song_id: str) -> Optional[Dict]:
-        """Get a song by MongoDB _id."""
+        """Get a catalog song by _id, with its most recent chart appearance."""
         from bson import ObjectId
         try:
-            song = await self.db.songs.find_one({"_id": ObjectId(song_id)})
+            song = await self.db.song_catalog.find_one(
+                {"_id": ObjectId(song_id)},
+                {"search_text": 0, "search_grams": 0}
+            )
             if song:
                 song["_id"] = str(song["_id"])
                 return {
@@ -314,6 +581,33 @@ class Database:
             pass
         return None
 
+    async def get_song_history(self, song_id: str) -> Optional[Dict]:
+        """Get every chart appearance of a catalog song, most recent first."""
+        from bson import ObjectId
+        try:
+            song_oid = ObjectId(song_id)
+        except Exception:
+            return None
+
+        song = await self.db.song_catalog.find_one(
+            {"_id": song_oid},
+            {"title": 1, "artist": 1}
+        )
+        if not song:
+            return None
+
+        cursor = self.db.chart_entries.find(
+            {"song_id": song_oid},
+            {"_id": 0, "week": 1, "rank": 1, "source": 1, "region": 1}
+        ).sort("week", DESCENDING)
+
+        return {
+            "song_id": song_id,
+            "title": song.get("title"),
+            "artist": song.get("artist"),
+            "history": [entry async for entry in cursor]
+        }
+
     # ============================================================
     # REGIONAL OPERATIONS
     # ============================================================
@@ -447,17 +741,43 @@ class Database:
             user["_id"] = str(user["_id"])
         return user
 
-    async def get_user_by_id(self, user_id: str) -> Optional[Dict]:
-        """Get user by MongoDB ObjectId."""
+    async def get_user_by_id(self, user_id: str, use_cache: bool = True) -> Optional[Dict]:
+        """
+        Get user by MongoDB ObjectId.
+
+        Served from a short-TTL cache so consecutive authenticated requests
+        don't refetch the same user; writes through update_user_* invalidate
+        it, but only in this process. Read-modify-write paths must pass
+        use_cache=False so they never merge against another instance's
+        stale copy. Callers get their own deep copy.
+        """
         from bson import ObjectId
+
+        now = time.monotonic()
+        if use_cache:
+            cached = self._user_cache.get(user_id)
+            if cached and cached[0] > now:
+                self._user_cache.move_to_end(user_id)
+                return copy.deepcopy(cached[1])
+
         try:
-            user = await self.db.users.find_one({"_id": ObjectId(user_id)})
-            if user:
-                user["_id"] = str(user["_id"])
-            return user
+            user = await self.db.users.find_one({"_id": ObjectId(user_id)}, {"sync_log": 0})
         except:
             return None
 
+        if user:
+            user["_id"] = str(user["_id"])
+            self._user_cache[user_id] = (now + self.USER_CACHE_TTL, user)
+            self._user_cache.move_to_end(user_id)
+            while len(self._user_cache) > self.USER_CACHE_SIZE:
+                self._user_cache.popitem(last=False)
+            return copy.deepcopy(user)
+        return user
+
+    def _invalidate_user(self, user_id: str):
+        """Drop a user from the profile cache after a write."""
+        self._user_cache.pop(user_id, None)
+
     async def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Get user by email."""
         user = await self.db.users.find_one({"email": email})
@@ -487,6 +807,8 @@ class Database:
             "history": local_data.get("history", []) if local_data else [],
             "queue": local_data.get("queue", []) if local_data else [],
             "preferences": local_data.get("preferences", {"shuffle": False, "repeat": "off"}) if local_data else {"shuffle": False, "repeat": "off"},
+            "sync_version": 0,
+            "sync_log": [],
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
             "last_login": datetime.utcnow()
@@ -505,6 +827,7 @@ class Database:
             {"_id": ObjectId(user_id)},
             {"$set": {"last_login": datetime.utcnow(), "updated_at": datetime.utcnow()}}
         )
+        self._invalidate_user(user_id)
         return result.modified_count > 0
 
     async def update_user_profile(self, user_id: str, updates: Dict) -> bool:
@@ -520,60 +843,276 @@ class Database:
             {"_id": ObjectId(user_id)},
             {"$set": filtered}
         )
+        self._invalidate_user(user_id)
+        return result.modified_count > 0
+
+    def _full_replace_update(self, fields: Dict) -> Dict:
+        """
+        Update document for writes that replace library arrays wholesale.
+
+        Bumps the sync version and clears the change log so delta-sync
+        clients fall back to a full download on their next sync.
+        """
+        from datetime import datetime
+
+        return {
+            "$set": {**fields, "sync_log": [], "updated_at": datetime.utcnow()},
+            "$inc": {"sync_version": 1}
+        }
+
+    async def update_user_library(
+        self,
+        user_id: str,
+        favorites: List[Dict],
+        history: List[Dict],
+        queue: List[Dict]
+    ) -> bool:
+        """Replace favorites, history (max 50) and queue in a single update."""
+        from bson import ObjectId
+
+        result = await self.db.users.update_one(
+            {"_id": ObjectId(user_id)},
+            self._full_replace_update({
+                "favorites": favorites,
+                "history": history[:50],
+                "queue": queue
+            })
+        )
+        self._invalidate_user(user_id)
         return result.modified_count > 0
 
     async def update_user_favorites(self, user_id: str, favorites: List[Dict]) -> bool:
         """Update user's favorites."""
         from bson import ObjectId
-        from datetime import datetime
 
         result = await self.db.users.update_one(
             {"_id": ObjectId(user_id)},
-            {"$set": {"favorites": favorites, "updated_at": datetime.utcnow()}}
+            self._full_replace_update({"favorites": favorites})
         )
+        self._invalidate_user(user_id)
         return result.modified_count > 0
 
     async def update_user_history(self, user_id: str, history: List[Dict]) -> bool:
         """Update user's play history (max 50 items)."""
         from bson import ObjectId
-        from datetime import datetime
 
         # Ensure max 50 items
         history = history[:50]
 
         result = await self.db.users.update_one(
             {"_id": ObjectId(user_id)},
-            {"$set": {"history": history, "updated_at": datetime.utcnow()}}
+            self._full_replace_update({"history": history})
         )
+        self._invalidate_user(user_id)
         return result.modified_count > 0
 
     async def update_user_queue(self, user_id: str, queue: List[Dict]) -> bool:
         """Update user's queue."""
         from bson import ObjectId
-        from datetime import datetime
 
         result = await self.db.users.update_one(
             {"_id": ObjectId(user_id)},
-            {"$set": {"queue": queue, "updated_at": datetime.utcnow()}}
+            self._full_replace_update({"queue": queue})
         )
+        self._invalidate_user(user_id)
         return result.modified_count > 0
 
     async def update_user_preferences(self, user_id: str, preferences: Dict) -> bool:
         """Update user's playback preferences."""
         from bson import ObjectId
-        from datetime import datetime
 
         result = await self.db.users.update_one(
             {"_id": ObjectId(user_id)},
-            {"$set": {"preferences": preferences, "updated_at": datetime.utcnow()}}
+            self._full_replace_update({"preferences": preferences})
         )
+        self._invalidate_user(user_id)
         return result.modified_count > 0
 
+    def _sync_item_key(self, item: Dict) -> str:
+        """Dedup key for favorites/history, same as _sync_item_key_expr."""
+        title = (item.get("title") or "").translate(_ASCII_LOWER)
+        artist = (item.get("artist") or "").translate(_ASCII_LOWER)
+        return f"{title}-{artist}"
+
+    def _sync_item_key_expr(self, var: str) -> Dict:
+        """Aggregation expression computing _sync_item_key for `$$<var>`."""
+        return {"$concat": [
+            {"$toLower": {"$ifNull": [f"$${var}.title", ""]}},
+            "-",
+            {"$toLower": {"$ifNull": [f"$${var}.artist", ""]}}
+        ]}
+
+    def _sync_ops_stage(self, ops: List[Dict], now: int) -> Dict:
+        """
+        Build a single $set update-pipeline stage applying client ops.
+
+        Ops are collapsed in order (last write per key wins), then merged
+        into the stored arrays server-side, so only the changed items are
+        sent to MongoDB rather than the whole library.
+        """
+        from datetime import datetime
+
+        favorites: Dict[str, Optional[Dict]] = {}
+        history: Dict[str, Dict] = {}
+        queue = None
+        preferences = None
+
+        for op in ops:
+            kind = op["op"]
+            if kind == "favorite_add":
+                favorites[self._sync_item_key(op["favorite"])] = op["favorite"]
+            elif kind == "favorite_remove":
+                favorites[self._sync_item_key(op["favorite"])] = None
+            elif kind == "history_add":
+                key = self._sync_item_key(op["history"])
+                current = history.get(key)
+                if not current or op["history"].get("playedAt", 0) >= current.get("playedAt", 0):
+                    history[key] = op["history"]
+            elif kind == "queue_set":
+                queue = op["queue"]
+            elif kind == "preferences_set":
+                preferences = op["preferences"]
+
+        version = {"$add": [{"$ifNull": ["$sync_version", 0]}, 1]}
+        fields = {
+            "sync_version": version,
+            "sync_log": {"$slice": [
+                {"$concatArrays": [
+                    {"$ifNull": ["$sync_log", []]},
+                    [{"v": version, "ops": {"$literal": ops}, "at": now}]
+                ]},
+                -self.SYNC_LOG_LIMIT
+            ]},
+            "updated_at": datetime.utcnow()
+        }
+
+        if favorites:
+            added = sorted(
+                (f for f in favorites.values() if f),
+                key=lambda x: x.get("addedAt", 0),
+                reverse=True
+            )
+            fields["favorites"] = {"$concatArrays": [
+                {"$literal": added},
+                {"$filter": {
+                    "input": {"$ifNull": ["$favorites", []]},
+                    "as": "f",
+                    "cond": {"$not": [{"$in": [
+                        self._sync_item_key_expr("f"),
+                        {"$literal": list(favorites.keys())}
+                    ]}]}
+                }}
+            ]}
+
+        if history:
+            added = sorted(history.values(), key=lambda x: x.get("playedAt", 0), reverse=True)
+            fields["history"] = {"$slice": [
+                {"$concatArrays": [
+                    {"$literal": added},
+                    {"$filter": {
+                        "input": {"$ifNull": ["$history", []]},
+                        "as": "h",
+                        "cond": {"$not": [{"$in": [
+                            self._sync_item_key_expr("h"),
+                            {"$literal": list(history.keys())}
+                        ]}]}
+                    }}
+                ]},
+                50
+            ]}
+
+        if queue is not None:
+            fields["queue"] = {"$literal": queue}
+        if preferences is not None:
+            fields["preferences"] = {"$literal": preferences}
+
+        return {"$set": fields}
+
+    async def sync_user_delta(
+        self,
+        user_id: str,
+        since_version: Optional[int],
+        ops: List[Dict]
+    ) -> Optional[Dict]:
+        """
+        Apply client ops and return the changes the client hasn't seen.
+
+        Ops are applied and the response is read back in one
+        find_one_and_update (or a single find_one when there are no ops).
+        The client's own batch is excluded from the returned changes. If
+        since_version is None, or the retained change log no longer reaches
+        back to it, the full library is returned with full=True.
+
+        Returns:
+            Dict with version, full, changes and (when full) library data,
+            or None if the user doesn't exist
+        """
+        from bson import ObjectId
+        from datetime import datetime
+        from pymongo import ReturnDocument
+
+        now = int(datetime.utcnow().timestamp() * 1000)
+        since = since_version if since_version is not None else -1
+        version = {"$ifNull": ["$sync_version", 0]}
+        log = {"$ifNull": ["$sync_log", []]}
+
+        if since_version is None:
+            needs_full = {"$literal": True}
+        else:
+            needs_full = {"$and": [
+                {"$gt": [version, since]},
+                {"$or": [
+                    {"$eq": [{"$size": log}, 0]},
+                    {"$gt": [{"$arrayElemAt": ["$sync_log.v", 0]}, since + 1]}
+                ]}
+            ]}
+
+        newer = {"$gt": ["$$e.v", since]}
+        if ops:
+            # Exclude the batch this request just wrote
+            newer = {"$and": [newer, {"$lt": ["$$e.v", version]}]}
+
+        projection = {
+            "sync_version": 1,
+            "sync_log": {"$filter": {"input": log, "as": "e", "cond": newer}},
+            "needs_full": needs_full
+        }
+        for field in ("favorites", "history", "queue", "preferences"):
+            projection[field] = {"$cond": [needs_full, f"${field}", "$$REMOVE"]}
+
+        if ops:
+            user = await self.db.users.find_one_and_update(
+                {"_id": ObjectId(user_id)},
+                [self._sync_ops_stage(ops, now)],
+                projection=projection,
+                return_document=ReturnDocument.AFTER
+            )
+            self._invalidate_user(user_id)
+        else:
+            user = await self.db.users.find_one({"_id": ObjectId(user_id)}, projection)
+
+        if not user:
+            return None
+
+        full = bool(user.get("needs_full"))
+        result = {
+            "version": user.get("sync_version", 0),
+            "full": full,
+            "changes": [] if full else user.get("sync_log", [])
+        }
+        if full:
+            result["favorites"] = user.get("favorites", [])
+            result["history"] = user.get("history", [])
+            result["queue"] = user.get("queue", [])
+            result["preferences"] = user.get("preferences", {"shuffle": False, "repeat": "off"})
+        return result
+
     async def delete_user(self, user_id: str) -> bool:
         """Delete a user account."""
         from bson import ObjectId
 
         result = await self.db.users.delete_one({"_id": ObjectId(user_id)})
+        self._invalidate_user(user_id)
         return result.deleted_count > 0
 
     # ============================================================
@@ -608,6 +1147,7 @@ class Database:
             {"_id": ObjectId(user_id)},
             {"$set": {"username": username.lower(), "updated_at": datetime.utcnow()}}
         )
+        self._invalidate_user(user_id)
         return result.modified_count > 0
 
     async def count_public_playlists(self, user_id: str) -> int:
@@ -623,31 +1163,30 @@ class Database:
         owner_id: str,
         limit: int = 20,
         offset: int = 0,
-        viewer_id: Optional[str] = None
-    ) -> List[Dict]:
-        """Get a user's public playlists."""
-        from bson import ObjectId
-
-        cursor = self.db.playlists.find({
-            "owner_id": ObjectId(owner_id),
-            "is_public": True
-        }).sort("created_at", -1).skip(offset).limit(limit)
+        viewer_id: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get a user's public playlists, newest first.
 
-        playlists = []
-        async for playlist in cursor:
-            playlist["id"] = str(playlist["_id"])
-            del playlist["_id"]
-            playlist["owner_id"] = str(playlist["owner_id"])
+        Returns (playlists, next_cursor). Pass next_cursor back as `cursor`
+        to continue; offset is only honoured when no cursor is given.
+        """
+        from bson import ObjectId
 
-            # Add viewer-specific data
-            if viewer_id:
-                playlist["is_following"] = viewer_id in [str(f) for f in playlist.get("followers", [])]
-            else:
-                playlist["is_following"] = False
+        playlists, next_cursor = await self._page_playlists(
+            {"owner_id": ObjectId(owner_id), "is_public": True},
+            "created_at",
+            limit,
+            offset,
+            viewer_id,
+            cursor
+        )
 
-            playlists.append(playlist)
+        for playlist in playlists:
+            playlist["id"] = playlist.pop("_id")
 
-        return playlists
+        return playlists, next_cursor
 
     # ============================================================
     # PLAYLIST OPERATIONS
@@ -692,24 +1231,20 @@ class Database:
         from bson import ObjectId
 
         try:
-            playlist = await self.db.playlists.find_one({"_id": ObjectId(playlist_id)})
+            # Ownership/following are computed server-side so the followers
+            # array never leaves MongoDB
+            pipeline = [{"$match": {"_id": ObjectId(playlist_id)}}]
+            pipeline.extend(self._viewer_pipeline(user_id, exclude_songs=False))
+
+            playlist = None
+            async for doc in self.db.playlists.aggregate(pipeline):
+                playlist = doc
             if not playlist:
                 return None
 
             playlist["_id"] = str(playlist["_id"])
             playlist["owner_id"] = str(playlist["owner_id"])
-
-            # Set ownership and following status
-            if user_id:
-                user_oid = ObjectId(user_id)
-                playlist["is_owner"] = playlist["owner_id"] == user_id
-                playlist["is_following"] = user_oid in playlist.get("followers", [])
-            else:
-                playlist["is_owner"] = False
-                playlist["is_following"] = False
-
-            # Convert follower ObjectIds to strings for serialization
-            playlist["followers"] = [str(f) for f in playlist.get("followers", [])]
+            playlist["followers"] = []
 
             return playlist
         except:
@@ -741,86 +1276,119 @@ class Database:
 
         return playlists
 
+    def _playlist_content_hash(self, name: str, description: str, songs: List[Dict]) -> str:
+        """Stable hash of the client-editable playlist content."""
+        import hashlib
+
+        raw = json.dumps(
+            {"name": name, "description": description, "songs": songs},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha1(raw.encode()).hexdigest()
+
     async def sync_user_playlists(self, user_id: str, client_playlists: List) -> List[Dict]:
         """
         Sync playlists from client to server.
 
         - Client playlists with non-ObjectId IDs are created as new
         - Client playlists with valid ObjectIds are updated if owned by user
-        - Returns list of synced playlists in PlaylistSummary format
+        - Playlists whose content hash matches the stored one are not written
+        - Returns every client playlist in PlaylistSummary format
+
+        Uses one $in query to resolve ownership and one bulk_write for all
+        changes, regardless of how many playlists the client sends.
         """
         from bson import ObjectId
         from bson.errors import InvalidId
         from datetime import datetime
+        from pymongo import InsertOne, UpdateOne
 
-        synced = []
         now = int(datetime.utcnow().timestamp() * 1000)
+        owner_oid = ObjectId(user_id)
 
+        # Resolve which client IDs are existing playlists owned by this user
+        client_oids = []
         for client_playlist in client_playlists:
-            playlist_id = client_playlist.id
-            is_valid_oid = False
-
-            # Check if it's a valid MongoDB ObjectId
             try:
-                ObjectId(playlist_id)
-                is_valid_oid = True
+                client_oids.append(ObjectId(client_playlist.id))
             except (InvalidId, TypeError):
-                is_valid_oid = False
-
-            if is_valid_oid:
-                # Try to update existing playlist if owned by user
-                existing = await self.db.playlists.find_one({
-                    "_id": ObjectId(playlist_id),
-                    "owner_id": ObjectId(user_id)
-                })
+                continue
+
+        existing = {}
+        if client_oids:
+            cursor = self.db.playlists.find(
+                {"_id": {"$in": client_oids}, "owner_id": owner_oid},
+                {
+                    "is_public": 1, "follower_count": 1, "created_at": 1,
+                    "updated_at": 1, "content_hash": 1
+                }
+            )
+            async for doc in cursor:
+                existing[str(doc["_id"])] = doc
 
-                if existing:
-                    # Update existing playlist
-                    songs = [s.model_dump() for s in client_playlist.songs]
-                    cover_urls = [s.get("artwork") for s in songs[:4] if s.get("artwork")]
+        operations = []
+        synced = []
 
-                    await self.db.playlists.update_one(
-                        {"_id": ObjectId(playlist_id)},
+        for client_playlist in client_playlists:
+            songs = [s.model_dump() for s in client_playlist.songs]
+            cover_urls = self._regenerate_cover_urls(songs)
+            content_hash = self._playlist_content_hash(
+                client_playlist.name, client_playlist.description, songs
+            )
+            current = existing.get(client_playlist.id)
+
+            if current:
+                # Unchanged since the last sync - nothing to write, but the
+                # client still needs it back since it replaces its library
+                if current.get("content_hash") == content_hash:
+                    updated_at = current.get("updated_at", now)
+                else:
+                    updated_at = now
+                    operations.append(UpdateOne(
+                        {"_id": current["_id"], "owner_id": owner_oid},
                         {"$set": {
                             "name": client_playlist.name,
                             "description": client_playlist.description,
                             "songs": songs,
                             "song_count": len(songs),
                             "cover_urls": cover_urls,
+                            "content_hash": content_hash,
                             "updated_at": now
                         }}
-                    )
-
-                    synced.append({
-                        "id": playlist_id,
-                        "name": client_playlist.name,
-                        "description": client_playlist.description,
-                        "owner_id": user_id,
-                        "is_public": existing.get("is_public", False),
-                        "cover_urls": cover_urls,
-                        "songs": songs,
-                        "song_count": len(songs),
-                        "follower_count": existing.get("follower_count", 0),
-                        "is_following": False,
-                        "is_owner": True,
-                        "created_at": existing.get("created_at", now),
-                        "updated_at": now
-                    })
-                    continue
-
-            # Create new playlist (either invalid OID or not found/not owned)
-            songs = [s.model_dump() for s in client_playlist.songs]
-            cover_urls = [s.get("artwork") for s in songs[:4] if s.get("artwork")]
+                    ))
+
+                synced.append({
+                    "id": client_playlist.id,
+                    "name": client_playlist.name,
+                    "description": client_playlist.description,
+                    "owner_id": user_id,
+                    "is_public": current.get("is_public", False),
+                    "cover_urls": cover_urls,
+                    "songs": songs,
+                    "song_count": len(songs),
+                    "follower_count": current.get("follower_count", 0),
+                    "is_following": False,
+                    "is_owner": True,
+                    "created_at": current.get("created_at", now),
+                    "updated_at": updated_at
+                })
+                continue
 
+            # Create new playlist (either invalid OID or not found/not owned).
+            # The _id is assigned here so it is known without reading back.
+            new_oid = ObjectId()
             playlist_doc = {
+                "_id": new_oid,
                 "name": client_playlist.name,
                 "description": client_playlist.description,
-                "owner_id": ObjectId(user_id),
+                "owner_id": owner_oid,
                 "is_public": False,
                 "published_at": None,
                 "cover_urls": cover_urls,
                 "songs": songs,
                 "song_count": len(songs),
+                "content_hash": content_hash,
                 "follower_count": 0,
                 "followers": [],
                 "created_at": client_playlist.created_at or now,
@@ -828,12 +1396,10 @@ class Database:
                 "play_count": 0,
                 "weekly_plays": 0
             }
-
-            result = await self.db.playlists.insert_one(playlist_doc)
-            new_id = str(result.inserted_id)
+            operations.append(InsertOne(playlist_doc))
 
             synced.append({
-                "id": new_id,
+                "id": str(new_oid),
                 "name": client_playlist.name,
                 "description": client_playlist.description,
                 "owner_id": user_id,
@@ -848,6 +1414,9 @@ class Database:
                 "updated_at": now
             })
 
+        if operations:
+            await self.db.playlists.bulk_write(operations, ordered=False)
+
         return synced
 
     async def get_followed_playlists(self, user_id: str) -> List[Dict]:
@@ -884,7 +1453,7 @@ class Database:
 
         result = await self.db.playlists.update_one(
             {"_id": ObjectId(playlist_id)},
-            {"$set": filtered}
+            {"$set": filtered, "$unset": {"content_hash": ""}}
         )
         return result.modified_count > 0
 
@@ -930,81 +1499,106 @@ class Database:
                 covers.append(song["artwork"])
         return covers
 
+    def _song_list_stages(self, now: int) -> List[Dict]:
+        """
+        Update-pipeline stages run after the songs array changes.
+
+        Mirrors _regenerate_cover_urls server-side so `order`, `song_count`
+        and `cover_urls` are recomputed in the same atomic update. The sync
+        content hash is dropped since the songs no longer match it.
+        """
+        return [
+            {"$set": {
+                "songs": {"$map": {
+                    "input": {"$range": [0, {"$size": "$songs"}]},
+                    "as": "i",
+                    "in": {"$mergeObjects": [
+                        {"$arrayElemAt": ["$songs", "$$i"]},
+                        {"order": "$$i"}
+                    ]}
+                }}
+            }},
+            {"$set": {
+                "song_count": {"$size": "$songs"},
+                "cover_urls": {"$slice": [
+                    {"$map": {
+                        "input": {"$filter": {
+                            "input": "$songs",
+                            "as": "s",
+                            "cond": {"$ne": [{"$ifNull": ["$$s.artwork", ""]}, ""]}
+                        }},
+                        "as": "s",
+                        "in": "$$s.artwork"
+                    }},
+                    4
+                ]},
+                "content_hash": "$$REMOVE",
+                "updated_at": now
+            }}
+        ]
+
     async def add_song_to_playlist(self, playlist_id: str, song: Dict) -> Optional[Dict]:
-        """Add a song to a playlist."""
+        """Add a song to a playlist (single atomic update, max 100 songs)."""
         from bson import ObjectId
         from datetime import datetime
-
-        playlist = await self.db.playlists.find_one({"_id": ObjectId(playlist_id)})
-        if not playlist:
-            return None
-
-        # Check song limit
-        if len(playlist.get("songs", [])) >= 100:
-            return None
+        from pymongo import ReturnDocument
 
         now = int(datetime.utcnow().timestamp() * 1000)
 
-        # Create song entry
+        # Create song entry ($literal so user text is never read as a field path)
         new_song = {
             "title": song.get("title"),
             "artist": song.get("artist"),
             "videoId": song.get("videoId"),
             "artwork": song.get("artwork"),
-            "added_at": now,
-            "order": len(playlist.get("songs", []))
+            "added_at": now
         }
 
-        # Add song and update metadata
-        songs = playlist.get("songs", []) + [new_song]
-        cover_urls = self._regenerate_cover_urls(songs)
-
-        await self.db.playlists.update_one(
-            {"_id": ObjectId(playlist_id)},
+        songs = {"$ifNull": ["$songs", []]}
+        playlist = await self.db.playlists.find_one_and_update(
             {
-                "$push": {"songs": new_song},
-                "$inc": {"song_count": 1},
-                "$set": {
-                    "cover_urls": cover_urls,
-                    "updated_at": now
-                }
-            }
+                "_id": ObjectId(playlist_id),
+                "$expr": {"$lt": [{"$size": songs}, 100]}
+            },
+            [{"$set": {"songs": {"$concatArrays": [songs, [{"$literal": new_song}]]}}}]
+            + self._song_list_stages(now),
+            projection={"is_public": 1, "songs": {"$slice": -1}},
+            return_document=ReturnDocument.AFTER
         )
+        if not playlist:
+            return None
 
         # Trigger OG image regeneration for public playlists
         await _trigger_og_regeneration(playlist_id, playlist.get("is_public", False))
 
-        return new_song
+        return playlist["songs"][-1]
 
     async def remove_songs_from_playlist(self, playlist_id: str, indexes: List[int]) -> bool:
-        """Remove songs from a playlist by their indexes."""
+        """Remove songs from a playlist by their indexes (single atomic update)."""
         from bson import ObjectId
         from datetime import datetime
+        from pymongo import ReturnDocument
 
-        playlist = await self.db.playlists.find_one({"_id": ObjectId(playlist_id)})
-        if not playlist:
-            return False
-
-        songs = playlist.get("songs", [])
-        # Remove songs at specified indexes (in reverse order to maintain index validity)
-        new_songs = [song for i, song in enumerate(songs) if i not in indexes]
-
-        # Reindex order
-        for i, song in enumerate(new_songs):
-            song["order"] = i
-
-        cover_urls = self._regenerate_cover_urls(new_songs)
         now = int(datetime.utcnow().timestamp() * 1000)
 
-        await self.db.playlists.update_one(
+        playlist = await self.db.playlists.find_one_and_update(
             {"_id": ObjectId(playlist_id)},
-            {"$set": {
-                "songs": new_songs,
-                "song_count": len(new_songs),
-                "cover_urls": cover_urls,
-                "updated_at": now
-            }}
+            [{"$set": {
+                "songs": {"$map": {
+                    "input": {"$filter": {
+                        "input": {"$range": [0, {"$size": {"$ifNull": ["$songs", []]}}]},
+                        "as": "i",
+                        "cond": {"$not": [{"$in": ["$$i", {"$literal": list(indexes)}]}]}
+                    }},
+                    "as": "i",
+                    "in": {"$arrayElemAt": ["$songs", "$$i"]}
+                }}
+            }}] + self._song_list_stages(now),
+            projection={"is_public": 1},
+            return_document=ReturnDocument.AFTER
         )
+        if not playlist:
+            return False
 
         # Trigger OG image regeneration for public playlists
         await _trigger_og_regeneration(playlist_id, playlist.get("is_public", False))
@@ -1012,37 +1606,36 @@ class Database:
         return True
 
     async def reorder_songs_in_playlist(self, playlist_id: str, new_order: List[int]) -> bool:
-        """Reorder songs in a playlist."""
+        """Reorder songs in a playlist (single atomic update)."""
         from bson import ObjectId
         from datetime import datetime
+        from pymongo import ReturnDocument
 
-        playlist = await self.db.playlists.find_one({"_id": ObjectId(playlist_id)})
-        if not playlist:
-            return False
-
-        songs = playlist.get("songs", [])
-        if len(new_order) != len(songs):
+        # new_order must be a permutation of the current indexes
+        if sorted(new_order) != list(range(len(new_order))):
             return False
 
-        # Reorder songs based on new_order
-        try:
-            reordered = [songs[i] for i in new_order]
-            for i, song in enumerate(reordered):
-                song["order"] = i
-        except IndexError:
-            return False
-
-        cover_urls = self._regenerate_cover_urls(reordered)
         now = int(datetime.utcnow().timestamp() * 1000)
 
-        await self.db.playlists.update_one(
-            {"_id": ObjectId(playlist_id)},
-            {"$set": {
-                "songs": reordered,
-                "cover_urls": cover_urls,
-                "updated_at": now
-            }}
+        # Only applies if the playlist still has exactly len(new_order) songs,
+        # so a concurrent add/remove can't be silently overwritten
+        playlist = await self.db.playlists.find_one_and_update(
+            {
+                "_id": ObjectId(playlist_id),
+                "$expr": {"$eq": [{"$size": {"$ifNull": ["$songs", []]}}, len(new_order)]}
+            },
+            [{"$set": {
+                "songs": {"$map": {
+                    "input": {"$literal": list(new_order)},
+                    "as": "i",
+                    "in": {"$arrayElemAt": ["$songs", "$$i"]}
+                }}
+            }}] + self._song_list_stages(now),
+            projection={"is_public": 1},
+            return_document=ReturnDocument.AFTER
         )
+        if not playlist:
+            return False
 
         # Trigger OG image regeneration for public playlists
         await _trigger_og_regeneration(playlist_id, playlist.get("is_public", False))
@@ -1093,129 +1686,227 @@ class Database:
     # PLAYLIST DISCOVERY
     # ============================================================
 
-    async def get_trending_playlists(self, limit: int = 10, user_id: Optional[str] = None) -> List[Dict]:
-        """Get trending playlists (by weekly plays)."""
-        from bson import ObjectId
+    def _viewer_pipeline(self, user_id: Optional[str], exclude_songs: bool = True) -> List[Dict]:
+        """
+        Pipeline stages that compute viewer-specific fields server-side.
 
-        cursor = self.db.playlists.find(
-            {"is_public": True},
-            {"songs": 0}
-        ).sort("weekly_plays", DESCENDING).limit(limit)
+        is_following is evaluated with $in against the followers array inside
+        MongoDB, and the array itself (plus songs, if requested) is projected
+        out, so returned documents stay constant-size regardless of how many
+        followers a playlist has.
+        """
+        from bson import ObjectId
 
         user_oid = ObjectId(user_id) if user_id else None
+        projection = {"followers": 0}
+        if exclude_songs:
+            projection["songs"] = 0
+
+        return [
+            {"$addFields": {
+                "is_following": {"$in": [user_oid, {"$ifNull": ["$followers", []]}]}
+                if user_oid else False,
+                "is_owner": {"$eq": ["$owner_id", user_oid]} if user_oid else False
+            }},
+            {"$project": projection}
+        ]
+
+    async def _aggregate_playlists(
+        self,
+        match: Dict,
+        sort: List[tuple],
+        limit: int,
+        offset: int = 0,
+        user_id: Optional[str] = None,
+        after: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Run a public playlist listing query and format results for summaries."""
+        pipeline = [{"$match": match}]
+        if "$text" in match:
+            # Materialize the text score so it can be sorted and keyset-filtered
+            pipeline.append({"$addFields": {"score": {"$meta": "textScore"}}})
+        if after:
+            pipeline.append({"$match": after})
+        pipeline.append({"$sort": dict(sort)})
+        if offset:
+            pipeline.append({"$skip": offset})
+        pipeline.append({"$limit": limit})
+        pipeline.extend(self._viewer_pipeline(user_id))
+
         playlists = []
-        async for playlist in cursor:
+        async for playlist in self.db.playlists.aggregate(pipeline):
             playlist["_id"] = str(playlist["_id"])
             playlist["owner_id"] = str(playlist["owner_id"])
-            playlist["is_owner"] = str(playlist["owner_id"]) == user_id if user_id else False
-            playlist["is_following"] = user_oid in playlist.get("followers", []) if user_oid else False
             playlist["followers"] = []
             playlists.append(playlist)
 
         return playlists
 
-    async def get_new_playlists(self, limit: int = 10, user_id: Optional[str] = None) -> List[Dict]:
-        """Get newly published playlists."""
+    def _encode_cursor(self, sort_field: str, value: Any, last_id: str) -> str:
+        """Encode an opaque continuation token for keyset pagination."""
+        raw = json.dumps({"s": sort_field, "v": value, "id": last_id})
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, cursor: str, sort_field: str) -> Dict:
+        """
+        Decode a continuation token into a $match on (sort key, _id).
+
+        Raises:
+            ValueError if the token is malformed or was issued for another sort
+        """
         from bson import ObjectId
 
-        cursor = self.db.playlists.find(
-            {"is_public": True},
-            {"songs": 0}
-        ).sort("published_at", DESCENDING).limit(limit)
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            field, value, last_oid = data["s"], data["v"], ObjectId(data["id"])
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+        if field != sort_field:
+            raise ValueError("Cursor does not match sort order")
+
+        # The token is client-supplied: only a plain sort key may reach the
+        # query, never an operator document such as {"$ne": null}
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float, str))):
+            raise ValueError("Invalid cursor")
+
+        branches = [{sort_field: value, "_id": {"$lt": last_oid}}]
+        if value is not None:
+            # $lt is type-bracketed, so it never matches null or missing keys;
+            # those sort last in descending order and still follow this page
+            branches[:0] = [{sort_field: {"$lt": value}}, {sort_field: None}]
+        return {"$or": branches}
+
+    async def _page_playlists(
+        self,
+        match: Dict,
+        sort_field: str,
+        limit: int,
+        offset: int = 0,
+        user_id: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Keyset-paginated playlist listing ordered by (sort_field, _id) descending.
 
-        user_oid = ObjectId(user_id) if user_id else None
-        playlists = []
-        async for playlist in cursor:
-            playlist["_id"] = str(playlist["_id"])
-            playlist["owner_id"] = str(playlist["owner_id"])
-            playlist["is_owner"] = str(playlist["owner_id"]) == user_id if user_id else False
-            playlist["is_following"] = user_oid in playlist.get("followers", []) if user_oid else False
-            playlist["followers"] = []
-            playlists.append(playlist)
+        Fetches one extra row to decide whether a next page exists, so deep
+        pages cost the same as the first one when clients follow cursors.
+        """
+        after = self._decode_cursor(cursor, sort_field) if cursor else None
+
+        playlists = await self._aggregate_playlists(
+            match,
+            [(sort_field, DESCENDING), ("_id", DESCENDING)],
+            limit + 1,
+            0 if cursor else offset,
+            user_id,
+            after
+        )
 
-        return playlists
+        next_cursor = None
+        if len(playlists) > limit:
+            playlists = playlists[:limit]
+            last = playlists[-1]
+            next_cursor = self._encode_cursor(sort_field, last.get(sort_field), last["_id"])
 
-    async def get_popular_playlists(self, limit: int = 10, user_id: Optional[str] = None) -> List[Dict]:
-        """Get popular playlists (by follower count)."""
-        from bson import ObjectId
+        for playlist in playlists:
+            playlist.pop("score", None)
 
-        cursor = self.db.playlists.find(
+        return playlists, next_cursor
+
+    async def _cached_count(self, key: str, query: Dict) -> int:
+        """Count matching playlists, caching the result for COUNT_CACHE_TTL seconds."""
+        cached = self._count_cache.get(key)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1]
+
+        count = await self.db.playlists.count_documents(query)
+        if len(self._count_cache) > 1000:
+            self._count_cache.clear()
+        self._count_cache[key] = (now + self.COUNT_CACHE_TTL, count)
+        return count
+
+    async def count_public_playlists_estimate(self) -> int:
+        """Approximate number of public playlists (cached)."""
+        return await self._cached_count("public", {"is_public": True})
+
+    async def count_search_playlists_estimate(self, query: str) -> int:
+        """Approximate number of public playlists matching a text search (cached)."""
+        return await self._cached_count(
+            f"search:{query.lower()}",
+            {"is_public": True, "$text": {"$search": query}}
+        )
+
+    async def get_trending_playlists(self, limit: int = 10, user_id: Optional[str] = None) -> List[Dict]:
+        """Get trending playlists (by weekly plays)."""
+        return await self._aggregate_playlists(
             {"is_public": True},
-            {"songs": 0}
-        ).sort("follower_count", DESCENDING).limit(limit)
+            [("weekly_plays", DESCENDING)],
+            limit,
+            user_id=user_id
+        )
 
-        user_oid = ObjectId(user_id) if user_id else None
-        playlists = []
-        async for playlist in cursor:
-            playlist["_id"] = str(playlist["_id"])
-            playlist["owner_id"] = str(playlist["owner_id"])
-            playlist["is_owner"] = str(playlist["owner_id"]) == user_id if user_id else False
-            playlist["is_following"] = user_oid in playlist.get("followers", []) if user_oid else False
-            playlist["followers"] = []
-            playlists.append(playlist)
+    async def get_new_playlists(self, limit: int = 10, user_id: Optional[str] = None) -> List[Dict]:
+        """Get newly published playlists."""
+        return await self._aggregate_playlists(
+            {"is_public": True},
+            [("published_at", DESCENDING)],
+            limit,
+            user_id=user_id
+        )
 
-        return playlists
+    async def get_popular_playlists(self, limit: int = 10, user_id: Optional[str] = None) -> List[Dict]:
+        """Get popular playlists (by follower count)."""
+        return await self._aggregate_playlists(
+            {"is_public": True},
+            [("follower_count", DESCENDING)],
+            limit,
+            user_id=user_id
+        )
 
     async def search_playlists(
         self,
         query: str,
         limit: int = 20,
         offset: int = 0,
-        user_id: Optional[str] = None
-    ) -> List[Dict]:
-        """Search public playlists by name or song."""
-        from bson import ObjectId
-
-        cursor = self.db.playlists.find(
+        user_id: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Search public playlists by name or song. Returns (playlists, next_cursor)."""
+        return await self._page_playlists(
             {"is_public": True, "$text": {"$search": query}},
-            {"songs": 0, "score": {"$meta": "textScore"}}
-        ).sort([("score", {"$meta": "textScore"})]).skip(offset).limit(limit)
-
-        user_oid = ObjectId(user_id) if user_id else None
-        playlists = []
-        async for playlist in cursor:
-            playlist["_id"] = str(playlist["_id"])
-            playlist["owner_id"] = str(playlist["owner_id"])
-            playlist["is_owner"] = str(playlist["owner_id"]) == user_id if user_id else False
-            playlist["is_following"] = user_oid in playlist.get("followers", []) if user_oid else False
-            playlist["followers"] = []
-            playlist.pop("score", None)
-            playlists.append(playlist)
-
-        return playlists
+            "score",
+            limit,
+            offset,
+            user_id,
+            cursor
+        )
 
     async def browse_playlists(
         self,
         sort: str = "popular",
         limit: int = 20,
         offset: int = 0,
-        user_id: Optional[str] = None
-    ) -> List[Dict]:
-        """Browse public playlists with sorting."""
-        from bson import ObjectId
-
+        user_id: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Browse public playlists with sorting. Returns (playlists, next_cursor)."""
         sort_field = {
-            "popular": ("follower_count", DESCENDING),
-            "new": ("published_at", DESCENDING),
-            "trending": ("weekly_plays", DESCENDING)
-        }.get(sort, ("follower_count", DESCENDING))
+            "popular": "follower_count",
+            "new": "published_at",
+            "trending": "weekly_plays"
+        }.get(sort, "follower_count")
 
-        cursor = self.db.playlists.find(
+        return await self._page_playlists(
             {"is_public": True},
-            {"songs": 0}
-        ).sort(*sort_field).skip(offset).limit(limit)
-
-        user_oid = ObjectId(user_id) if user_id else None
-        playlists = []
-        async for playlist in cursor:
-            playlist["_id"] = str(playlist["_id"])
-            playlist["owner_id"] = str(playlist["owner_id"])
-            playlist["is_owner"] = str(playlist["owner_id"]) == user_id if user_id else False
-            playlist["is_following"] = user_oid in playlist.get("followers", []) if user_oid else False
-            playlist["followers"] = []
-            playlists.append(playlist)
-
-        return playlists
+            sort_field,
+            limit,
+            offset,
+            user_id,
+            cursor
+        )
 
     async def get_playlist_owner(self, owner_id: str) -> Optional[Dict]:
         """Get basic owner info for a playlist."""
@@ -15,6 +15,7 @@ from database import Database, set_og_worker_ref
 from models import (
     ChartResponse,
     SongResponse,
+    SongHistoryResponse,
     RegionalResponse,
     SearchResponse,
     WeekListResponse,
@@ -22,6 +23,7 @@ from models import (
 )
 from auth import (
     verify_google_token,
+    close_google_certs,
     create_access_token,
     create_refresh_token,
     verify_token,
@@ -38,6 +40,8 @@ from user_models import (
     UsernameUpdate,
     SyncRequest,
     SyncResponse,
+    DeltaSyncRequest,
+    DeltaSyncResponse,
     FavoritesUpdate,
     HistoryUpdate,
     QueueUpdate,
@@ -66,6 +70,7 @@ from og_image_models import (
     OGImageStatusResponse
 )
 from og_image_worker import get_og_worker, stop_og_worker
+from storage import close_storage
 
 # Initialize database
 db = Database()
@@ -82,6 +87,8 @@ async def lifespan(app: FastAPI):
     # Stop OG image worker
     await stop_og_worker()
     set_og_worker_ref(None)
+    await close_storage()
+    await close_google_certs()
     await db.disconnect()
 
 
@@ -199,6 +206,15 @@ async def get_song_by_id(song_id: str):
     return song
 
 
+@app.get("/song/{song_id}/history", response_model=SongHistoryResponse, tags=["Search"])
+async def get_song_history(song_id: str):
+    """Get every week a song appeared in the main or regional charts."""
+    history = await db.get_song_history(song_id)
+    if not history:
+        raise HTTPException(status_code=404, detail="Song not found")
+    return history
+
+
 # ============================================================
 # REGIONAL ENDPOINTS
 # ============================================================
@@ -278,6 +294,20 @@ async def sync_from_json():
     }
 
 
+@app.post("/admin/rebuild-catalog", tags=["Admin"], dependencies=[Depends(verify_admin_key)])
+async def rebuild_song_catalog():
+    """Rebuild the song catalog and chart entries from all stored charts."""
+    weeks = await db.rebuild_song_catalog()
+    return {"success": True, "weeks": weeks}
+
+
+@app.get("/admin/og-worker/stats", tags=["Admin"], dependencies=[Depends(verify_admin_key)])
+async def og_worker_stats():
+    """OG image job queue depth and render/encode timings."""
+    og_worker = await get_og_worker(db)
+    return await og_worker.get_stats()
+
+
 @app.delete("/admin/chart/{week}", tags=["Admin"], dependencies=[Depends(verify_admin_key)])
 async def delete_chart(week: str):
     """Delete a chart by week."""
@@ -453,7 +483,8 @@ async def sync_playlists(
 
     - Playlists with client-generated IDs (not valid ObjectIds) are created as new
     - Playlists with valid ObjectIds are updated if owned by user
-    - Returns the synced playlists with proper server-side IDs
+    - Playlists unchanged since the last sync are not rewritten
+    - Returns every playlist with proper server-side IDs
     """
     user_id = current_user["sub"]
     synced_playlists = await db.sync_user_playlists(user_id, request.playlists)
@@ -553,6 +584,7 @@ async def get_user_public_playlists(
     username: str,
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = Query(None, description="Continuation token from next_cursor"),
     current_user: Dict = Depends(get_optional_user)
 ):
     """Get a user's public playlists."""
@@ -561,11 +593,17 @@ async def get_user_public_playlists(
         raise HTTPException(status_code=404, detail="User not found")
 
     viewer_id = current_user.get("sub") if current_user else None
-    playlists = await db.get_user_public_playlists(user["id"], limit, offset, viewer_id)
+    try:
+        playlists, next_cursor = await db.get_user_public_playlists(
+            user["id"], limit, offset, viewer_id, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return PlaylistListResponse(
         playlists=playlists,
-        total=await db.count_public_playlists(user["id"])
+        total=await db.count_public_playlists(user["id"]),
+        next_cursor=next_cursor
     )
 
 
@@ -583,7 +621,8 @@ async def sync_user_data(
     - Queue: Local queue takes priority (active session)
     - Preferences: Cloud takes priority if exists
     """
-    user = await db.get_user_by_id(current_user["sub"])
+    # Merge against the stored copy, not a possibly stale cached one
+    user = await db.get_user_by_id(current_user["sub"], use_cache=False)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -611,9 +650,7 @@ async def sync_user_data(
     preferences = cloud_preferences
 
     # Save merged data
-    await db.update_user_favorites(current_user["sub"], merged_favorites)
-    await db.update_user_history(current_user["sub"], merged_history)
-    await db.update_user_queue(current_user["sub"], merged_queue)
+    await db.update_user_library(current_user["sub"], merged_favorites, merged_history, merged_queue)
 
     # Fetch user's playlists from database
     user_playlists = await db.get_user_playlists(current_user["sub"])
@@ -627,6 +664,46 @@ async def sync_user_data(
     )
 
 
+# Payload field required by each delta sync op
+SYNC_OP_FIELDS = {
+    "favorite_add": "favorite",
+    "favorite_remove": "favorite",
+    "history_add": "history",
+    "queue_set": "queue",
+    "preferences_set": "preferences",
+}
+
+
+@app.post("/user/sync/delta", response_model=DeltaSyncResponse, tags=["User"])
+async def sync_user_delta(
+    request: DeltaSyncRequest,
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Versioned delta sync - exchanges only changes since the client's version.
+
+    The client sends the last version it saw plus the ops recorded locally.
+    Ops are applied in one update and the response carries only the change
+    batches from other devices since that version. If the client has no
+    version yet, or is too far behind, the full library is returned with
+    `full: true` and the client should replace its local copy.
+    """
+    ops = []
+    for op in request.ops:
+        field = SYNC_OP_FIELDS.get(op.op)
+        if not field:
+            raise HTTPException(status_code=400, detail=f"Unknown sync op '{op.op}'")
+        if getattr(op, field) is None:
+            raise HTTPException(status_code=400, detail=f"Sync op '{op.op}' requires '{field}'")
+        ops.append(op.model_dump(include={"op", field}))
+
+    result = await db.sync_user_delta(current_user["sub"], request.since_version, ops)
+    if not result:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return result
+
+
 def _merge_favorites(cloud: List[Dict], local: List[Dict]) -> List[Dict]:
     """Merge favorites, deduplicating by title+artist, keeping most recent."""
     seen = {}
@@ -947,11 +1024,15 @@ async def search_playlists(
     q: str = Query(..., min_length=2),
     limit: int = Query(20, ge=1, le=50),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Continuation token from next_cursor"),
     current_user: Optional[Dict] = Depends(get_optional_user)
 ):
     """Search public playlists by name or song."""
     user_id = current_user["sub"] if current_user else None
-    playlists = await db.search_playlists(q, limit, offset, user_id)
+    try:
+        playlists, next_cursor = await db.search_playlists(q, limit, offset, user_id, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Add owner info for each playlist
     for playlist in playlists:
@@ -960,7 +1041,8 @@ async def search_playlists(
 
     return {
         "playlists": [_format_playlist_summary(p) for p in playlists],
-        "total": len(playlists)
+        "total": await db.count_search_playlists_estimate(q),
+        "next_cursor": next_cursor
     }
 
 
@@ -969,11 +1051,15 @@ async def browse_playlists(
     sort: str = Query("popular", regex="^(popular|new|trending)$"),
     limit: int = Query(20, ge=1, le=50),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Continuation token from next_cursor"),
     current_user: Optional[Dict] = Depends(get_optional_user)
 ):
     """Browse public playlists with sorting options."""
     user_id = current_user["sub"] if current_user else None
-    playlists = await db.browse_playlists(sort, limit, offset, user_id)
+    try:
+        playlists, next_cursor = await db.browse_playlists(sort, limit, offset, user_id, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Add owner info for each playlist
     for playlist in playlists:
@@ -982,7 +1068,8 @@ async def browse_playlists(
 
     return {
         "playlists": [_format_playlist_summary(p) for p in playlists],
-        "total": len(playlists)
+        "total": await db.count_public_playlists_estimate(),
+        "next_cursor": next_cursor
     }
 
 
@@ -1010,7 +1097,7 @@ async def regenerate_og_image(
         raise HTTPException(status_code=400, detail="OG images only available for public playlists")
 
     og_worker = await get_og_worker(db)
-    await og_worker.enqueue(playlist_id, request.template or "default")
+    await og_worker.enqueue(playlist_id, request.template or "default", immediate=True)
 
     return {"success": True, "message": "OG image regeneration queued"}
 
@@ -97,6 +97,22 @@ class SongResponse(BaseModel):
     region: Optional[str] = None
 
 
+class SongHistoryEntry(BaseModel):
+    """A single weekly chart appearance of a song."""
+    week: str
+    rank: int
+    source: str = "main"  # "main" or "regional"
+    region: Optional[str] = None
+
+
+class SongHistoryResponse(BaseModel):
+    """Response for a song's chart history."""
+    song_id: str
+    title: str
+    artist: str
+    history: List[SongHistoryEntry]
+
+
 class SearchResult(BaseModel):
     """Single search result."""
     title: str
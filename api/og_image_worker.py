@@ -1,37 +1,91 @@
 """
 OG Image Generation Worker
-In-process async worker using asyncio for generating playlist OG images
+Async worker that renders playlist OG images from the shared MongoDB job queue
 """
 
 import asyncio
-import aiohttp
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 from bson import ObjectId
 import os
+import threading
 
 from PIL import Image, ImageDraw, ImageFont
 
 from storage import get_storage, url_to_path
-from og_image_models import OGImageStatus, OGImageConfig
+from artwork_cache import ArtworkCache
+from og_job_queue import OGJobQueue
+from og_image_models import OGImageStatus, OGImageConfig, OGImageTemplate
+
+
+class PermanentRenderError(ValueError):
+    """Render failure that retrying cannot fix (e.g. playlist deleted)"""
 
 
 class OGImageWorker:
     """
     Async worker for generating OG images.
-    Uses asyncio.Queue for task management with rate limiting.
+
+    Jobs live in the durable `og_jobs` collection (see OGJobQueue), so
+    they survive restarts and any instance can claim them. When
+    `consume` is true the worker runs `concurrency` consumer tasks that
+    lease jobs; Pillow compositing and PNG encoding run in a dedicated
+    thread pool of the same size, so rendering never blocks the event loop.
+
+    Requests are debounced per playlist: repeated triggers within the
+    quiet period collapse into one job, and a render is skipped when the
+    content hash matches the last rendered image.
     """
 
-    def __init__(self, db):
+    def __init__(
+        self,
+        db,
+        concurrency: Optional[int] = None,
+        debounce_seconds: Optional[float] = None,
+        consume: Optional[bool] = None,
+        poll_interval: float = 1.0
+    ):
         self.db = db
         self.storage = get_storage()
-        self.queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self.concurrency = concurrency or int(os.getenv("OG_WORKER_CONCURRENCY", "3"))
+        self.debounce_seconds = (
+            debounce_seconds if debounce_seconds is not None
+            else float(os.getenv("OG_DEBOUNCE_SECONDS", "5"))
+        )
+        # "external" leaves rendering to the standalone worker (og_worker_main.py)
+        self.consume = (
+            consume if consume is not None
+            else os.getenv("OG_WORKER_MODE", "inline") != "external"
+        )
+        self.poll_interval = poll_interval
+        self.jobs = OGJobQueue(db)
+        self.artwork_cache = ArtworkCache(tile_size=OGImageConfig().artwork_size)
         self.processing: set = set()  # Track currently processing playlist IDs
-        self.rate_limit = asyncio.Semaphore(3)  # Max 3 concurrent generations
-        self._worker_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._worker_tasks: List[asyncio.Task] = []
         self._running = False
 
+        # Render metrics (seconds are cumulative totals)
+        self.stats = {
+            "rendered": 0,
+            "failed": 0,
+            "retried": 0,
+            "coalesced": 0,
+            "skipped_unchanged": 0,
+            "compose_seconds": 0.0,
+            "encode_seconds": 0.0,
+            "total_seconds": 0.0,
+            "last_compose_ms": None,
+            "last_encode_ms": None,
+            "last_total_ms": None,
+        }
+
         # Font paths - try multiple locations
         self.font_paths = [
             os.path.join(os.path.dirname(__file__), "fonts"),
@@ -39,57 +93,85 @@ class OGImageWorker:
             "/System/Library/Fonts",
         ]
 
+        # Render assets, built once and shared read-only by render threads
+        self.config = OGImageConfig()
+        self._fonts: Dict[Tuple[int, bool], ImageFont.FreeTypeFont] = {}
+        self._base_layers: Dict[str, Image.Image] = {}
+        self._tile_mask: Optional[Image.Image] = None
+        self._placeholder: Optional[Image.Image] = None
+        self._measure_draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+        self._assets_lock = threading.Lock()
+
     async def start(self):
-        """Start the worker loop"""
+        """Start the consumer loops (no-op when only enqueueing)"""
         if self._running:
             return
 
         self._running = True
-        self._worker_task = asyncio.create_task(self._worker_loop())
-        print("OG Image Worker started")
+        if not self.consume:
+            print("OG Image Worker started (enqueue only)")
+            return
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="og-render"
+        )
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._prepare_assets)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker_loop())
+            for _ in range(self.concurrency)
+        ]
+        print(f"OG Image Worker started ({self.concurrency} consumers)")
 
     async def stop(self):
         """Stop the worker gracefully"""
         self._running = False
 
-        if self._worker_task:
-            self._worker_task.cancel()
-            try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                pass
+        # Unfinished jobs stay leased and are picked up again once the lease expires
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+        await self.artwork_cache.close()
+
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
         print("OG Image Worker stopped")
 
+    async def get_stats(self) -> Dict:
+        """Job queue depth and render timing metrics"""
+        stats = dict(self.stats)
+        rendered = stats["rendered"] or 1
+        stats.update({
+            "jobs": await self.jobs.get_stats(),
+            "in_flight": len(self.processing),
+            "consuming": self.consume,
+            "concurrency": self.concurrency,
+            "avg_compose_ms": round(stats["compose_seconds"] * 1000 / rendered, 1),
+            "avg_encode_ms": round(stats["encode_seconds"] * 1000 / rendered, 1),
+            "avg_total_ms": round(stats["total_seconds"] * 1000 / rendered, 1),
+            "artwork_cache": self.artwork_cache.get_stats(),
+        })
+        return stats
+
     async def _worker_loop(self):
-        """Main worker loop - processes queue items"""
+        """Consumer loop - each consumer leases and renders one job at a time"""
         while self._running:
             try:
-                # Wait for items with timeout to allow graceful shutdown
-                try:
-                    playlist_id, template = await asyncio.wait_for(
-                        self.queue.get(),
-                        timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
-
-                # Skip if already processing this playlist
-                if playlist_id in self.processing:
-                    self.queue.task_done()
+                job = await self.jobs.claim()
+                if job is None:
+                    # Sleep until the next poll, or until a local enqueue
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
                     continue
 
-                # Process with rate limiting
-                async with self.rate_limit:
-                    self.processing.add(playlist_id)
-                    try:
-                        await self._generate_og_image(playlist_id, template)
-                    except Exception as e:
-                        print(f"OG Image generation failed for {playlist_id}: {e}")
-                        await self._mark_failed(playlist_id, str(e))
-                    finally:
-                        self.processing.discard(playlist_id)
-                        self.queue.task_done()
+                await self._process_job(job)
 
             except asyncio.CancelledError:
                 break
@@ -97,103 +179,205 @@ class OGImageWorker:
                 print(f"Worker loop error: {e}")
                 await asyncio.sleep(1)
 
-    async def enqueue(self, playlist_id: str, template: str = "default"):
-        """Add playlist to generation queue"""
-        # Update status to pending
-        await self._update_status(playlist_id, OGImageStatus.PENDING)
+    async def _process_job(self, job: Dict):
+        """Render a leased job and settle it in the queue"""
+        playlist_id = job["_id"]
+        template = job.get("template") or "default"
 
+        self.processing.add(playlist_id)
+        heartbeat = asyncio.create_task(self._keep_lease(job))
+        started = time.perf_counter()
         try:
-            await asyncio.wait_for(
-                self.queue.put((playlist_id, template)),
-                timeout=5.0
-            )
-            print(f"Enqueued OG image generation for playlist {playlist_id}")
-        except asyncio.TimeoutError:
-            print(f"Queue full, could not enqueue {playlist_id}")
-            await self._mark_failed(playlist_id, "Queue full")
-
-    async def _generate_og_image(self, playlist_id: str, template: str):
-        """Generate OG image for a playlist"""
-        print(f"Generating OG image for playlist {playlist_id}")
+            if await self._generate_og_image(playlist_id, template):
+                self.stats["rendered"] += 1
+                elapsed = time.perf_counter() - started
+                self.stats["total_seconds"] += elapsed
+                self.stats["last_total_ms"] = round(elapsed * 1000, 1)
+            else:
+                self.stats["skipped_unchanged"] += 1
+            await self.jobs.complete(job, requeue_delay=self.debounce_seconds)
+        except Exception as e:
+            permanent = isinstance(e, PermanentRenderError)
+            if await self.jobs.fail(job, str(e), retry=not permanent):
+                print(f"OG Image generation failed for {playlist_id} "
+                      f"(attempt {job.get('attempts', 1)}), retrying: {e}")
+                self.stats["retried"] += 1
+                await self._update_status(playlist_id, OGImageStatus.PENDING)
+            else:
+                print(f"OG Image generation failed for {playlist_id}: {e}")
+                self.stats["failed"] += 1
+                await self._mark_failed(playlist_id, str(e))
+        finally:
+            heartbeat.cancel()
+            self.processing.discard(playlist_id)
+
+    async def _keep_lease(self, job: Dict):
+        """Renew a job's lease while it renders, so slow uploads aren't re-claimed"""
+        while True:
+            await asyncio.sleep(self.jobs.heartbeat_seconds)
+            try:
+                if not await self.jobs.renew(job):
+                    print(f"OG Image job {job['_id']} lease lost; another consumer owns it")
+                    return
+            except Exception as e:
+                print(f"Failed to renew OG Image job lease {job['_id']}: {e}")
+
+    async def enqueue(self, playlist_id: str, template: str = "default", immediate: bool = False):
+        """
+        Schedule OG image generation for a playlist.
+
+        Triggers are coalesced into one job per playlist that runs once no
+        new trigger has arrived for `debounce_seconds` (the latest template
+        wins). `immediate` skips the quiet period, e.g. for manual requests.
+        """
+        created = await self.jobs.enqueue(
+            playlist_id,
+            template,
+            delay=0 if immediate else self.debounce_seconds
+        )
+        if immediate:
+            self._wakeup.set()
 
-        # Mark as generating
-        await self._update_status(playlist_id, OGImageStatus.GENERATING)
+        # Only the first trigger in a burst touches the playlist
+        if created:
+            await self._update_status(playlist_id, OGImageStatus.PENDING)
+            print(f"Scheduled OG image generation for playlist {playlist_id}")
+        else:
+            self.stats["coalesced"] += 1
 
+    def _content_hash(
+        self,
+        name: str,
+        owner_name: str,
+        song_count: int,
+        cover_urls: List[str],
+        template: str
+    ) -> str:
+        """Hash of everything that affects the rendered image"""
+        raw = json.dumps([name, owner_name, song_count, cover_urls, template])
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    async def _generate_og_image(self, playlist_id: str, template: str) -> bool:
+        """
+        Generate OG image for a playlist.
+
+        Returns:
+            False if the existing image already matches the content, else True
+        """
         # Fetch playlist data
         playlist = await self.db.get_playlist_by_id(playlist_id, None)
         if not playlist:
-            raise ValueError("Playlist not found")
+            raise PermanentRenderError("Playlist not found")
 
         # Only generate for public playlists
         if not playlist.get("is_public"):
-            raise ValueError("Playlist is not public")
+            raise PermanentRenderError("Playlist is not public")
 
         # Get owner info
         owner = await self.db.get_playlist_owner(playlist["owner_id"])
         owner_name = owner.get("name", "Unknown") if owner else "Unknown"
 
-        # Download artwork images
         cover_urls = playlist.get("cover_urls", [])[:4]
-        artworks = await self._download_artworks(cover_urls)
-
-        # Generate composite image
-        config = OGImageConfig()
-        image = self._create_composite(
-            artworks=artworks,
-            playlist_name=playlist["name"],
-            owner_name=owner_name,
-            song_count=playlist.get("song_count", 0),
-            template=template,
-            config=config
+        content_hash = self._content_hash(
+            playlist["name"],
+            owner_name,
+            playlist.get("song_count", 0),
+            cover_urls,
+            template
         )
 
-        # Convert to bytes
-        img_buffer = BytesIO()
-        image.save(img_buffer, format="PNG", optimize=True)
-        img_bytes = img_buffer.getvalue()
+        # Nothing visible changed since the last render
+        if playlist.get("og_image_url") and playlist.get("og_image_hash") == content_hash:
+            await self._update_status(playlist_id, OGImageStatus.READY)
+            return False
+
+        print(f"Generating OG image for playlist {playlist_id}")
+
+        # Mark as generating
+        await self._update_status(playlist_id, OGImageStatus.GENERATING)
+
+        # Fetch artwork tiles (cached, concurrent, decoded off-loop)
+        artworks = await self.artwork_cache.get_tiles(cover_urls, self._executor)
+
+        # Compose and encode off the event loop
+        loop = asyncio.get_running_loop()
+        img_buffer, compose_seconds, encode_seconds = await loop.run_in_executor(
+            self._executor,
+            self._render_png,
+            artworks,
+            playlist["name"],
+            owner_name,
+            playlist.get("song_count", 0),
+            template
+        )
+        self.stats["compose_seconds"] += compose_seconds
+        self.stats["encode_seconds"] += encode_seconds
+        self.stats["last_compose_ms"] = round(compose_seconds * 1000, 1)
+        self.stats["last_encode_ms"] = round(encode_seconds * 1000, 1)
 
         # Generate unique filename
         version = playlist.get("og_image_version", 0) + 1
         timestamp = int(datetime.utcnow().timestamp())
         filename = f"{playlist_id}/{timestamp}_v{version}.png"
 
-        # Upload to cloud storage
-        url = await self.storage.upload(img_bytes, filename, "image/png")
-
-        # Delete old image if exists
-        old_url = playlist.get("og_image_url")
-        if old_url:
-            try:
-                old_path = url_to_path(old_url)
-                if old_path:
-                    await self.storage.delete(old_path)
-            except Exception as e:
-                print(f"Failed to delete old OG image: {e}")
+        # Upload to cloud storage (streamed from the encode buffer)
+        url = await self.storage.upload(img_buffer, filename, "image/png")
 
         # Update database
-        await self._update_success(playlist_id, url, version, template)
+        await self._update_success(playlist_id, url, version, template, content_hash)
+
+        # Delete old image once the new one is live, without waiting on it
+        old_path = url_to_path(playlist.get("og_image_url"))
+        if old_path:
+            self.storage.delete_in_background([old_path])
         print(f"OG image generated successfully for playlist {playlist_id}: {url}")
+        return True
+
+    def _render_png(
+        self,
+        artworks: List[Image.Image],
+        playlist_name: str,
+        owner_name: str,
+        song_count: int,
+        template: str
+    ) -> Tuple[BytesIO, float, float]:
+        """
+        Compose and PNG-encode an OG image (CPU-bound, runs in the executor).
+
+        Returns:
+            (png_buffer, compose_seconds, encode_seconds)
+        """
+        started = time.perf_counter()
+        image = self._create_composite(
+            artworks=artworks,
+            playlist_name=playlist_name,
+            owner_name=owner_name,
+            song_count=song_count,
+            template=template,
+            config=self.config
+        )
+        composed = time.perf_counter()
 
-    async def _download_artworks(self, urls: List[str]) -> List[Image.Image]:
-        """Download artwork images asynchronously"""
-        images = []
+        img_buffer = BytesIO()
+        image.save(img_buffer, format="PNG", optimize=True)
+        encoded = time.perf_counter()
 
-        if not urls:
-            return images
+        img_buffer.seek(0)
+        return img_buffer, composed - started, encoded - composed
 
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            for url in urls[:4]:
-                try:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.read()
-                            img = Image.open(BytesIO(data))
-                            images.append(img.convert("RGBA"))
-                except Exception as e:
-                    print(f"Failed to download artwork {url}: {e}")
+    def _prepare_assets(self):
+        """Pre-render static layers for every template (runs once at startup)"""
+        for template in OGImageTemplate:
+            self._get_base_layer(template.value)
 
-        return images
+    def _get_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+        """Font for a size/weight, loaded from disk once"""
+        key = (size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._load_font(size, bold)
+            self._fonts[key] = font
+        return font
 
     def _load_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         """Load font with fallback to default"""
@@ -215,6 +399,84 @@ class OGImageWorker:
         # Fallback to default font
         return ImageFont.load_default()
 
+    def _grid_positions(self, config: OGImageConfig) -> List[Tuple[int, int]]:
+        """Top-left corners of the 2x2 artwork grid (left side)"""
+        grid_total_size = (config.artwork_size * 2) + config.artwork_gap
+        grid_x = config.padding
+        grid_y = (config.height - grid_total_size) // 2
+        step = config.artwork_size + config.artwork_gap
+
+        return [
+            (grid_x, grid_y),
+            (grid_x + step, grid_y),
+            (grid_x, grid_y + step),
+            (grid_x + step, grid_y + step)
+        ]
+
+    def _text_x(self, config: OGImageConfig) -> int:
+        """Left edge of the text area (right of the artwork grid)"""
+        return config.padding + (config.artwork_size * 2) + config.artwork_gap + 50
+
+    def _get_base_layer(self, template: str) -> Image.Image:
+        """
+        Static layer for a template: gradient background and branding.
+        Built once per template; callers must copy before drawing on it.
+        """
+        base = self._base_layers.get(template)
+        if base is not None:
+            return base
+
+        with self._assets_lock:
+            base = self._base_layers.get(template)
+            if base is not None:
+                return base
+
+            config = self.config
+            base = Image.new("RGBA", (config.width, config.height))
+            self._add_gradient_background(base, template, config)
+
+            # Add TLDR Music branding (bottom right)
+            draw = ImageDraw.Draw(base)
+            brand_font = self._get_font(24, bold=True)
+            brand_y = config.height - config.padding - 30
+            brand_x = self._text_x(config)
+
+            draw.text((brand_x, brand_y), "TLDR", font=brand_font, fill=config.text_color)
+
+            # Measure "TLDR" width for positioning "Music"
+            tldr_bbox = draw.textbbox((0, 0), "TLDR", font=brand_font)
+            tldr_width = tldr_bbox[2] - tldr_bbox[0]
+
+            draw.text(
+                (brand_x + tldr_width + 8, brand_y),
+                "Music",
+                font=brand_font,
+                fill=config.accent_color
+            )
+
+            self._base_layers[template] = base
+            return base
+
+    def _get_tile_mask(self) -> Image.Image:
+        """Rounded-corner mask for artwork tiles"""
+        if self._tile_mask is None:
+            size = self.config.artwork_size
+            mask = Image.new("L", (size, size), 0)
+            ImageDraw.Draw(mask).rounded_rectangle(
+                [(0, 0), (size, size)], self.config.artwork_radius, fill=255
+            )
+            self._tile_mask = mask
+        return self._tile_mask
+
+    def _get_placeholder(self) -> Image.Image:
+        """Placeholder tile for missing artwork"""
+        if self._placeholder is None:
+            self._placeholder = self._create_placeholder(
+                self.config.artwork_size,
+                self.config.artwork_radius
+            )
+        return self._placeholder
+
     def _create_composite(
         self,
         artworks: List[Image.Image],
@@ -226,50 +488,35 @@ class OGImageWorker:
     ) -> Image.Image:
         """Create the composite OG image"""
 
-        # Create base image with gradient background
-        img = Image.new("RGBA", (config.width, config.height))
-        self._add_gradient_background(img, template, config)
-
+        # Start from the template's pre-rendered static layer
+        if template not in {t.value for t in OGImageTemplate}:
+            template = OGImageTemplate.DEFAULT.value
+        img = self._get_base_layer(template).copy()
         draw = ImageDraw.Draw(img)
 
-        # Calculate artwork grid position (left side)
-        grid_total_size = (config.artwork_size * 2) + config.artwork_gap
-        grid_x = config.padding
-        grid_y = (config.height - grid_total_size) // 2
+        tile_mask = self._get_tile_mask()
+        placeholder = self._get_placeholder()
 
-        # Place artworks in 2x2 grid
-        positions = [
-            (grid_x, grid_y),
-            (grid_x + config.artwork_size + config.artwork_gap, grid_y),
-            (grid_x, grid_y + config.artwork_size + config.artwork_gap),
-            (grid_x + config.artwork_size + config.artwork_gap,
-             grid_y + config.artwork_size + config.artwork_gap)
-        ]
-
-        # Fill with placeholders first
-        for i, pos in enumerate(positions):
+        # Place artworks in 2x2 grid, placeholders for missing ones
+        for i, pos in enumerate(self._grid_positions(config)):
             if i < len(artworks):
-                resized = artworks[i].resize(
-                    (config.artwork_size, config.artwork_size),
-                    Image.LANCZOS
-                )
-                resized = self._add_rounded_corners(resized, config.artwork_radius)
-                img.paste(resized, pos, resized)
+                tile = artworks[i]
+                # Cached tiles arrive pre-resized
+                if tile.size != (config.artwork_size, config.artwork_size):
+                    tile = tile.resize(
+                        (config.artwork_size, config.artwork_size),
+                        Image.LANCZOS
+                    )
+                img.paste(tile, pos, tile_mask)
             else:
-                placeholder = self._create_placeholder(
-                    config.artwork_size,
-                    config.artwork_radius
-                )
                 img.paste(placeholder, pos, placeholder)
 
         # Text area (right side)
-        text_x = grid_x + grid_total_size + 50
+        text_x = self._text_x(config)
         text_area_width = config.width - text_x - config.padding
 
-        # Load fonts
-        title_font = self._load_font(52, bold=True)
-        meta_font = self._load_font(28, bold=False)
-        brand_font = self._load_font(24, bold=True)
+        title_font = self._get_font(52, bold=True)
+        meta_font = self._get_font(28, bold=False)
 
         # Draw playlist name (with word wrap, max 2 lines)
         y_offset = config.height // 2 - 80
@@ -291,23 +538,6 @@ class OGImageWorker:
         songs_text = f"{song_count} song{'s' if song_count != 1 else ''}"
         draw.text((text_x, y_offset), songs_text, font=meta_font, fill="#888888")
 
-        # Add TLDR Music branding (bottom right)
-        brand_y = config.height - config.padding - 30
-        brand_x = text_x
-
-        draw.text((brand_x, brand_y), "TLDR", font=brand_font, fill=config.text_color)
-
-        # Measure "TLDR" width for positioning "Music"
-        tldr_bbox = draw.textbbox((0, 0), "TLDR", font=brand_font)
-        tldr_width = tldr_bbox[2] - tldr_bbox[0]
-
-        draw.text(
-            (brand_x + tldr_width + 8, brand_y),
-            "Music",
-            font=brand_font,
-            fill=config.accent_color
-        )
-
         return img.convert("RGB")
 
     def _add_gradient_background(
@@ -392,13 +622,9 @@ class OGImageWorker:
         lines = []
         current_line = []
 
-        # Create temporary draw context for measuring
-        temp_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(temp_img)
-
         for word in words:
             test_line = " ".join(current_line + [word])
-            bbox = draw.textbbox((0, 0), test_line, font=font)
+            bbox = self._measure_draw.textbbox((0, 0), test_line, font=font)
             width = bbox[2] - bbox[0]
 
             if width <= max_width:
@@ -425,7 +651,8 @@ class OGImageWorker:
         playlist_id: str,
         url: str,
         version: int,
-        template: str
+        template: str,
+        content_hash: str
     ):
         """Update database on successful generation"""
         now = int(datetime.utcnow().timestamp() * 1000)
@@ -436,7 +663,8 @@ class OGImageWorker:
                 "og_image_status": OGImageStatus.READY.value,
                 "og_image_updated_at": now,
                 "og_image_version": version,
-                "og_image_template": template
+                "og_image_template": template,
+                "og_image_hash": content_hash
             }}
         )
 
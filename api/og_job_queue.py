@@ -0,0 +1,205 @@
+"""
+OG Image Job Queue
+Durable MongoDB-backed job queue shared by every API and worker instance
+"""
+
+import os
+import socket
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from pymongo import ReturnDocument
+
+
+class OGJobQueue:
+    """
+    Persistent queue of OG image jobs in the `og_jobs` collection.
+
+    There is at most one job per playlist (`_id` is the playlist ID), so
+    repeated triggers collapse into a single document. Consumers claim a
+    job by atomically leasing it for `lease_seconds` and renews the lease
+    with `renew` while it works; a job whose lease expires (e.g. the
+    instance was scaled down mid-render) becomes claimable again. Every
+    claim gets its own `lease_owner`, so a consumer that lost its lease
+    can no longer complete or fail the job. Failed jobs are retried with
+    exponential backoff up to `max_attempts` times.
+
+    Job states:
+        queued  - waiting until `available_at`
+        leased  - claimed by `lease_owner` until `lease_expires_at`
+    """
+
+    QUEUED = "queued"
+    LEASED = "leased"
+
+    def __init__(
+        self,
+        db,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        backoff_base_seconds: Optional[float] = None,
+        backoff_max_seconds: float = 600
+    ):
+        self.db = db
+        self.lease_seconds = lease_seconds or float(os.getenv("OG_JOB_LEASE_SECONDS", "120"))
+        self.max_attempts = max_attempts or int(os.getenv("OG_JOB_MAX_ATTEMPTS", "5"))
+        self.backoff_base_seconds = (
+            backoff_base_seconds or float(os.getenv("OG_JOB_BACKOFF_SECONDS", "10"))
+        )
+        self.backoff_max_seconds = backoff_max_seconds
+        self.consumer_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @property
+    def jobs(self):
+        return self.db.db.og_jobs
+
+    @staticmethod
+    def _now() -> int:
+        return int(datetime.utcnow().timestamp() * 1000)
+
+    async def enqueue(self, playlist_id: str, template: str = "default", delay: float = 0) -> bool:
+        """
+        Add or refresh the job for a playlist.
+
+        A queued job has its run time pushed back to `now + delay`
+        (debounce) and its template replaced. A job that is currently
+        leased is flagged to run once more after the current render.
+
+        Returns:
+            True if a new job was created, False if an existing one was updated
+        """
+        now = self._now()
+        run_at = now + int(delay * 1000)
+        is_leased = {"$eq": ["$status", self.LEASED]}
+
+        result = await self.jobs.update_one(
+            {"_id": playlist_id},
+            [{"$set": {
+                "template": {"$literal": template},
+                "enqueued_at": now,
+                "status": {"$cond": [is_leased, self.LEASED, self.QUEUED]},
+                "requeue": is_leased,
+                "available_at": {"$cond": [
+                    is_leased,
+                    "$available_at",
+                    # Keep a longer retry backoff unless run immediately
+                    run_at if delay <= 0 else {"$max": [{"$ifNull": ["$available_at", 0]}, run_at]}
+                ]},
+                "attempts": {"$cond": [is_leased, "$attempts", 0]},
+                "created_at": {"$ifNull": ["$created_at", now]}
+            }}],
+            upsert=True
+        )
+        return result.upserted_id is not None
+
+    async def claim(self) -> Optional[Dict]:
+        """
+        Lease the next due job, including jobs whose lease has expired.
+
+        Returns:
+            The job document, or None if nothing is due
+        """
+        now = self._now()
+        return await self.jobs.find_one_and_update(
+            {"$or": [
+                {"status": self.QUEUED, "available_at": {"$lte": now}},
+                {"status": self.LEASED, "lease_expires_at": {"$lte": now}}
+            ]},
+            {
+                "$set": {
+                    "status": self.LEASED,
+                    "lease_owner": f"{self.consumer_id}:{uuid.uuid4().hex[:8]}",
+                    "lease_expires_at": now + int(self.lease_seconds * 1000),
+                    "requeue": False
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    @property
+    def heartbeat_seconds(self) -> float:
+        """How often a running job should renew its lease"""
+        return self.lease_seconds / 3
+
+    async def renew(self, job: Dict) -> bool:
+        """
+        Extend the lease of a job that is still running.
+
+        Returns:
+            False if the lease was lost (it expired and was claimed again)
+        """
+        result = await self.jobs.update_one(
+            {"_id": job["_id"], "lease_owner": job["lease_owner"]},
+            {"$set": {"lease_expires_at": self._now() + int(self.lease_seconds * 1000)}}
+        )
+        return result.matched_count > 0
+
+    async def complete(self, job: Dict, requeue_delay: float = 0):
+        """
+        Finish a leased job. If it was triggered again while rendering,
+        it is re-queued instead of removed.
+        """
+        owned = {"_id": job["_id"], "lease_owner": job["lease_owner"]}
+
+        result = await self.jobs.delete_one({**owned, "requeue": {"$ne": True}})
+        if result.deleted_count:
+            return
+
+        await self.jobs.update_one(owned, {
+            "$set": {
+                "status": self.QUEUED,
+                "available_at": self._now() + int(requeue_delay * 1000),
+                "attempts": 0,
+                "requeue": False
+            },
+            "$unset": {"lease_owner": "", "lease_expires_at": ""}
+        })
+
+    async def fail(self, job: Dict, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt, scheduling a retry with exponential backoff.
+
+        Returns:
+            True if the job will be retried, False if it was given up on
+        """
+        attempts = job.get("attempts", 1)
+        will_retry = retry and attempts < self.max_attempts
+
+        if will_retry:
+            backoff = min(
+                self.backoff_base_seconds * (2 ** (attempts - 1)),
+                self.backoff_max_seconds
+            )
+            await self.jobs.update_one(
+                {"_id": job["_id"], "lease_owner": job["lease_owner"]},
+                {
+                    "$set": {
+                        "status": self.QUEUED,
+                        "available_at": self._now() + int(backoff * 1000),
+                        "last_error": error
+                    },
+                    "$unset": {"lease_owner": "", "lease_expires_at": ""}
+                }
+            )
+        else:
+            # Give up; the playlist keeps the error and a new trigger starts over
+            await self.jobs.delete_one({"_id": job["_id"], "lease_owner": job["lease_owner"]})
+
+        return will_retry
+
+    async def get_stats(self) -> Dict:
+        """Job counts by status, plus how many queued jobs are due now"""
+        counts = {self.QUEUED: 0, self.LEASED: 0}
+        async for row in self.jobs.aggregate([
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]):
+            counts[row["_id"]] = row["count"]
+
+        counts["due"] = await self.jobs.count_documents({
+            "status": self.QUEUED,
+            "available_at": {"$lte": self._now()}
+        })
+        return counts
@@ -0,0 +1,41 @@
+"""
+Standalone OG Image Worker
+Renders OG images from the shared job queue outside the API containers
+
+Usage:
+    python og_worker_main.py
+
+Run the API with OG_WORKER_MODE=external so it only enqueues jobs.
+"""
+
+import asyncio
+import signal
+
+from database import Database
+from og_image_worker import OGImageWorker
+from storage import close_storage
+
+
+async def main():
+    db = Database()
+    await db.connect()
+
+    worker = OGImageWorker(db, consume=True)
+    await worker.start()
+
+    # Run until SIGINT/SIGTERM (Cloud Run sends SIGTERM on scale-down)
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await stop_event.wait()
+    finally:
+        await worker.stop()
+        await close_storage()
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
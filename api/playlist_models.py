@@ -176,6 +176,7 @@ class PlaylistListResponse(BaseModel):
     """Response for list of playlists"""
     playlists: List[PlaylistSummary]
     total: int
+    next_cursor: Optional[str] = None  # Opaque token for the next page, if any
 
 
 class PlaylistResponse(BaseModel):
@@ -205,6 +206,7 @@ class BrowsePlaylistsRequest(BaseModel):
     sort: str = "popular"  # 'popular' | 'new' | 'trending'
     limit: int = Field(default=20, ge=1, le=50)
     offset: int = Field(default=0, ge=0)
+    cursor: Optional[str] = None
 
 
 class SearchPlaylistsRequest(BaseModel):
@@ -212,3 +214,4 @@ class SearchPlaylistsRequest(BaseModel):
     q: str = Field(..., min_length=2)
     limit: int = Field(default=20, ge=1, le=50)
     offset: int = Field(default=0, ge=0)
+    cursor: Optional[str] = None
@@ -5,16 +5,40 @@ Handles uploading and deleting OG images to Google Cloud Storage
 
 import os
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Union
 from io import BytesIO
 import asyncio
+import threading
+
+# Upload payload: raw bytes or a buffer that is streamed without copying
+UploadData = Union[bytes, BytesIO]
 
 
 class CloudStorage(ABC):
-    """Abstract base class for cloud storage"""
+    """
+    Abstract base class for cloud storage
+
+    Blocking I/O runs on a dedicated bounded thread pool
+    (`STORAGE_MAX_WORKERS`) rather than the loop's default executor, so
+    storage calls cannot starve other off-loop work.
+    """
+
+    def __init__(self):
+        self.max_workers = int(os.getenv("STORAGE_MAX_WORKERS", "4"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="storage"
+        )
+        self._background: Set[asyncio.Task] = set()
+
+    async def _run(self, fn, *args):
+        """Run a blocking call on the storage thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
 
     @abstractmethod
-    async def upload(self, data: bytes, path: str, content_type: str = "image/png") -> str:
+    async def upload(self, data: UploadData, path: str, content_type: str = "image/png") -> str:
         """Upload file and return public URL"""
         pass
 
@@ -23,6 +47,33 @@ class CloudStorage(ABC):
         """Delete file by path"""
         pass
 
+    async def delete_many(self, paths: List[str]) -> int:
+        """Delete several files, returning how many were removed"""
+        results = await asyncio.gather(*(self.delete(path) for path in paths))
+        return sum(1 for ok in results if ok)
+
+    def delete_in_background(self, paths: List[str]):
+        """Schedule a batch deletion without waiting for it"""
+        paths = [path for path in paths if path]
+        if not paths:
+            return
+
+        async def _delete():
+            try:
+                await self.delete_many(paths)
+            except Exception as e:
+                print(f"Background delete failed for {paths}: {e}")
+
+        task = asyncio.create_task(_delete())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def close(self):
+        """Wait for pending background deletions and release the thread pool"""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
     @abstractmethod
     def get_public_url(self, path: str) -> str:
         """Get public URL for a path"""
@@ -32,48 +83,92 @@ class CloudStorage(ABC):
 class GCSStorage(CloudStorage):
     """Google Cloud Storage implementation"""
 
+    # GCS batch requests accept at most 100 calls
+    BATCH_SIZE = 100
+
     def __init__(self):
+        super().__init__()
         self.bucket_name = os.getenv("GCS_BUCKET_NAME", "tldrmusic-og-images")
         self.project_id = os.getenv("GCP_PROJECT_ID")
         self._client = None
         self._bucket = None
+        self._client_lock = threading.Lock()
 
     def _get_client(self):
-        """Lazy load GCS client"""
+        """Lazy load GCS client (shared by all storage threads)"""
         if self._client is None:
-            from google.cloud import storage
-            self._client = storage.Client(project=self.project_id)
-            self._bucket = self._client.bucket(self.bucket_name)
+            with self._client_lock:
+                if self._client is None:
+                    import requests
+                    from google.cloud import storage
+                    client = storage.Client(project=self.project_id)
+                    # Size the HTTP connection pool to the thread pool so
+                    # concurrent calls reuse connections instead of reconnecting
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=self.max_workers,
+                        pool_maxsize=self.max_workers
+                    )
+                    client._http.mount("https://", adapter)
+                    self._bucket = client.bucket(self.bucket_name)
+                    self._client = client
         return self._client, self._bucket
 
-    async def upload(self, data: bytes, path: str, content_type: str = "image/png") -> str:
+    async def upload(self, data: UploadData, path: str, content_type: str = "image/png") -> str:
         """Upload file to GCS and return public URL"""
         def _upload():
             _, bucket = self._get_client()
             blob = bucket.blob(path)
-            blob.upload_from_string(data, content_type=content_type)
-            # Make the blob publicly accessible
-            blob.make_public()
+            # Stream from the buffer and make the blob publicly readable in
+            # the same request
+            stream = data if isinstance(data, BytesIO) else BytesIO(data)
+            blob.upload_from_file(
+                stream,
+                rewind=True,
+                content_type=content_type,
+                predefined_acl="publicRead"
+            )
             return blob.public_url
 
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        url = await loop.run_in_executor(None, _upload)
-        return url
+        return await self._run(_upload)
 
     async def delete(self, path: str) -> bool:
         """Delete file from GCS"""
         def _delete():
             try:
                 _, bucket = self._get_client()
-                blob = bucket.blob(path)
-                blob.delete()
+                bucket.delete_blob(path)
                 return True
             except Exception:
                 return False
 
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _delete)
+        return await self._run(_delete)
+
+    async def delete_many(self, paths: List[str]) -> int:
+        """Delete files from GCS using batch requests"""
+        def _delete_batch(chunk: List[str]) -> int:
+            client, bucket = self._get_client()
+            try:
+                with client.batch():
+                    for path in chunk:
+                        bucket.delete_blob(path)
+                return len(chunk)
+            except Exception:
+                # A missing blob fails the whole batch; fall back to one by one
+                deleted = 0
+                for path in chunk:
+                    try:
+                        bucket.delete_blob(path)
+                        deleted += 1
+                    except Exception:
+                        continue
+                return deleted
+
+        chunks = [
+            paths[i:i + self.BATCH_SIZE]
+            for i in range(0, len(paths), self.BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(self._run(_delete_batch, chunk) for chunk in chunks))
+        return sum(results)
 
     def get_public_url(self, path: str) -> str:
         """Get public URL for a GCS path"""
@@ -83,28 +178,32 @@ class GCSStorage(CloudStorage):
 class LocalStorage(CloudStorage):
     """
     Local filesystem storage for development/testing
-    Stores files in a local directory and serves via the API
+    Stores files in a local directory and serves via the API.
+    Shares the GCS backend's interface, so it doubles as a stand-in for
+    exercising the OG pipeline without cloud credentials.
     """
 
-    def __init__(self):
-        self.base_path = os.getenv("LOCAL_STORAGE_PATH", "/tmp/og-images")
-        self.base_url = os.getenv("LOCAL_STORAGE_URL", "http://localhost:8000/og-images")
+    def __init__(self, base_path: Optional[str] = None, base_url: Optional[str] = None):
+        super().__init__()
+        self.base_path = base_path or os.getenv("LOCAL_STORAGE_PATH", "/tmp/og-images")
+        self.base_url = base_url or os.getenv("LOCAL_STORAGE_URL", "http://localhost:8000/og-images")
         # Ensure directory exists
         os.makedirs(self.base_path, exist_ok=True)
 
-    async def upload(self, data: bytes, path: str, content_type: str = "image/png") -> str:
+    async def upload(self, data: UploadData, path: str, content_type: str = "image/png") -> str:
         """Save file locally and return URL"""
         full_path = os.path.join(self.base_path, path)
 
-        # Ensure parent directory exists
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-
         def _write():
-            with open(full_path, 'wb') as f:
-                f.write(data)
+            # Ensure parent directory exists
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            tmp_path = f"{full_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                # getbuffer() exposes the buffer's memory without a copy
+                f.write(data.getbuffer() if isinstance(data, BytesIO) else data)
+            os.replace(tmp_path, full_path)
 
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, _write)
+        await self._run(_write)
 
         return self.get_public_url(path)
 
@@ -120,8 +219,7 @@ class LocalStorage(CloudStorage):
             except Exception:
                 return False
 
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _delete)
+        return await self._run(_delete)
 
     def get_public_url(self, path: str) -> str:
         """Get URL for local file"""
@@ -148,6 +246,15 @@ def get_storage() -> CloudStorage:
     return _storage
 
 
+async def close_storage():
+    """Flush background deletions and release the storage backend"""
+    global _storage
+
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
+
+
 def url_to_path(url: str) -> Optional[str]:
     """Extract storage path from a URL"""
     if not url:
@@ -0,0 +1,176 @@
+"""
+Offline tests for Google cert caching in auth.py
+
+Certs are served by a local aiohttp stand-in for Google's certs endpoint,
+and the cache's clock is replaced so expiry and rate limits can be
+stepped through without waiting.
+
+Run from api/:
+    python -m pytest tests
+"""
+
+import asyncio
+import types
+
+import jwt
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fastapi import HTTPException
+
+import auth
+from auth import GoogleCertCache
+
+
+class CertsStandIn:
+    """Local certs endpoint whose response can be changed between requests"""
+
+    def __init__(self, certs=None, max_age=3600, status=200):
+        self.certs = certs if certs is not None else {"key-1": "pem-1"}
+        self.max_age = max_age
+        self.status = status
+        self.fetches = 0
+        self._server = None
+
+    async def _handle(self, request):
+        self.fetches += 1
+        if self.status != 200:
+            return web.Response(status=self.status)
+        return web.json_response(
+            self.certs,
+            headers={"Cache-Control": f"public, max-age={self.max_age}"}
+        )
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/certs", self._handle)
+        self._server = TestServer(app)
+        await self._server.start_server()
+        return str(self._server.make_url("/certs"))
+
+    async def close(self):
+        await self._server.close()
+
+
+class FakeClock:
+    """Stand-in for time.monotonic, advanced by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Only auth's view of time; the event loop keeps the real clock
+    monkeypatch.setattr(auth, "time", types.SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def run_with_cache(stand_in: CertsStandIn, scenario):
+    """Run `scenario(cache)` against a cert cache pointed at the stand-in"""
+    async def main():
+        url = await stand_in.start()
+        cache = GoogleCertCache(url)
+        try:
+            await scenario(cache)
+        finally:
+            await cache.close()
+            await stand_in.close()
+
+    asyncio.run(main())
+
+
+def test_certs_cached_until_max_age(clock):
+    stand_in = CertsStandIn(max_age=300)
+
+    async def scenario(cache):
+        assert await cache.get_certs("key-1") == {"key-1": "pem-1"}
+        assert stand_in.fetches == 1
+
+        clock.advance(299)
+        await cache.get_certs("key-1")
+        assert stand_in.fetches == 1
+
+        stand_in.certs = {"key-2": "pem-2"}
+        clock.advance(2)
+        assert await cache.get_certs() == {"key-2": "pem-2"}
+        assert stand_in.fetches == 2
+
+    run_with_cache(stand_in, scenario)
+
+
+def test_unknown_kid_refresh_is_rate_limited(clock):
+    stand_in = CertsStandIn(max_age=3600)
+
+    async def scenario(cache):
+        await cache.get_certs("key-1")
+
+        # Google rotated keys, but only one forced refresh per interval
+        stand_in.certs = {"key-1": "pem-1", "key-2": "pem-2"}
+        clock.advance(GoogleCertCache.MIN_REFRESH_INTERVAL - 1)
+        assert "key-2" not in await cache.get_certs("key-2")
+        assert "key-2" not in await cache.get_certs("unknown")
+        assert stand_in.fetches == 1
+
+        clock.advance(1)
+        assert "key-2" in await cache.get_certs("key-2")
+        assert stand_in.fetches == 2
+
+    run_with_cache(stand_in, scenario)
+
+
+def test_concurrent_requests_share_one_refresh(clock):
+    stand_in = CertsStandIn()
+
+    async def scenario(cache):
+        results = await asyncio.gather(*(cache.get_certs("key-1") for _ in range(20)))
+        assert all(certs == {"key-1": "pem-1"} for certs in results)
+        assert stand_in.fetches == 1
+
+    run_with_cache(stand_in, scenario)
+
+
+def test_stale_certs_used_when_refresh_fails(clock):
+    stand_in = CertsStandIn(max_age=300)
+
+    async def scenario(cache):
+        await cache.get_certs("key-1")
+
+        stand_in.status = 500
+        clock.advance(301)
+        assert await cache.get_certs("key-1") == {"key-1": "pem-1"}
+        assert stand_in.fetches == 2
+
+        # Recovers once the endpoint is back
+        stand_in.status = 200
+        stand_in.certs = {"key-2": "pem-2"}
+        clock.advance(GoogleCertCache.MIN_REFRESH_INTERVAL)
+        assert await cache.get_certs("key-2") == {"key-2": "pem-2"}
+
+    run_with_cache(stand_in, scenario)
+
+
+def test_verify_returns_503_without_any_certs(clock, monkeypatch):
+    stand_in = CertsStandIn(status=503)
+    token = jwt.encode(
+        {"sub": "123"},
+        "offline-test-signing-key-0123456789",
+        algorithm="HS256",
+        headers={"kid": "key-1"}
+    )
+
+    async def scenario(cache):
+        monkeypatch.setattr(auth, "_google_certs", cache)
+        with pytest.raises(HTTPException) as exc_info:
+            await auth.verify_google_token(token)
+        assert exc_info.value.status_code == 503
+        assert stand_in.fetches == 1
+
+    run_with_cache(stand_in, scenario)
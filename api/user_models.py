@@ -153,6 +153,44 @@ class SyncResponse(BaseModel):
     merged_playlists: List[Dict[str, Any]] = []
 
 
+class SyncOp(BaseModel):
+    """A single library change recorded by the client"""
+    op: str  # 'favorite_add' | 'favorite_remove' | 'history_add' | 'queue_set' | 'preferences_set'
+    favorite: Optional[FavoriteItem] = None  # favorite_add / favorite_remove
+    history: Optional[HistoryItem] = None  # history_add
+    queue: Optional[List[QueueItem]] = None  # queue_set
+    preferences: Optional[UserPreferences] = None  # preferences_set
+
+
+class SyncChange(BaseModel):
+    """A batch of ops applied on the server at a given version"""
+    v: int
+    ops: List[SyncOp]
+    at: int  # Unix timestamp in ms
+
+
+class DeltaSyncRequest(BaseModel):
+    """Request for versioned delta sync"""
+    since_version: Optional[int] = None  # None = client has no cloud state yet
+    ops: List[SyncOp] = []
+
+
+class DeltaSyncResponse(BaseModel):
+    """
+    Response for versioned delta sync.
+
+    When `full` is true the client's version is too old (or unset) and the
+    complete library is returned instead of `changes`.
+    """
+    version: int
+    full: bool = False
+    changes: List[SyncChange] = []
+    favorites: Optional[List[FavoriteItem]] = None
+    history: Optional[List[HistoryItem]] = None
+    queue: Optional[List[QueueItem]] = None
+    preferences: Optional[UserPreferences] = None
+
+
 # ============================================================
 # UPDATE REQUESTS
 # ============================================================
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark OG Image Render Assets
+
+This script:
+1. Renders OG images on one thread through OGImageWorker._create_composite,
+   which starts from the template's pre-rendered base layer and uses
+   cached fonts, tile mask and placeholder
+2. Renders the same images with the old compose path, which drew the
+   gradient, loaded fonts from disk and built masks and placeholders
+   on every render
+3. Reports renders per second per core (compose only, and compose plus
+   PNG encode) for both, per template
+
+No MongoDB, network or cloud credentials needed.
+
+Usage:
+    python scripts/benchmark_og_render_assets.py [--renders 50] [--missing-tiles 1]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+# The OG worker lives in api/ as flat modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+# The worker creates its storage and artwork cache on construction
+SCRATCH_DIR = tempfile.mkdtemp(prefix="og-assets-benchmark-")
+os.environ.setdefault("ARTWORK_CACHE_DIR", os.path.join(SCRATCH_DIR, "artwork"))
+os.environ.setdefault("LOCAL_STORAGE_PATH", os.path.join(SCRATCH_DIR, "og-images"))
+
+from PIL import Image, ImageDraw
+
+from og_image_models import OGImageConfig, OGImageTemplate
+from og_image_worker import OGImageWorker
+
+
+def legacy_composite(worker: OGImageWorker, artworks, playlist_name, owner_name,
+                     song_count, template, config: OGImageConfig):
+    """The compose path as it was before render assets were cached"""
+    img = Image.new("RGBA", (config.width, config.height))
+    worker._add_gradient_background(img, template, config)
+
+    draw = ImageDraw.Draw(img)
+
+    grid_total_size = (config.artwork_size * 2) + config.artwork_gap
+    for i, pos in enumerate(worker._grid_positions(config)):
+        if i < len(artworks):
+            tile = worker._add_rounded_corners(artworks[i], config.artwork_radius)
+            img.paste(tile, pos, tile)
+        else:
+            placeholder = worker._create_placeholder(config.artwork_size, config.artwork_radius)
+            img.paste(placeholder, pos, placeholder)
+
+    text_x = config.padding + grid_total_size + 50
+    text_area_width = config.width - text_x - config.padding
+
+    title_font = worker._load_font(52, bold=True)
+    meta_font = worker._load_font(28, bold=False)
+    brand_font = worker._load_font(24, bold=True)
+
+    y_offset = config.height // 2 - 80
+    wrapped_title = worker._wrap_text(playlist_name, title_font, text_area_width)
+    for i, line in enumerate(wrapped_title[:2]):
+        if i == 1 and len(wrapped_title) > 2:
+            line = line[:len(line)-3] + "..."
+        draw.text((text_x, y_offset), line, font=title_font, fill=config.text_color)
+        y_offset += 64
+
+    y_offset += 16
+    draw.text((text_x, y_offset), f"by {owner_name}", font=meta_font, fill=config.secondary_text_color)
+
+    y_offset += 40
+    songs_text = f"{song_count} song{'s' if song_count != 1 else ''}"
+    draw.text((text_x, y_offset), songs_text, font=meta_font, fill="#888888")
+
+    brand_y = config.height - config.padding - 30
+    draw.text((text_x, brand_y), "TLDR", font=brand_font, fill=config.text_color)
+    tldr_bbox = draw.textbbox((0, 0), "TLDR", font=brand_font)
+    draw.text(
+        (text_x + tldr_bbox[2] - tldr_bbox[0] + 8, brand_y),
+        "Music",
+        font=brand_font,
+        fill=config.accent_color
+    )
+
+    return img.convert("RGB")
+
+
+def make_tiles(count: int, size: int, seed: int = 7):
+    """Pre-resized RGBA tiles, as the artwork cache hands them out"""
+    rng = random.Random(seed)
+    return [
+        Image.new("RGBA", (size, size), tuple(rng.randrange(256) for _ in range(3)) + (255,))
+        for _ in range(count)
+    ]
+
+
+def make_renders(count: int, tiles, missing_tiles: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [
+        (
+            rng.sample(tiles, 4 - missing_tiles),
+            f"Benchmark playlist {i} with a reasonably long title",
+            f"Benchmark User {i}",
+            rng.randint(1, 100),
+        )
+        for i in range(count)
+    ]
+
+
+def rate(compose, renders, template: str, encode: bool) -> float:
+    """Renders per second on this thread"""
+    started = time.perf_counter()
+    for artworks, name, owner, song_count in renders:
+        image = compose(artworks, name, owner, song_count, template)
+        if encode:
+            image.save(BytesIO(), format="PNG", optimize=True)
+    return len(renders) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OG image render asset caching")
+    parser.add_argument("--renders", type=int, default=50,
+                        help="Renders per template and path (default: 50)")
+    parser.add_argument("--missing-tiles", type=int, default=1, choices=range(5),
+                        help="Tiles per render left to the placeholder (default: 1)")
+
+    args = parser.parse_args()
+
+    worker = OGImageWorker(db=None, concurrency=1, consume=False)
+    config = worker.config
+    worker._prepare_assets()
+
+    def cached(artworks, name, owner, song_count, template):
+        return worker._create_composite(artworks, name, owner, song_count, template, config)
+
+    def legacy(artworks, name, owner, song_count, template):
+        return legacy_composite(worker, artworks, name, owner, song_count, template, config)
+
+    renders = make_renders(args.renders, make_tiles(20, config.artwork_size), args.missing_tiles)
+    # Warm up allocators and the font cache
+    rate(cached, renders[:3], OGImageTemplate.DEFAULT.value, encode=True)
+    rate(legacy, renders[:3], OGImageTemplate.DEFAULT.value, encode=True)
+
+    print(f"{args.renders} renders per template, {args.missing_tiles} placeholder tile(s), "
+          f"{config.width}x{config.height}, one thread")
+    print(f"\n{'template':<10}{'compose/s old':>15}{'compose/s new':>15}{'speed-up':>10}"
+          f"{'render/s old':>14}{'render/s new':>14}{'speed-up':>10}")
+    for template in OGImageTemplate:
+        compose_old = rate(legacy, renders, template.value, encode=False)
+        compose_new = rate(cached, renders, template.value, encode=False)
+        render_old = rate(legacy, renders, template.value, encode=True)
+        render_new = rate(cached, renders, template.value, encode=True)
+        print(f"{template.value:<10}{compose_old:>15.1f}{compose_new:>15.1f}"
+              f"{compose_new / compose_old:>9.1f}x"
+              f"{render_old:>14.1f}{render_new:>14.1f}{render_new / render_old:>9.1f}x")
+
+    print("\nrender/s includes PNG encoding, which is the same on both paths; "
+          "renders per core scale with OG_WORKER_CONCURRENCY up to the core count")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmark OG Image Rendering Throughput and Event Loop Impact
+
+This script:
+1. Renders N playlists through OGImageWorker's real consumer loops, with
+   an in-memory job queue, an in-memory playlist store, LocalStorage as
+   the GCS stand-in and artwork pre-seeded into the disk cache
+2. Repeats the run with 1 consumer and with --concurrency consumers and
+   reports renders per second, compose and encode time
+3. Measures event loop lag while rendering, i.e. how late a 5 ms timer
+   fires, which is what any concurrent API request would wait on top of
+   its own work
+
+No MongoDB, network or cloud credentials needed.
+
+Usage:
+    python scripts/benchmark_og_render_workers.py [--playlists 60] [--concurrency 4]
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import types
+from collections import deque
+from io import BytesIO, StringIO
+from pathlib import Path
+
+# The OG worker lives in api/ as flat modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+# Keep all caches and uploads in a scratch directory
+SCRATCH_DIR = tempfile.mkdtemp(prefix="og-benchmark-")
+os.environ.setdefault("ARTWORK_CACHE_DIR", os.path.join(SCRATCH_DIR, "artwork"))
+
+from bson import ObjectId
+from PIL import Image
+
+from artwork_cache import ArtworkCache
+from og_image_worker import OGImageWorker
+from storage import LocalStorage
+
+
+class PlaylistCollection:
+    """`db.playlists` stand-in: applies the worker's $set updates"""
+
+    def __init__(self, playlists):
+        self.playlists = playlists
+
+    async def update_one(self, query, update):
+        playlist = self.playlists.get(str(query["_id"]))
+        if playlist:
+            playlist.update(update.get("$set", {}))
+
+
+class PlaylistStore:
+    """The parts of Database the worker reads and writes, kept in memory"""
+
+    def __init__(self, playlists):
+        self.playlists = {p["_id"]: p for p in playlists}
+        self.db = types.SimpleNamespace(playlists=PlaylistCollection(self.playlists))
+
+    async def get_playlist_by_id(self, playlist_id, user_id=None):
+        playlist = self.playlists.get(playlist_id)
+        return dict(playlist) if playlist else None
+
+    async def get_playlist_owner(self, owner_id):
+        return {"id": owner_id, "name": "Benchmark User"}
+
+
+class MemoryJobQueue:
+    """OGJobQueue stand-in that hands out each playlist once"""
+
+    heartbeat_seconds = 60
+
+    def __init__(self, playlist_ids):
+        self.pending = deque(playlist_ids)
+        self.remaining = len(playlist_ids)
+        self.errors = []
+        self.done = asyncio.Event()
+
+    async def claim(self):
+        if not self.pending:
+            return None
+        return {"_id": self.pending.popleft(), "template": "default", "attempts": 1, "lease_owner": "benchmark"}
+
+    async def renew(self, job):
+        return True
+
+    async def _settle(self):
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.done.set()
+
+    async def complete(self, job, requeue_delay=0):
+        await self._settle()
+
+    async def fail(self, job, error, retry=True):
+        self.errors.append(f"{job['_id']}: {error}")
+        await self._settle()
+        return False
+
+    async def get_stats(self):
+        return {"queued": len(self.pending)}
+
+
+class LoopLagProbe:
+    """Records how late a short sleep wakes up while the loop is busy"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lags_ms = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags_ms.append(max(0.0, loop.time() - expected) * 1000)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    def summary(self):
+        lags = sorted(self.lags_ms) or [0.0]
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+        return statistics.median(lags), p99, lags[-1]
+
+
+def seed_artwork(urls, size: int = 640):
+    """Write JPEG artwork for each URL into the worker's disk cache"""
+    cache = ArtworkCache(tile_size=1)
+    rng = random.Random(7)
+    for url in urls:
+        color = tuple(rng.randrange(256) for _ in range(3))
+        buffer = BytesIO()
+        Image.new("RGB", (size, size), color).save(buffer, format="JPEG", quality=90)
+        cache._write_disk(cache._disk_path(url), buffer.getvalue())
+
+
+def make_playlists(count: int, artwork_urls, seed: int):
+    rng = random.Random(seed)
+    return [
+        {
+            "_id": str(ObjectId()),
+            "name": f"Benchmark playlist {i} with a reasonably long title",
+            "owner_id": str(ObjectId()),
+            "is_public": True,
+            "song_count": rng.randint(5, 100),
+            "cover_urls": rng.sample(artwork_urls, 4),
+        }
+        for i in range(count)
+    ]
+
+
+async def render_all(consumers: int, playlists, storage: LocalStorage):
+    """Render every playlist with `consumers` consumer tasks; returns worker stats and timings"""
+    store = PlaylistStore(playlists)
+    worker = OGImageWorker(store, concurrency=consumers, debounce_seconds=0, consume=True, poll_interval=0.01)
+    worker.storage = storage
+    worker.jobs = MemoryJobQueue([p["_id"] for p in playlists])
+
+    probe = LoopLagProbe()
+    probe.start()
+
+    # The worker logs every render; keep the report readable
+    with contextlib.redirect_stdout(StringIO()):
+        started = time.perf_counter()
+        await worker.start()
+        await worker.jobs.done.wait()
+        elapsed = time.perf_counter() - started
+        await worker.stop()
+    await probe.stop()
+
+    for error in worker.jobs.errors:
+        print(f"Render failed for {error}")
+    return worker.stats, elapsed, probe.summary()
+
+
+async def run(args):
+    artwork_urls = [f"https://img.example/artwork/{i}.jpg" for i in range(args.artworks)]
+    seed_artwork(artwork_urls)
+    storage = LocalStorage(
+        base_path=os.path.join(SCRATCH_DIR, "og-images"),
+        base_url="http://localhost/og-images"
+    )
+
+    print(f"Rendering {args.playlists} playlists ({args.artworks} distinct artworks), "
+          f"scratch dir {SCRATCH_DIR}")
+    print(f"\n{'consumers':<11}{'renders/s':>11}{'compose ms':>12}{'encode ms':>11}"
+          f"{'lag p50 ms':>12}{'lag p99 ms':>12}{'lag max ms':>12}")
+
+    baseline = None
+    for consumers in dict.fromkeys([1, args.concurrency]):
+        playlists = make_playlists(args.playlists, artwork_urls, seed=consumers)
+        stats, elapsed, (lag_p50, lag_p99, lag_max) = await render_all(consumers, playlists, storage)
+
+        rendered = stats["rendered"] or 1
+        rate = stats["rendered"] / elapsed
+        baseline = baseline or rate
+        print(f"{consumers:<11}{rate:>11.1f}"
+              f"{stats['compose_seconds'] * 1000 / rendered:>12.1f}"
+              f"{stats['encode_seconds'] * 1000 / rendered:>11.1f}"
+              f"{lag_p50:>12.1f}{lag_p99:>12.1f}{lag_max:>12.1f}")
+
+    await storage.close()
+    print(f"\nSpeed-up with {args.concurrency} consumers: {rate / baseline:.2f}x "
+          f"({os.cpu_count()} CPUs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OG image rendering throughput")
+    parser.add_argument("--playlists", type=int, default=60,
+                        help="Playlists to render per run (default: 60)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Consumers for the parallel run (default: 4)")
+    parser.add_argument("--artworks", type=int, default=40,
+                        help="Distinct artwork images shared by the playlists (default: 40)")
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark Playlist Listings with Large Follower Arrays
+
+This script:
+1. Seeds a scratch MongoDB database with public playlists that each have
+   100k followers (by default)
+2. Times browse, search and single-playlist reads through api/database.py,
+   which compute is_following inside MongoDB
+3. Times the old approach (load the followers array, check membership in
+   Python) and compares latency and bytes returned per page
+
+The scratch database is dropped afterwards.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 python scripts/benchmark_playlist_followers.py \\
+        [--playlists 20] [--followers 100000] [--runs 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bson import ObjectId, encode
+from pymongo import DESCENDING
+
+# The playlist API lives in api/ as flat modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from database import Database
+
+WORDS = ["chill", "party", "focus", "bollywood", "indie", "retro", "workout", "rain", "late", "night"]
+
+
+async def seed(db: Database, num_playlists: int, num_followers: int):
+    """Public playlists, each followed by `num_followers` users"""
+    owner = ObjectId()
+    followers = [ObjectId() for _ in range(num_followers)]
+    songs = [
+        {"title": f"Song {i}", "artist": f"Artist {i}", "videoId": f"vid{i}", "artwork": None}
+        for i in range(50)
+    ]
+
+    for i in range(num_playlists):
+        await db.db.playlists.insert_one({
+            "name": f"{WORDS[i % len(WORDS)]} {WORDS[(i * 3) % len(WORDS)]} mix {i}",
+            "description": "",
+            "owner_id": owner,
+            "is_public": True,
+            "published_at": i,
+            "cover_urls": [],
+            "songs": songs,
+            "song_count": len(songs),
+            "follower_count": num_followers - i,
+            "followers": followers,
+            "created_at": i,
+            "updated_at": i,
+            "play_count": 0,
+            "weekly_plays": i,
+        })
+
+    # A viewer who follows everything, so membership is actually found
+    return str(followers[-1])
+
+
+async def legacy_browse(db: Database, user_id: str, limit: int):
+    """
+    Browse as it worked before: the followers array is loaded and
+    membership checked in Python (documents returned as loaded, so their
+    size is what came back from MongoDB)
+    """
+    user_oid = ObjectId(user_id)
+    cursor = db.db.playlists.find(
+        {"is_public": True}, {"songs": 0}
+    ).sort("follower_count", DESCENDING).limit(limit)
+
+    playlists = []
+    async for playlist in cursor:
+        playlist["is_following"] = user_oid in playlist.get("followers", [])
+        playlists.append(playlist)
+    return playlists
+
+
+async def legacy_get_playlist(db: Database, playlist_id: str, user_id: str):
+    """Single playlist read as it worked before"""
+    playlist = await db.db.playlists.find_one({"_id": ObjectId(playlist_id)})
+    playlist["is_following"] = ObjectId(user_id) in playlist.get("followers", [])
+    return [playlist]
+
+
+async def time_async(fn, runs: int):
+    """Median and p95 latency in ms, and BSON size of the last result's documents"""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    size = sum(len(encode({k: v for k, v in doc.items() if k != "_id"})) for doc in result)
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statistics.median(timings), p95, size
+
+
+async def run(args):
+    os.environ["MONGODB_DB"] = args.db
+    db = Database()
+    await db.connect()
+
+    try:
+        await db.db.playlists.delete_many({})
+        print(f"Seeding {args.playlists} playlists with {args.followers} followers each...")
+        start = time.perf_counter()
+        viewer = await seed(db, args.playlists, args.followers)
+        print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+        first = await db.db.playlists.find_one({}, {"_id": 1})
+        playlist_id = str(first["_id"])
+
+        async def browse(sort):
+            playlists, _ = await db.browse_playlists(sort, args.limit, user_id=viewer)
+            return playlists
+
+        async def search():
+            playlists, _ = await db.search_playlists("chill", args.limit, user_id=viewer)
+            return playlists
+
+        async def get_playlist():
+            return [await db.get_playlist_by_id(playlist_id, viewer)]
+
+        cases = [
+            ("browse popular", lambda: browse("popular"), lambda: legacy_browse(db, viewer, args.limit)),
+            ("browse trending", lambda: browse("trending"), None),
+            ("search", search, None),
+            ("get playlist", get_playlist, lambda: legacy_get_playlist(db, playlist_id, viewer)),
+        ]
+
+        print(f"\n=== Latency ({args.runs} runs, ms) and bytes per response ===")
+        print(f"{'query':<18}{'median':>10}{'p95':>10}{'bytes':>12}{'old median':>12}{'old bytes':>14}")
+        for name, fn, legacy in cases:
+            median, p95, size = await time_async(fn, args.runs)
+
+            old_median, old_size = "", ""
+            if legacy is not None:
+                legacy_median, _, legacy_size = await time_async(legacy, args.runs)
+                old_median, old_size = f"{legacy_median:.1f}", str(legacy_size)
+
+            print(f"{name:<18}{median:>10.1f}{p95:>10.1f}{size:>12}{old_median:>12}{old_size:>14}")
+    finally:
+        await db.client.drop_database(args.db)
+        await db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark playlist listings with large follower arrays")
+    parser.add_argument("--playlists", type=int, default=20,
+                        help="Number of public playlists (default: 20)")
+    parser.add_argument("--followers", type=int, default=100_000,
+                        help="Followers per playlist (default: 100000)")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="Page size (default: 20)")
+    parser.add_argument("--runs", type=int, default=20,
+                        help="Runs per query (default: 20)")
+    parser.add_argument("--db", default="tldrmusic_benchmark",
+                        help="Scratch database, dropped afterwards (default: tldrmusic_benchmark)")
+
+    args = parser.parse_args()
+    if args.db == "tldrmusic":
+        parser.error("--db must be a scratch database; it is dropped afterwards")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
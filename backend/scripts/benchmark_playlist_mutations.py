@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Benchmark Playlist Song Mutations
+
+This script:
+1. Times add, remove and reorder through api/database.py (one atomic
+   update each) against the old read-modify-write versions
+2. Counts MongoDB round-trips per mutation
+3. Runs concurrent adds and removes on one playlist and reports lost
+   updates (songs acknowledged but missing, or the 100-song cap exceeded)
+
+Everything runs in a scratch database that is dropped afterwards.
+
+Usage:
+    MONGODB_URI=mongodb://localhost:27017 python scripts/benchmark_playlist_mutations.py \\
+        [--runs 100] [--concurrency 40]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bson import ObjectId
+from pymongo import monitoring
+
+# The playlist API lives in api/ as flat modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "api"))
+
+from database import Database
+
+MAX_SONGS = 100
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    """Counts playlist reads and writes sent to MongoDB"""
+
+    COMMANDS = {"find", "update", "findAndModify"}
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name in self.COMMANDS:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def make_song(i: int, title: str = "Song"):
+    return {
+        "title": f"{title} {i}",
+        "artist": f"Artist {i}",
+        "videoId": f"vid{i}",
+        "artwork": f"https://img.example/{i}.jpg"
+    }
+
+
+def now_ms() -> int:
+    return int(datetime.utcnow().timestamp() * 1000)
+
+
+# Old implementations: read the playlist, rebuild songs in Python, write back
+
+async def legacy_add(db: Database, playlist_id: str, song):
+    playlist = await db.db.playlists.find_one({"_id": ObjectId(playlist_id)})
+    if not playlist or len(playlist.get("songs", [])) >= MAX_SONGS:
+        return None
+
+    new_song = {**song, "added_at": now_ms(), "order": len(playlist.get("songs", []))}
+    songs = playlist.get("songs", []) + [new_song]
+    await db.db.playlists.update_one(
+        {"_id": ObjectId(playlist_id)},
+        {
+            "$push": {"songs": new_song},
+            "$inc": {"song_count": 1},
+            "$set": {"cover_urls": db._regenerate_cover_urls(songs), "updated_at": now_ms()}
+        }
+    )
+    return new_song
+
+
+async def legacy_remove(db: Database, playlist_id: str, indexes):
+    playlist = await db.db.playlists.find_one({"_id": ObjectId(playlist_id)})
+    songs = [s for i, s in enumerate(playlist.get("songs", [])) if i not in indexes]
+    for i, s in enumerate(songs):
+        s["order"] = i
+    await db.db.playlists.update_one(
+        {"_id": ObjectId(playlist_id)},
+        {"$set": {
+            "songs": songs,
+            "song_count": len(songs),
+            "cover_urls": db._regenerate_cover_urls(songs),
+            "updated_at": now_ms()
+        }}
+    )
+    return True
+
+
+async def legacy_reorder(db: Database, playlist_id: str, new_order):
+    playlist = await db.db.playlists.find_one({"_id": ObjectId(playlist_id)})
+    songs = playlist.get("songs", [])
+    if len(new_order) != len(songs):
+        return False
+    reordered = [songs[i] for i in new_order]
+    for i, s in enumerate(reordered):
+        s["order"] = i
+    await db.db.playlists.update_one(
+        {"_id": ObjectId(playlist_id)},
+        {"$set": {
+            "songs": reordered,
+            "cover_urls": db._regenerate_cover_urls(reordered),
+            "updated_at": now_ms()
+        }}
+    )
+    return True
+
+
+IMPLEMENTATIONS = {
+    "atomic": (
+        lambda db, pid, song: db.add_song_to_playlist(pid, song),
+        lambda db, pid, indexes: db.remove_songs_from_playlist(pid, indexes),
+        lambda db, pid, order: db.reorder_songs_in_playlist(pid, order),
+    ),
+    "read-modify-write": (legacy_add, legacy_remove, legacy_reorder),
+}
+
+
+async def new_playlist(db: Database, num_songs: int) -> str:
+    songs = [{**make_song(i), "added_at": 0, "order": i} for i in range(num_songs)]
+    result = await db.db.playlists.insert_one({
+        "name": "Benchmark",
+        "owner_id": ObjectId(),
+        "is_public": False,
+        "songs": songs,
+        "song_count": num_songs,
+        "cover_urls": [],
+        "followers": [],
+        "follower_count": 0,
+    })
+    return str(result.inserted_id)
+
+
+async def time_op(fn, runs: int, counter: RoundTripCounter):
+    """Median and p95 latency in ms, and round-trips per call"""
+    timings = []
+    counter.count = 0
+    for i in range(runs):
+        start = time.perf_counter()
+        await fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statistics.median(timings), p95, counter.count / runs
+
+
+async def stress(db: Database, add, remove, start_songs: int, concurrency: int):
+    """
+    Fire `concurrency` adds and as many removes of the first song at once.
+    Returns (lost adds, lost removes, duplicate order values).
+    """
+    playlist_id = await new_playlist(db, start_songs)
+
+    async def do_add(i):
+        return await add(db, playlist_id, make_song(i, "Added")) is not None
+
+    async def do_remove(_):
+        return await remove(db, playlist_id, [0])
+
+    tasks = []
+    for i in range(concurrency):
+        tasks.append(do_add(i))
+        tasks.append(do_remove(i))
+    results = await asyncio.gather(*tasks)
+    added = sum(1 for ok in results[0::2] if ok)
+    removed = sum(1 for ok in results[1::2] if ok)
+
+    # Adds append new songs and removes take the first (original) song,
+    # so each side can be checked on its own
+    playlist = await db.db.playlists.find_one({"_id": ObjectId(playlist_id)})
+    songs = playlist.get("songs", [])
+    new_songs = sum(1 for s in songs if s["title"].startswith("Added"))
+    originals = len(songs) - new_songs
+    orders = [s.get("order") for s in songs]
+
+    return added - new_songs, originals - (start_songs - removed), len(orders) - len(set(orders))
+
+
+async def stress_cap(db: Database, add, concurrency: int) -> int:
+    """Fire `concurrency` adds at a playlist 10 songs below the cap; returns the final size"""
+    playlist_id = await new_playlist(db, MAX_SONGS - 10)
+    await asyncio.gather(*(add(db, playlist_id, make_song(i, "Added")) for i in range(concurrency)))
+    playlist = await db.db.playlists.find_one({"_id": ObjectId(playlist_id)})
+    return len(playlist.get("songs", []))
+
+
+async def run(args):
+    counter = RoundTripCounter()
+    monitoring.register(counter)
+
+    os.environ["MONGODB_DB"] = args.db
+    db = Database()
+    await db.connect()
+
+    try:
+        print(f"=== Sequential mutations ({args.runs} runs, ms) ===")
+        print(f"{'implementation':<20}{'op':<10}{'median':>10}{'p95':>10}{'round-trips':>14}")
+        for name, (add, remove, reorder) in IMPLEMENTATIONS.items():
+            playlist_id = await new_playlist(db, 0)
+            # Fill the playlist, reverse it repeatedly, then empty it again
+            runs = min(args.runs, MAX_SONGS)
+            cases = [
+                ("add", lambda i: add(db, playlist_id, make_song(i))),
+                ("reorder", lambda i: reorder(db, playlist_id, list(range(runs))[::-1])),
+                ("remove", lambda i: remove(db, playlist_id, [0])),
+            ]
+            for op, fn in cases:
+                median, p95, trips = await time_op(fn, runs, counter)
+                print(f"{name:<20}{op:<10}{median:>10.2f}{p95:>10.2f}{trips:>14.1f}")
+
+        print(f"\n=== Concurrent adds + removes ({args.concurrency} each, starting at "
+              f"{args.start_songs} songs) ===")
+        print(f"{'implementation':<20}{'lost adds':>11}{'lost removes':>14}{'dup order':>11}"
+              f"{'size at cap':>14}")
+        for name, (add, remove, _) in IMPLEMENTATIONS.items():
+            lost_adds, lost_removes, duplicates = await stress(
+                db, add, remove, args.start_songs, args.concurrency
+            )
+            size = await stress_cap(db, add, args.concurrency)
+            print(f"{name:<20}{lost_adds:>11}{lost_removes:>14}{duplicates:>11}"
+                  f"{size:>10}/{MAX_SONGS}")
+    finally:
+        await db.client.drop_database(args.db)
+        await db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark playlist song mutations")
+    parser.add_argument("--runs", type=int, default=100,
+                        help="Sequential runs per operation, at most 100 (default: 100)")
+    parser.add_argument("--concurrency", type=int, default=40,
+                        help="Concurrent adds and removes in the stress run (default: 40)")
+    parser.add_argument("--start-songs", type=int, default=50,
+                        help="Songs in the playlist before the stress run, "
+                             "more than --concurrency (default: 50)")
+    parser.add_argument("--db", default="tldrmusic_benchmark",
+                        help="Scratch database, dropped afterwards (default: tldrmusic_benchmark)")
+
+    args = parser.parse_args()
+    if args.start_songs <= args.concurrency:
+        parser.error("--start-songs must be larger than --concurrency")
+    if args.db == "tldrmusic":
+        parser.error("--db must be a scratch database; it is dropped afterwards")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
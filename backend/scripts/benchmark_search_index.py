@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Search Index
+
+This script:
+1. Builds a synthetic catalog of songs and artists (100k songs by default)
+2. Times building the SearchIndex from it
+3. Times common queries (exact, prefix, multi-word, typo, suggest) against
+   the index and against the linear substring scan it replaced
+
+Usage:
+    python scripts/benchmark_search_index.py [--songs 100000] [--artists 5000] [--runs 50]
+"""
+import argparse
+from itertools import islice
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# search_index only needs the standard library, so import it directly
+# rather than through the services package
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "services"))
+
+from search_index import SearchIndex
+
+WORDS = [
+    "love", "night", "dil", "ishq", "rain", "baby", "dream", "heart", "fire",
+    "moon", "saathiya", "tere", "mere", "sapne", "gold", "jaan", "dance",
+    "kannu", "yaar", "sky", "party", "tujhe", "nachle", "desi", "star",
+    "pyaar", "summer", "kahani", "vibe", "raat", "city", "lights", "ocean",
+    "chanda", "dhadkan", "safar", "zindagi", "roshni", "mitti", "badal",
+]
+LANGUAGES = ["hi", "en", "ta", "te", "pa", "bn", "mr", "kn", "ml"]
+
+
+def build_catalog(num_songs: int, num_artists: int, seed: int):
+    """Random song titles and artist names drawn from a small vocabulary"""
+    rng = random.Random(seed)
+
+    artists = {
+        f"artist_{i}": " ".join(rng.sample(WORDS, rng.randint(1, 2))).title() + f" {i}"
+        for i in range(num_artists)
+    }
+    artist_ids = list(artists)
+
+    songs = {}
+    for i in range(num_songs):
+        title = " ".join(rng.choices(WORDS, k=rng.randint(1, 4))).title()
+        songs[f"song_{i}"] = (title, artists[rng.choice(artist_ids)], rng.choice(LANGUAGES))
+
+    return songs, artists
+
+
+def linear_search(songs, query: str):
+    """The original search: substring checks over every song"""
+    query_lower = query.lower().strip()
+    query_words = query_lower.split()
+    return [
+        song_id for song_id, (title, artist_name, _) in songs.items()
+        if query_lower in title.lower()
+        or query_lower in artist_name.lower()
+        or any(word in title.lower() or word in artist_name.lower() for word in query_words)
+    ]
+
+
+def time_query(fn, runs: int):
+    """Median and p95 latency in milliseconds, plus the last result size"""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statistics.median(timings), p95, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search index")
+    parser.add_argument("--songs", type=int, default=100_000,
+                        help="Number of synthetic songs (default: 100000)")
+    parser.add_argument("--artists", type=int, default=5_000,
+                        help="Number of synthetic artists (default: 5000)")
+    parser.add_argument("--runs", type=int, default=50,
+                        help="Runs per query (default: 50)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Random seed for the catalog (default: 42)")
+    parser.add_argument("--skip-linear", action="store_true",
+                        help="Don't time the linear scan baseline")
+
+    args = parser.parse_args()
+
+    print(f"Building catalog: {args.songs} songs, {args.artists} artists...")
+    songs, artists = build_catalog(args.songs, args.artists, args.seed)
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.sync_songs(songs)
+    index.sync_artists(artists)
+    build_seconds = time.perf_counter() - start
+    print(f"Index build: {build_seconds:.2f}s "
+          f"({args.songs / build_seconds:,.0f} songs/s)")
+
+    # Re-syncing an unchanged catalog should be cheap
+    start = time.perf_counter()
+    index.sync_songs(songs)
+    index.sync_artists(artists)
+    print(f"Unchanged re-sync: {time.perf_counter() - start:.2f}s")
+
+    tokens = index.song_tokens
+    queries = [
+        ("exact word", lambda: tokens.candidates("saathiya")),
+        ("prefix", lambda: tokens.candidates("dha")),
+        ("multi-word", lambda: tokens.candidates("tere sapne")),
+        ("typo", lambda: tokens.fuzzy_candidates("zindgi")),
+        ("no match", lambda: tokens.candidates("xylophone")),
+        ("suggest titles", lambda: list(islice(index.song_titles.starts_with("love"), 5))),
+        ("artist search", lambda: index.artist_tokens.candidates("moon")),
+    ]
+    baselines = {
+        "exact word": "saathiya",
+        "prefix": "dha",
+        "multi-word": "tere sapne",
+        "no match": "xylophone",
+    }
+
+    print(f"\n=== Query Latency ({args.runs} runs, ms) ===")
+    print(f"{'query':<16}{'median':>10}{'p95':>10}{'hits':>10}{'linear':>12}")
+    for name, fn in queries:
+        median, p95, hits = time_query(fn, args.runs)
+
+        linear = ""
+        if name in baselines and not args.skip_linear:
+            linear_median, _, _ = time_query(
+                lambda: linear_search(songs, baselines[name]), max(1, args.runs // 10)
+            )
+            linear = f"{linear_median:.2f}"
+
+        print(f"{name:<16}{median:>10.3f}{p95:>10.3f}{hits:>10}{linear:>12}")
+
+
+if __name__ == "__main__":
+    main()
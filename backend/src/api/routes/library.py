@@ -20,7 +20,6 @@ from ...models import (
     LibrarySyncRequest,
     LibrarySyncResponse,
 )
-from ...config import Database
 from ...services.library import LibraryService
 from ..deps import get_current_user_required
 
@@ -55,8 +54,10 @@ async def sync_library(
     - merged_favorites, merged_history, merged_queue, merged_playlists
     - preferences
     """
-    # Get server-side data
-    library = await LibraryService.get_user_library(user.id)
+    # Get server-side data, with the playlist documents read alongside it
+    library, playlist_docs, preferences, recent_searches = (
+        await LibraryService.get_library_sync_state(user.id)
+    )
 
     # Convert to format frontend expects
     # For now, just return server data (server wins in conflict)
@@ -65,18 +66,8 @@ async def sync_library(
     # Convert playlists to frontend format with songs array
     merged_playlists = []
     for playlist in library.playlists:
-        # Get full playlist doc from DB for additional fields
-        # Try multiple ID formats (id, client_id, _id)
-        doc = await Database.playlists().find_one({"id": playlist.id})
-        if not doc:
-            doc = await Database.playlists().find_one({"client_id": playlist.id})
-        if not doc:
-            try:
-                from bson import ObjectId
-                if ObjectId.is_valid(playlist.id):
-                    doc = await Database.playlists().find_one({"_id": ObjectId(playlist.id)})
-            except:
-                pass
+        # Full playlist doc for additional fields
+        doc = playlist_docs.get(playlist.id)
 
         # Get artwork URL - custom_artwork is a boolean flag, artwork_url is the actual URL
         artwork_url = None
@@ -157,10 +148,6 @@ async def sync_library(
                 "artwork": entry.song_snapshot.artwork_url,
             })
 
-    # Get preferences and recent searches from DB
-    preferences = await LibraryService.get_preferences(user.id)
-    recent_searches = await LibraryService.get_recent_searches(user.id)
-
     return {
         "merged_favorites": merged_favorites,
         "merged_history": merged_history,
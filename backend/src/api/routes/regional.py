@@ -3,11 +3,10 @@ Regional Charts API Routes
 
 Provides V1-compatible endpoints for regional language charts.
 """
-from typing import Optional, Dict, List
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
-from ...models import Chart, ChartRegion, RegionalChart, ChartEntry
-from ...services.chart import ChartService
+from ...models import Chart, ChartRegion, RegionalChart
+from ...services.chart import ChartService, dump_json, entry_to_v1
 
 router = APIRouter(prefix="/regional", tags=["Regional"])
 
@@ -65,25 +64,29 @@ async def get_all_regional():
 
     V1 compatible endpoint.
     """
-    result = {}
-
-    for lang_code, (name, key) in LANGUAGE_MAP.items():
-        chart = await ChartService.get_current_chart(
-            region=ChartRegion.REGIONAL,
-            language=lang_code
-        )
-
-        if chart and chart.entries:
-            result[key] = {
-                "name": name,
-                "icon": LANGUAGE_ICONS.get(lang_code, "🎵"),
-                "songs": [_entry_to_v1_format(e) for e in chart.entries]
-            }
+    # One chart document load serves every language
+    views = await ChartService.get_current_views()
+    if not views:
+        raise HTTPException(status_code=404, detail="No regional data available")
 
-    if not result:
+    def _build() -> bytes:
+        result = {}
+        for lang_code, (name, key) in LANGUAGE_MAP.items():
+            chart = views.get(ChartRegion.REGIONAL, lang_code)
+
+            if chart and chart.entries:
+                result[key] = {
+                    "name": name,
+                    "icon": LANGUAGE_ICONS.get(lang_code, "🎵"),
+                    "songs": [entry_to_v1(e, compact=True) for e in chart.entries]
+                }
+        return dump_json(result) if result else b""
+
+    payload = views.cached_json("v1:regional", _build)
+    if not payload:
         raise HTTPException(status_code=404, detail="No regional data available")
 
-    return result
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/{language}")
@@ -112,10 +115,8 @@ async def get_regional_by_language(language: str):
             detail=f"Regional chart '{language}' not found. Available: {', '.join(LANGUAGE_MAP.keys())}"
         )
 
-    chart = await ChartService.get_current_chart(
-        region=ChartRegion.REGIONAL,
-        language=lang_code
-    )
+    views = await ChartService.get_current_views()
+    chart = views.get(ChartRegion.REGIONAL, lang_code) if views else None
 
     if not chart:
         raise HTTPException(
@@ -125,50 +126,10 @@ async def get_regional_by_language(language: str):
 
     name, key = LANGUAGE_MAP[lang_code]
 
-    return {
+    payload = views.cached_json(f"v1:regional:{lang_code}", lambda: dump_json({
         "name": name,
         "icon": LANGUAGE_ICONS.get(lang_code, "🎵"),
         "language": lang_code,
-        "songs": [_entry_to_v1_format(e) for e in chart.entries]
-    }
-
-
-def _entry_to_v1_format(entry: ChartEntry) -> dict:
-    """Convert ChartEntry to V1 flat format"""
-    result = {
-        "rank": entry.rank,
-        "title": entry.song_title,
-        "artist": entry.song_artist,
-        "artwork_url": entry.artwork_url,
-        "youtube_video_id": entry.youtube_video_id,
-    }
-
-    # Add movement as flat fields
-    if entry.movement:
-        result["is_new"] = entry.movement.direction.value == "new"
-        if entry.movement.direction.value == "up":
-            result["rank_change"] = entry.movement.positions
-        elif entry.movement.direction.value == "down":
-            result["rank_change"] = -entry.movement.positions
-        else:
-            result["rank_change"] = 0 if entry.movement.direction.value == "same" else None
-        result["previous_rank"] = entry.movement.previous_rank
-    else:
-        # Use V1 flat fields if available
-        result["is_new"] = entry.is_new
-        result["rank_change"] = entry.rank_change
-        result["previous_rank"] = entry.previous_rank
-
-    # Add optional fields if present
-    if entry.youtube_views:
-        result["youtube_views"] = entry.youtube_views
-    if entry.youtube_likes:
-        result["youtube_likes"] = entry.youtube_likes
-    if entry.album:
-        result["album"] = entry.album
-    if entry.genre:
-        result["genre"] = entry.genre
-    if entry.preview_url:
-        result["preview_url"] = entry.preview_url
-
-    return result
+        "songs": [entry_to_v1(e, compact=True) for e in chart.entries]
+    }))
+    return Response(content=payload, media_type="application/json")
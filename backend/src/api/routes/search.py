@@ -46,6 +46,7 @@ async def search(
 async def search_songs(
     q: str = Query(..., min_length=1),
     language: Optional[str] = None,
+    genre: Optional[str] = None,
     limit: int = Query(default=25, le=100),
 ):
     """
@@ -56,11 +57,30 @@ async def search_songs(
     songs = await SearchService.search_songs(
         query=q,
         language=language,
+        genre=genre,
         limit=limit
     )
     return songs
 
 
+@router.get("/songs/facets")
+async def get_song_facets(
+    q: str = Query(..., min_length=1),
+    language: Optional[str] = None,
+    genre: Optional[str] = None,
+):
+    """
+    Song search facets
+
+    Returns match counts by language and genre for a song search.
+    """
+    return await SearchService.get_song_facets(
+        query=q,
+        language=language,
+        genre=genre
+    )
+
+
 @router.get("/artists", response_model=List[ArtistSummary])
 async def search_artists(
     q: str = Query(..., min_length=1),
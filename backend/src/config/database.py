@@ -56,13 +56,17 @@ class Database:
 
         # Songs collection indexes (skip text index - may conflict with existing)
         await safe_create_indexes(cls.db.songs, [
+            IndexModel([("id", ASCENDING)]),
             IndexModel([("title_normalized", ASCENDING)]),
             IndexModel([("artist_ids", ASCENDING)]),
+            IndexModel([("featured_artist_ids", ASCENDING)]),
             IndexModel([("album_id", ASCENDING)]),
             IndexModel([("language", ASCENDING)]),
             IndexModel([("genres", ASCENDING)]),
             IndexModel([("created_at", DESCENDING)]),
             IndexModel([("play_count", DESCENDING)]),
+            IndexModel([("language", ASCENDING), ("play_count", DESCENDING)]),
+            IndexModel([("genres", ASCENDING), ("play_count", DESCENDING)]),
             IndexModel([
                 ("title_normalized", TEXT),
             ], name="song_text_search"),
@@ -70,6 +74,7 @@ class Database:
 
         # Artists collection indexes
         await safe_create_indexes(cls.db.artists, [
+            IndexModel([("id", ASCENDING)]),
             IndexModel([("name_normalized", ASCENDING)]),
             IndexModel([("genres", ASCENDING)]),
             IndexModel([("languages", ASCENDING)]),
@@ -95,6 +100,11 @@ class Database:
             IndexModel([("generated_at", DESCENDING)]),
         ], "charts")
 
+        # Chart summaries (one small document per week)
+        await safe_create_indexes(cls.db.chart_summaries, [
+            IndexModel([("week", ASCENDING)], unique=True),
+        ], "chart_summaries")
+
         # Users collection indexes
         await safe_create_indexes(cls.db.users, [
             IndexModel([("phone", ASCENDING)], unique=True, sparse=True),
@@ -146,6 +156,10 @@ class Database:
     def charts(cls):
         return cls.db.charts
 
+    @classmethod
+    def chart_summaries(cls):
+        return cls.db.chart_summaries
+
     @classmethod
     def users(cls):
         return cls.db.users
@@ -52,6 +52,13 @@ class Settings(BaseSettings):
     # YouTube API
     YOUTUBE_API_KEY: Optional[str] = None
 
+    # Catalog (songs/artists read from MongoDB when connected)
+    CATALOG_CACHE_SIZE: int = 10000  # Songs/artists kept per LRU cache
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+
+    # Search
+    SEARCH_BACKEND: str = "local"  # local, typesense (falls back to local if unreachable)
+
     # Typesense (search)
     TYPESENSE_HOST: str = "localhost"
     TYPESENSE_PORT: int = 8108
@@ -12,6 +12,7 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from .config import settings, Database, limiter
+from .services.search import SearchService
 from .api import (
     auth_router,
     charts_router,
@@ -46,10 +47,13 @@ async def lifespan(app: FastAPI):
     if settings.MONGODB_URL and "localhost" not in settings.MONGODB_URL:
         await Database.connect()
 
+    await SearchService.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    await SearchService.close()
     await Database.disconnect()
 
 
@@ -7,11 +7,15 @@ from pathlib import Path
 
 from ..models import Artist, ArtistSummary, SongSnapshot, AlbumSummary
 from ..config import Database
+from .catalog_repository import get_catalog_repository
 
 
 class ArtistService:
     """
     Handles artist operations
+
+    Artists are read through the catalog repository: MongoDB when
+    connected, otherwise the JSON files below.
     """
 
     # Cache for file-based data (development mode)
@@ -20,13 +24,8 @@ class ArtistService:
     @classmethod
     async def get_artist_by_id(cls, artist_id: str) -> Optional[Artist]:
         """Get artist by ID"""
-        artists = await cls._load_artists_from_files()
-
-        for artist in artists:
-            if artist.id == artist_id:
-                return artist
-
-        return None
+        artists = await get_catalog_repository().get_artists([artist_id])
+        return artists.get(artist_id)
 
     @classmethod
     async def get_artist_songs(
@@ -38,15 +37,8 @@ class ArtistService:
         """Get songs by an artist"""
         from .song import SongService
 
-        songs = await SongService._load_songs_from_files()
-        artists_map = await SongService._load_artists_map()
-
-        result = []
-        for song in songs:
-            if artist_id in song.artist_ids or artist_id in song.featured_artist_ids:
-                result.append(SongService._to_snapshot(song, artists_map))
-
-        return result[offset:offset + limit]
+        songs = await get_catalog_repository().get_artist_songs(artist_id, limit, offset)
+        return await SongService.to_snapshots(songs)
 
     @classmethod
     async def get_artist_albums(
@@ -65,36 +57,21 @@ class ArtistService:
         limit: int = 10
     ) -> List[ArtistSummary]:
         """Get related artists based on genre/language"""
-        artists = await cls._load_artists_from_files()
-
-        target = None
-        for a in artists:
-            if a.id == artist_id:
-                target = a
-                break
-
+        target = await cls.get_artist_by_id(artist_id)
         if not target:
             return []
 
-        result = []
-        for artist in artists:
-            if artist.id == artist_id:
-                continue
-
-            # Same genres or languages
-            if (set(artist.genres) & set(target.genres)) or \
-               (set(artist.languages) & set(target.languages)):
-                result.append(ArtistSummary(
-                    id=artist.id,
-                    name=artist.name,
-                    image_url=artist.images.thumbnail if artist.images else None,
-                    verified=artist.verified,
-                ))
+        related = await get_catalog_repository().get_related_artists(target, limit)
 
-            if len(result) >= limit:
-                break
-
-        return result
+        return [
+            ArtistSummary(
+                id=artist.id,
+                name=artist.name,
+                image_url=artist.images.thumbnail if artist.images else None,
+                verified=artist.verified,
+            )
+            for artist in related
+        ]
 
     @classmethod
     async def list_artists(
@@ -105,23 +82,17 @@ class ArtistService:
         offset: int = 0
     ) -> List[ArtistSummary]:
         """List artists with optional filters"""
-        artists = await cls._load_artists_from_files()
-
-        result = []
-        for artist in artists:
-            if genre and genre not in artist.genres:
-                continue
-            if language and language not in artist.languages:
-                continue
+        artists = await get_catalog_repository().list_artists(genre, language, limit, offset)
 
-            result.append(ArtistSummary(
+        return [
+            ArtistSummary(
                 id=artist.id,
                 name=artist.name,
                 image_url=artist.images.thumbnail if artist.images else None,
                 verified=artist.verified,
-            ))
-
-        return result[offset:offset + limit]
+            )
+            for artist in artists
+        ]
 
     @classmethod
     async def _load_artists_from_files(cls) -> List[Artist]:
@@ -145,5 +116,6 @@ class ArtistService:
 
     @classmethod
     def clear_cache(cls):
-        """Clear file cache"""
+        """Clear file and catalog caches"""
         cls._file_cache.clear()
+        get_catalog_repository().clear_cache()
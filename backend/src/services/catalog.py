@@ -0,0 +1,131 @@
+"""
+Catalog Store - In-memory song and artist lookups
+"""
+from typing import Dict, Iterable, Iterator, List, Optional
+from heapq import merge
+
+from ..models import Song, Artist
+
+
+class CatalogStore:
+    """
+    Songs and artists indexed by ID, plus secondary indexes.
+
+    Built once from the lists the services load into `_file_cache`; every
+    index keeps catalog order, so filtered listings match a full scan.
+    When the services reload their lists (e.g. after `clear_cache`), the
+    store is rebuilt on the next `load`.
+    """
+
+    _current: Optional["CatalogStore"] = None
+
+    def __init__(self, songs: List[Song], artists: List[Artist]):
+        self.songs = songs
+        self.artists = artists
+
+        self.song_positions: Dict[str, int] = {}
+        self.songs_by_id: Dict[str, Song] = {}
+        self.songs_by_artist: Dict[str, List[Song]] = {}  # Primary and featured
+        self.songs_by_primary_artist: Dict[str, List[Song]] = {}
+        self.songs_by_language: Dict[str, List[Song]] = {}
+        self.songs_by_genre: Dict[str, List[Song]] = {}
+
+        for position, song in enumerate(songs):
+            # First occurrence wins, like a linear scan
+            if song.id in self.songs_by_id:
+                continue
+            self.song_positions[song.id] = position
+            self.songs_by_id[song.id] = song
+
+            for artist_id in dict.fromkeys(song.artist_ids + song.featured_artist_ids):
+                self.songs_by_artist.setdefault(artist_id, []).append(song)
+            for artist_id in dict.fromkeys(song.artist_ids):
+                self.songs_by_primary_artist.setdefault(artist_id, []).append(song)
+            if song.language:
+                self.songs_by_language.setdefault(song.language, []).append(song)
+            for genre in dict.fromkeys(song.genres):
+                self.songs_by_genre.setdefault(genre, []).append(song)
+
+        self.artist_positions: Dict[str, int] = {}
+        self.artists_by_id: Dict[str, Artist] = {}
+        self.artists_by_genre: Dict[str, List[Artist]] = {}
+        self.artists_by_language: Dict[str, List[Artist]] = {}
+
+        for position, artist in enumerate(artists):
+            if artist.id in self.artists_by_id:
+                continue
+            self.artist_positions[artist.id] = position
+            self.artists_by_id[artist.id] = artist
+
+            for genre in dict.fromkeys(artist.genres):
+                self.artists_by_genre.setdefault(genre, []).append(artist)
+            for language in dict.fromkeys(artist.languages):
+                self.artists_by_language.setdefault(language, []).append(artist)
+
+    @classmethod
+    async def load(cls) -> "CatalogStore":
+        """Store for the currently loaded catalog, rebuilt if it was reloaded"""
+        from .song import SongService
+        from .artist import ArtistService
+
+        songs = await SongService._load_songs_from_files()
+        artists = await ArtistService._load_artists_from_files()
+
+        store = cls._current
+        if store is None or store.songs is not songs or store.artists is not artists:
+            store = cls._current = cls(songs, artists)
+
+        return store
+
+    def filter_songs(
+        self,
+        language: Optional[str] = None,
+        genre: Optional[str] = None
+    ) -> Iterator[Song]:
+        """Songs matching both filters, starting from the narrower index"""
+        if language and genre:
+            by_language = self.songs_by_language.get(language, [])
+            by_genre = self.songs_by_genre.get(genre, [])
+            if len(by_genre) < len(by_language):
+                return (s for s in by_genre if s.language == language)
+            return (s for s in by_language if genre in s.genres)
+        if language:
+            return iter(self.songs_by_language.get(language, []))
+        if genre:
+            return iter(self.songs_by_genre.get(genre, []))
+        return iter(self.songs_by_id.values())
+
+    def filter_artists(
+        self,
+        genre: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> Iterator[Artist]:
+        """Artists matching both filters, starting from the narrower index"""
+        if genre and language:
+            by_genre = self.artists_by_genre.get(genre, [])
+            by_language = self.artists_by_language.get(language, [])
+            if len(by_language) < len(by_genre):
+                return (a for a in by_language if genre in a.genres)
+            return (a for a in by_genre if language in a.languages)
+        if genre:
+            return iter(self.artists_by_genre.get(genre, []))
+        if language:
+            return iter(self.artists_by_language.get(language, []))
+        return iter(self.artists_by_id.values())
+
+    def union_songs(self, groups: Iterable[List[Song]]) -> Iterator[Song]:
+        """Songs from several index lists, de-duplicated, in catalog order"""
+        return _dedupe(merge(*groups, key=lambda s: self.song_positions[s.id]))
+
+    def union_artists(self, groups: Iterable[List[Artist]]) -> Iterator[Artist]:
+        """Artists from several index lists, de-duplicated, in catalog order"""
+        return _dedupe(merge(*groups, key=lambda a: self.artist_positions[a.id]))
+
+
+def _dedupe(items: Iterable) -> Iterator:
+    """Skip repeats of an item (by ID) in a sorted stream"""
+    last_id = None
+    for item in items:
+        if item.id != last_id:
+            last_id = item.id
+            yield item
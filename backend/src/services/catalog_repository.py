@@ -0,0 +1,363 @@
+"""
+Catalog Repository - Where songs and artists are read from
+
+MongoCatalogRepository serves the real catalog from the `songs` and
+`artists` collections; FileCatalogRepository is the local stand-in over
+the `data/v2/*.json` files loaded by SongService/ArtistService.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import time
+
+from ..models import Song, Artist
+from ..config import Database, settings
+from .catalog import CatalogStore
+
+logger = logging.getLogger(__name__)
+
+# Fields needed to list songs and render snapshots (no lyrics, stats, etc.)
+SONG_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "title": 1, "title_normalized": 1, "artist_ids": 1,
+    "featured_artist_ids": 1, "language": 1, "genres": 1, "sources": 1,
+    "artwork": 1, "duration_ms": 1, "play_count": 1,
+}
+
+# Fields needed to list artists and render summaries
+ARTIST_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "name_normalized": 1, "images": 1,
+    "verified": 1, "genres": 1, "languages": 1, "monthly_listeners": 1,
+}
+
+
+class TTLCache:
+    """
+    LRU cache whose entries expire `ttl` seconds after being stored.
+    Misses can be cached too (as None), usually with a shorter `ttl`, so
+    unknown IDs aren't re-queried on every request.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """(hit, value) for a key"""
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+        if time.monotonic() > item[0]:
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, item[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+class CatalogRepository(ABC):
+    """Read access to songs and artists"""
+
+    @abstractmethod
+    async def get_songs(self, song_ids: Iterable[str]) -> Dict[str, Song]:
+        """Songs by ID (unknown IDs are left out), in request order"""
+
+    @abstractmethod
+    async def get_artists(self, artist_ids: Iterable[str]) -> Dict[str, Artist]:
+        """Artists by ID (unknown IDs are left out), in request order"""
+
+    @abstractmethod
+    async def get_artist_songs(self, artist_id: str, limit: int, offset: int) -> List[Song]:
+        """Songs crediting an artist (primary or featured)"""
+
+    @abstractmethod
+    async def get_related_songs(self, song: Song, limit: int) -> List[Song]:
+        """Songs sharing an artist or the language of `song`"""
+
+    @abstractmethod
+    async def list_songs(
+        self,
+        language: Optional[str],
+        genre: Optional[str],
+        limit: int,
+        offset: int
+    ) -> List[Song]:
+        """Songs with optional filters"""
+
+    @abstractmethod
+    async def get_related_artists(self, artist: Artist, limit: int) -> List[Artist]:
+        """Artists sharing a genre or language with `artist`"""
+
+    @abstractmethod
+    async def list_artists(
+        self,
+        genre: Optional[str],
+        language: Optional[str],
+        limit: int,
+        offset: int
+    ) -> List[Artist]:
+        """Artists with optional filters"""
+
+    async def get_artist_names(self, artist_ids: Iterable[str]) -> Dict[str, str]:
+        """Artist names by ID"""
+        artists = await self.get_artists(artist_ids)
+        return {artist_id: artist.name for artist_id, artist in artists.items()}
+
+    def clear_cache(self):
+        """Drop cached data"""
+
+
+class FileCatalogRepository(CatalogRepository):
+    """Local stand-in backed by the JSON files, indexed by CatalogStore"""
+
+    async def get_songs(self, song_ids: Iterable[str]) -> Dict[str, Song]:
+        store = await CatalogStore.load()
+        return {i: store.songs_by_id[i] for i in song_ids if i in store.songs_by_id}
+
+    async def get_artists(self, artist_ids: Iterable[str]) -> Dict[str, Artist]:
+        store = await CatalogStore.load()
+        return {i: store.artists_by_id[i] for i in artist_ids if i in store.artists_by_id}
+
+    async def get_artist_names(self, artist_ids: Iterable[str]) -> Dict[str, str]:
+        from .song import SongService
+
+        # Same source the snapshots have always used
+        artists_map = await SongService._load_artists_map()
+        return {
+            i: artists_map[i].get("name", "Unknown Artist")
+            for i in artist_ids if i in artists_map
+        }
+
+    async def get_artist_songs(self, artist_id: str, limit: int, offset: int) -> List[Song]:
+        store = await CatalogStore.load()
+        return store.songs_by_artist.get(artist_id, [])[offset:offset + limit]
+
+    async def get_related_songs(self, song: Song, limit: int) -> List[Song]:
+        store = await CatalogStore.load()
+
+        # Same artist or same language, in catalog order
+        groups = [store.songs_by_primary_artist.get(a, []) for a in dict.fromkeys(song.artist_ids)]
+        if song.language:
+            groups.append(store.songs_by_language.get(song.language, []))
+
+        related = (s for s in store.union_songs(groups) if s.id != song.id)
+        return list(islice(related, limit))
+
+    async def list_songs(
+        self,
+        language: Optional[str],
+        genre: Optional[str],
+        limit: int,
+        offset: int
+    ) -> List[Song]:
+        store = await CatalogStore.load()
+        return list(islice(store.filter_songs(language, genre), offset, offset + limit))
+
+    async def get_related_artists(self, artist: Artist, limit: int) -> List[Artist]:
+        store = await CatalogStore.load()
+
+        # Same genres or languages, in catalog order
+        groups = [store.artists_by_genre.get(g, []) for g in dict.fromkeys(artist.genres)]
+        groups += [store.artists_by_language.get(l, []) for l in dict.fromkeys(artist.languages)]
+
+        related = (a for a in store.union_artists(groups) if a.id != artist.id)
+        return list(islice(related, limit))
+
+    async def list_artists(
+        self,
+        genre: Optional[str],
+        language: Optional[str],
+        limit: int,
+        offset: int
+    ) -> List[Artist]:
+        store = await CatalogStore.load()
+        return list(islice(store.filter_artists(genre, language), offset, offset + limit))
+
+    def clear_cache(self):
+        CatalogStore._current = None
+
+
+class MongoCatalogRepository(CatalogRepository):
+    """
+    Reads songs and artists from MongoDB.
+
+    By-ID reads go through an LRU cache with a TTL; misses are cached
+    only for MISS_TTL so newly ingested songs show up quickly. Uncached IDs are fetched together with one `$in` query per batch.
+    Listings use indexed filters, sort by popularity and project only
+    the fields needed for snapshots and summaries.
+    """
+
+    # IDs per `$in` query
+    BATCH_SIZE = 500
+
+    # Seconds an unknown ID is remembered as missing
+    MISS_TTL = 5
+
+    def __init__(self, cache_size: int, cache_ttl: float):
+        self._songs = TTLCache(cache_size, cache_ttl)
+        self._artists = TTLCache(cache_size, cache_ttl)
+
+    async def get_songs(self, song_ids: Iterable[str]) -> Dict[str, Song]:
+        return await self._get_many(
+            Database.songs(), self._songs, song_ids, Song
+        )
+
+    async def get_artists(self, artist_ids: Iterable[str]) -> Dict[str, Artist]:
+        return await self._get_many(
+            Database.artists(), self._artists, artist_ids, Artist
+        )
+
+    async def _get_many(self, collection, cache: TTLCache, ids: Iterable[str], model) -> Dict[str, Any]:
+        """Read-through lookup: cache first, then batched `$in` for the rest"""
+        ids = list(dict.fromkeys(ids))
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+
+        for item_id in ids:
+            hit, value = cache.lookup(item_id)
+            if not hit:
+                missing.append(item_id)
+            elif value is not None:
+                found[item_id] = value
+
+        for start in range(0, len(missing), self.BATCH_SIZE):
+            batch = missing[start:start + self.BATCH_SIZE]
+            loaded = {}
+            async for doc in collection.find({"id": {"$in": batch}}, {"_id": 0}):
+                item = _parse(model, doc)
+                if item is not None:
+                    loaded[item.id] = item
+
+            for item_id in batch:
+                if item_id in loaded:
+                    cache.set(item_id, loaded[item_id])
+                else:
+                    cache.set(item_id, None, ttl=self.MISS_TTL)
+            found.update(loaded)
+
+        return {item_id: found[item_id] for item_id in ids if item_id in found}
+
+    async def _find_songs(self, query: dict, limit: int, offset: int = 0) -> List[Song]:
+        cursor = Database.songs().find(query, SONG_LIST_PROJECTION).sort("play_count", -1)
+        cursor = cursor.skip(offset).limit(limit)
+        songs = [_parse(Song, doc) async for doc in cursor]
+        return [song for song in songs if song is not None]
+
+    async def _find_artists(self, query: dict, limit: int, offset: int = 0) -> List[Artist]:
+        cursor = Database.artists().find(query, ARTIST_LIST_PROJECTION).sort("monthly_listeners", -1)
+        cursor = cursor.skip(offset).limit(limit)
+        artists = [_parse(Artist, doc) async for doc in cursor]
+        return [artist for artist in artists if artist is not None]
+
+    async def get_artist_songs(self, artist_id: str, limit: int, offset: int) -> List[Song]:
+        return await self._find_songs(
+            {"$or": [{"artist_ids": artist_id}, {"featured_artist_ids": artist_id}]},
+            limit,
+            offset
+        )
+
+    async def get_related_songs(self, song: Song, limit: int) -> List[Song]:
+        # Same artist first, then fill up with the same language
+        related = []
+        if song.artist_ids:
+            related = await self._find_songs(
+                {"artist_ids": {"$in": song.artist_ids}, "id": {"$ne": song.id}},
+                limit
+            )
+
+        if len(related) < limit and song.language:
+            exclude = [song.id] + [s.id for s in related]
+            related += await self._find_songs(
+                {"language": song.language, "id": {"$nin": exclude}},
+                limit - len(related)
+            )
+
+        return related
+
+    async def list_songs(
+        self,
+        language: Optional[str],
+        genre: Optional[str],
+        limit: int,
+        offset: int
+    ) -> List[Song]:
+        query = {}
+        if language:
+            query["language"] = language
+        if genre:
+            query["genres"] = genre
+        return await self._find_songs(query, limit, offset)
+
+    async def get_related_artists(self, artist: Artist, limit: int) -> List[Artist]:
+        conditions = []
+        if artist.genres:
+            conditions.append({"genres": {"$in": artist.genres}})
+        if artist.languages:
+            conditions.append({"languages": {"$in": artist.languages}})
+        if not conditions:
+            return []
+
+        return await self._find_artists(
+            {"$or": conditions, "id": {"$ne": artist.id}},
+            limit
+        )
+
+    async def list_artists(
+        self,
+        genre: Optional[str],
+        language: Optional[str],
+        limit: int,
+        offset: int
+    ) -> List[Artist]:
+        query = {}
+        if genre:
+            query["genres"] = genre
+        if language:
+            query["languages"] = language
+        return await self._find_artists(query, limit, offset)
+
+    def clear_cache(self):
+        self._songs.clear()
+        self._artists.clear()
+
+
+def _parse(model, doc: dict):
+    """Build a model from a document, skipping malformed ones"""
+    try:
+        return model(**doc)
+    except Exception as e:
+        logger.warning(f"Skipping invalid {model.__name__} {doc.get('id')}: {e}")
+        return None
+
+
+_file_repository = FileCatalogRepository()
+_mongo_repository: Optional[MongoCatalogRepository] = None
+
+
+def get_catalog_repository() -> CatalogRepository:
+    """MongoDB when connected, otherwise the JSON files"""
+    global _mongo_repository
+
+    if Database.db is None:
+        return _file_repository
+
+    if _mongo_repository is None:
+        _mongo_repository = MongoCatalogRepository(
+            cache_size=settings.CATALOG_CACHE_SIZE,
+            cache_ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+        )
+    return _mongo_repository
@@ -1,10 +1,13 @@
 """
 Chart Service - Business logic for charts
 """
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
 import json
+import time
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 import logging
 
 from ..models import Chart, ChartSummary, ChartRegion, ChartEntry, ChartMovement, MovementDirection
@@ -13,6 +16,193 @@ from .rank_history import rank_history
 
 logger = logging.getLogger(__name__)
 
+# Regional language codes -> keys in the chart document's "regional" map
+REGIONAL_LANGUAGES = {
+    "hi": "hindi",
+    "ta": "tamil",
+    "te": "telugu",
+    "pa": "punjabi",
+    "bh": "bhojpuri",
+    "hr": "haryanvi",
+    "bn": "bengali",
+    "mr": "marathi",
+    "kn": "kannada",
+    "ml": "malayalam",
+    "gu": "gujarati",
+}
+_REGIONAL_CODES = {key: code for code, key in REGIONAL_LANGUAGES.items()}
+
+
+
+def _songs_summary_expr(songs: str) -> dict:
+    """Aggregation expression summarizing a chart's song array"""
+    return {
+        "total_entries": {"$size": {"$ifNull": [songs, []]}},
+        "top_song_title": {"$arrayElemAt": [f"{songs}.title", 0]},
+        "top_song_artist": {"$arrayElemAt": [f"{songs}.artist", 0]},
+    }
+
+
+# Projection turning a chart document into its `chart_summaries` entry
+# (same shape as written by the chart upload API)
+CHART_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "week": 1,
+    "generated_at": 1,
+    "india": _songs_summary_expr("$chart"),
+    "global": _songs_summary_expr("$global_chart"),
+    "regional": {"$map": {
+        "input": {"$objectToArray": {"$ifNull": ["$regional", {}]}},
+        "as": "r",
+        "in": {
+            "key": "$$r.k",
+            "name": "$$r.v.name",
+            **_songs_summary_expr("$$r.v.songs"),
+        },
+    }},
+}
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize like FastAPI's JSONResponse, for pre-rendered payloads"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def entry_to_v1(entry: ChartEntry, compact: bool = False) -> Dict[str, Any]:
+    """
+    Convert ChartEntry to V1 flat song format
+
+    `compact` is the lighter regional format: no scoring, engagement
+    beyond views/likes, extended metadata or lyrics.
+    """
+    result = {
+        "rank": entry.rank,
+        "title": entry.song_title,
+        "artist": entry.song_artist,
+    }
+    if not compact:
+        result["score"] = entry.score
+        result["platforms_count"] = entry.platforms_count
+    result["artwork_url"] = entry.artwork_url
+    result["youtube_video_id"] = entry.youtube_video_id
+
+    # Add movement as flat fields (V1 format)
+    if entry.movement:
+        result["is_new"] = entry.movement.direction.value == "new"
+        if entry.movement.direction.value == "up":
+            result["rank_change"] = entry.movement.positions
+        elif entry.movement.direction.value == "down":
+            result["rank_change"] = -entry.movement.positions
+        else:
+            result["rank_change"] = 0 if entry.movement.direction.value == "same" else None
+        result["previous_rank"] = entry.movement.previous_rank
+    else:
+        # Use V1 flat fields directly if available
+        result["is_new"] = entry.is_new
+        result["rank_change"] = entry.rank_change
+        result["previous_rank"] = entry.previous_rank
+
+    # Add engagement stats
+    if entry.youtube_views:
+        result["youtube_views"] = entry.youtube_views
+    if entry.youtube_likes:
+        result["youtube_likes"] = entry.youtube_likes
+
+    if compact:
+        if entry.album:
+            result["album"] = entry.album
+        if entry.genre:
+            result["genre"] = entry.genre
+        if entry.preview_url:
+            result["preview_url"] = entry.preview_url
+        return result
+
+    if entry.spotify_streams:
+        result["spotify_streams"] = entry.spotify_streams
+
+    # Add V1 song metadata
+    if entry.album:
+        result["album"] = entry.album
+    if entry.genre:
+        result["genre"] = entry.genre
+    if entry.duration_ms:
+        result["duration_ms"] = entry.duration_ms
+    if entry.youtube_duration:
+        result["youtube_duration"] = entry.youtube_duration
+    if entry.youtube_published:
+        result["youtube_published"] = entry.youtube_published
+    if entry.release_date:
+        result["release_date"] = entry.release_date
+    if entry.preview_url:
+        result["preview_url"] = entry.preview_url
+    if entry.itunes_url:
+        result["itunes_url"] = entry.itunes_url
+    if entry.apple_music_url:
+        result["apple_music_url"] = entry.apple_music_url
+    if entry.lyrics_plain:
+        result["lyrics_plain"] = entry.lyrics_plain
+    if entry.lyrics_synced:
+        result["lyrics_synced"] = entry.lyrics_synced
+
+    return result
+
+
+def chart_to_v1(chart: Chart) -> Dict[str, Any]:
+    """Convert Chart to V1 response format"""
+    return {
+        "generated_at": chart.generated_at.isoformat() if chart.generated_at else None,
+        "week": chart.week,
+        "total_songs": len(chart.entries),
+        "chart": [entry_to_v1(entry) for entry in chart.entries],
+    }
+
+
+class ChartViews:
+    """
+    Every chart for one week - India, global and all regional charts -
+    built together from a single chart document.
+
+    Views are immutable once built, so serialized responses derived from
+    them are memoized alongside (see `cached_json`).
+    """
+
+    def __init__(
+        self,
+        week: str,
+        india: Optional[Chart] = None,
+        global_chart: Optional[Chart] = None,
+        regional: Optional[Dict[str, Chart]] = None
+    ):
+        self.week = week
+        self.india = india
+        self.global_chart = global_chart
+        self.regional = regional or {}  # Language code -> Chart
+        self._json: Dict[str, bytes] = {}
+
+    def cached_json(self, key: str, build: Callable[[], bytes]) -> bytes:
+        """Serialized payload for `key`, built on first use"""
+        payload = self._json.get(key)
+        if payload is None:
+            payload = build()
+            self._json[key] = payload
+        return payload
+
+    def get(self, region: ChartRegion, language: Optional[str] = None) -> Optional[Chart]:
+        """Get the chart for a region (and language, for regional charts)"""
+        if region == ChartRegion.INDIA:
+            return self.india
+        if region == ChartRegion.GLOBAL:
+            return self.global_chart
+        if region == ChartRegion.REGIONAL and language:
+            return self.regional.get(_REGIONAL_CODES.get(language, language))
+        return None
+
 
 class ChartService:
     """
@@ -22,6 +212,22 @@ class ChartService:
     # Cache for file-based charts (development mode)
     _file_cache: dict = {}
 
+    # Current-week views keyed by with_rank_changes: (signature, ChartViews)
+    _views_cache: dict = {}
+    _views_checked_at: dict = {}
+    _views_lock = asyncio.Lock()
+
+    # How long the latest week is trusted before MongoDB is checked again (seconds)
+    CURRENT_CHECK_INTERVAL = 30
+
+    # How often chart summaries are checked for missing weeks (seconds)
+    SUMMARY_SYNC_INTERVAL = 300
+    _summaries_synced_at: float = float("-inf")
+
+    # Recently requested historical weeks (archived charts never change)
+    WEEK_CACHE_SIZE = 16
+    _week_cache: "OrderedDict[str, ChartViews]" = OrderedDict()
+
     @classmethod
     async def get_current_chart(
         cls,
@@ -34,144 +240,215 @@ class ChartService:
 
         Queries MongoDB for production, falls back to files for development.
         """
-        # Try MongoDB first
-        chart = await cls._load_chart_from_mongodb(region, language)
-        if chart:
-            if with_rank_changes:
-                return cls._enrich_with_rank_changes(chart)
-            return chart
-
-        # Fallback to files for development
-        charts = await cls._load_charts_from_files()
+        views = await cls.get_current_views(with_rank_changes)
+        return views.get(region, language) if views else None
 
-        for chart in charts:
-            if chart.region == region:
-                if region == ChartRegion.REGIONAL:
-                    if chart.language == language:
-                        if with_rank_changes:
-                            return cls._enrich_with_rank_changes(chart)
-                        return chart
-                else:
-                    if with_rank_changes:
-                        return cls._enrich_with_rank_changes(chart)
-                    return chart
+    @classmethod
+    async def get_current_views(cls, with_rank_changes: bool = True) -> Optional[ChartViews]:
+        """
+        Get all current charts, loading the latest chart document once.
 
-        return None
+        Views are cached per week; MongoDB is only probed for a newer week
+        every CURRENT_CHECK_INTERVAL seconds, and rank changes are rebuilt
+        when rank history changes.
+        """
+        local_signature = (rank_history.version, date.today()) if with_rank_changes else None
+
+        cached = cls._views_cache.get(with_rank_changes)
+        checked_at = cls._views_checked_at.get(with_rank_changes, 0)
+        if (
+            cached
+            and cached[0][1:] == (local_signature,)
+            and time.monotonic() - checked_at < cls.CURRENT_CHECK_INTERVAL
+        ):
+            return cached[1]
+
+        async with cls._views_lock:
+            views = await cls._load_views_from_mongodb(with_rank_changes, local_signature)
+            if views is None:
+                views = await cls._load_views_from_files(with_rank_changes, local_signature)
+            cls._views_checked_at[with_rank_changes] = time.monotonic()
+            return views
 
     @classmethod
-    async def _load_chart_from_mongodb(
+    async def _load_views_from_mongodb(
         cls,
-        region: ChartRegion,
-        language: Optional[str] = None
-    ) -> Optional[Chart]:
-        """Load chart from MongoDB"""
+        with_rank_changes: bool,
+        local_signature
+    ) -> Optional[ChartViews]:
+        """Load the latest chart document (only when its week changed) and build views"""
         if Database.db is None:
             return None
 
         try:
-            # Get the most recent chart document
-            chart_doc = await Database.charts().find_one(
+            # Cheap probe for the latest week
+            head = await Database.charts().find_one(
                 {},
+                {"week": 1, "generated_at": 1},
                 sort=[("week", -1)]
             )
+            if not head:
+                return None
+
+            signature = (("mongo", head.get("week"), str(head.get("generated_at"))), local_signature)
+            cached = cls._views_cache.get(with_rank_changes)
+            if cached and cached[0] == signature:
+                return cached[1]
 
+            chart_doc = await Database.charts().find_one({"_id": head["_id"]})
             if not chart_doc:
                 return None
 
-            week = chart_doc.get("week", "")
-            generated_at = chart_doc.get("generated_at")
-            if isinstance(generated_at, str):
-                try:
-                    generated_at = datetime.fromisoformat(generated_at.replace("Z", "+00:00"))
-                except:
-                    generated_at = datetime.utcnow()
-            elif generated_at is None:
-                generated_at = datetime.utcnow()
-
-            if region == ChartRegion.INDIA:
-                # Main India chart
-                chart_songs = chart_doc.get("chart", [])
-                entries = cls._convert_songs_to_entries(chart_songs)
-
-                return Chart(
-                    id=f"india-{week}",
-                    name="India Top 25",
-                    description="India's definitive music chart, aggregated from 9 major platforms",
-                    region=ChartRegion.INDIA,
-                    language=None,
-                    week=week,
-                    generated_at=generated_at,
-                    entries=entries,
-                    total_songs=len(entries),
-                )
+            views = cls._build_views(chart_doc, with_rank_changes)
+            cls._views_cache[with_rank_changes] = (signature, views)
 
-            elif region == ChartRegion.GLOBAL:
-                # Global chart
-                global_songs = chart_doc.get("global_chart", [])
-                entries = cls._convert_songs_to_entries(global_songs)
-
-                return Chart(
-                    id=f"global-{week}",
-                    name="Global Top 25",
-                    description="Global music chart aggregated from Spotify, Billboard, and Apple Music",
-                    region=ChartRegion.GLOBAL,
-                    language=None,
-                    week=week,
-                    generated_at=generated_at,
-                    entries=entries,
-                    total_songs=len(entries),
-                )
+            # Make songs from a newly uploaded chart searchable
+            from .search import SearchService
+            SearchService.index_chart_in_background(signature[0], views)
 
-            elif region == ChartRegion.REGIONAL and language:
-                # Regional chart
-                regional_data = chart_doc.get("regional", {})
-
-                # Map language codes to keys
-                lang_key_map = {
-                    "hi": "hindi",
-                    "ta": "tamil",
-                    "te": "telugu",
-                    "pa": "punjabi",
-                    "bh": "bhojpuri",
-                    "hr": "haryanvi",
-                    "bn": "bengali",
-                    "mr": "marathi",
-                    "kn": "kannada",
-                    "ml": "malayalam",
-                    "gu": "gujarati",
-                }
-                lang_key = lang_key_map.get(language, language)
-
-                region_chart = regional_data.get(lang_key, {})
-                if not region_chart:
-                    return None
-
-                regional_songs = region_chart.get("songs", [])
-                entries = cls._convert_songs_to_entries(regional_songs)
-
-                region_name = region_chart.get("name", lang_key.title())
-
-                return Chart(
-                    id=f"regional-{lang_key}-{week}",
-                    name=f"{region_name} Top 10",
-                    description=f"Top {region_name} songs this week",
-                    region=ChartRegion.REGIONAL,
-                    language=language,
-                    week=week,
-                    generated_at=generated_at,
-                    entries=entries,
-                    total_songs=len(entries),
-                )
+            return views
 
         except Exception as e:
             logger.error(f"Error loading chart from MongoDB: {e}")
             return None
 
-        return None
+    @classmethod
+    async def _load_views_from_files(
+        cls,
+        with_rank_changes: bool,
+        local_signature
+    ) -> Optional[ChartViews]:
+        """Build views from the development chart files"""
+        charts = await cls._load_charts_from_files()
+        if not charts:
+            return None
+
+        signature = (("files",), local_signature)
+        cached = cls._views_cache.get(with_rank_changes)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        views = ChartViews(week=charts[0].week)
+        for chart in charts:
+            if chart.region == ChartRegion.INDIA and views.india is None:
+                views.india = chart
+            elif chart.region == ChartRegion.GLOBAL and views.global_chart is None:
+                views.global_chart = chart
+            elif chart.region == ChartRegion.REGIONAL and chart.language:
+                views.regional.setdefault(chart.language, chart)
+
+        if with_rank_changes:
+            views = cls._enrich_views(views)
+
+        cls._views_cache[with_rank_changes] = (signature, views)
+        return views
+
+    @classmethod
+    def _build_views(cls, chart_doc: dict, with_rank_changes: bool = True) -> ChartViews:
+        """
+        Build India, global and regional charts from one chart document.
+
+        Rank-history movement is applied while converting entries, so each
+        entry is materialized exactly once.
+        """
+        week = chart_doc.get("week", "")
+        generated_at = cls._parse_generated_at(chart_doc.get("generated_at"))
+        views = ChartViews(week=week)
+
+        # Main India chart
+        chart_songs = chart_doc.get("chart", [])
+        entries = cls._convert_songs_to_entries(chart_songs, "india" if with_rank_changes else None)
+        views.india = Chart(
+            id=f"india-{week}",
+            name="India Top 25",
+            description="India's definitive music chart, aggregated from 9 major platforms",
+            region=ChartRegion.INDIA,
+            language=None,
+            week=week,
+            generated_at=generated_at,
+            entries=entries,
+            total_songs=len(entries),
+        )
+
+        # Global chart
+        global_songs = chart_doc.get("global_chart", [])
+        entries = cls._convert_songs_to_entries(global_songs, "global" if with_rank_changes else None)
+        views.global_chart = Chart(
+            id=f"global-{week}",
+            name="Global Top 25",
+            description="Global music chart aggregated from Spotify, Billboard, and Apple Music",
+            region=ChartRegion.GLOBAL,
+            language=None,
+            week=week,
+            generated_at=generated_at,
+            entries=entries,
+            total_songs=len(entries),
+        )
+
+        # Regional charts
+        for lang_key, region_chart in (chart_doc.get("regional") or {}).items():
+            if not region_chart:
+                continue
+
+            language = _REGIONAL_CODES.get(lang_key, lang_key)
+            regional_songs = region_chart.get("songs", [])
+            entries = cls._convert_songs_to_entries(
+                regional_songs,
+                f"regional_{language}" if with_rank_changes else None
+            )
+            region_name = region_chart.get("name", lang_key.title())
+
+            views.regional[language] = Chart(
+                id=f"regional-{lang_key}-{week}",
+                name=f"{region_name} Top 10",
+                description=f"Top {region_name} songs this week",
+                region=ChartRegion.REGIONAL,
+                language=language,
+                week=week,
+                generated_at=generated_at,
+                entries=entries,
+                total_songs=len(entries),
+            )
+
+        return views
+
+    @classmethod
+    def _enrich_views(cls, views: ChartViews) -> ChartViews:
+        """Apply rank-history movement to every chart in a set of views"""
+        return ChartViews(
+            week=views.week,
+            india=cls._enrich_with_rank_changes(views.india) if views.india else None,
+            global_chart=cls._enrich_with_rank_changes(views.global_chart) if views.global_chart else None,
+            regional={
+                language: cls._enrich_with_rank_changes(chart)
+                for language, chart in views.regional.items()
+            }
+        )
+
+    @staticmethod
+    def _parse_generated_at(generated_at) -> datetime:
+        """Normalize a chart document's generated_at to a datetime"""
+        if isinstance(generated_at, str):
+            try:
+                return datetime.fromisoformat(generated_at.replace("Z", "+00:00"))
+            except:
+                return datetime.utcnow()
+        if generated_at is None:
+            return datetime.utcnow()
+        return generated_at
 
     @classmethod
-    def _convert_songs_to_entries(cls, songs: list) -> List[ChartEntry]:
-        """Convert MongoDB song documents to ChartEntry objects"""
+    def _convert_songs_to_entries(
+        cls,
+        songs: list,
+        chart_type: Optional[str] = None
+    ) -> List[ChartEntry]:
+        """
+        Convert MongoDB song documents to ChartEntry objects
+
+        With `chart_type`, movement comes from rank history (as in
+        `_enrich_with_rank_changes`); otherwise from the stored fields.
+        """
         entries = []
         for song in songs:
             try:
@@ -180,7 +457,24 @@ class ChartService:
                 rank_change = song.get("rank_change", 0)
                 previous_rank = song.get("previous_rank")
 
-                if is_new:
+                if chart_type:
+                    change_info = rank_history.calculate_rank_change(
+                        chart_type=chart_type,
+                        title=song.get("title", ""),
+                        artist=song.get("artist", ""),
+                        current_rank=song.get("rank", 0)
+                    )
+                    direction = MovementDirection(change_info["direction"])
+                    positions = change_info["positions"]
+                    previous_rank = change_info["previous_rank"]
+                    is_new = direction == MovementDirection.NEW
+                    if direction == MovementDirection.UP:
+                        rank_change = positions
+                    elif direction == MovementDirection.DOWN:
+                        rank_change = -positions
+                    else:
+                        rank_change = 0 if direction == MovementDirection.SAME else None
+                elif is_new:
                     direction = MovementDirection.NEW
                     positions = 0
                 elif rank_change and rank_change > 0:
@@ -327,6 +621,14 @@ class ChartService:
     @classmethod
     async def get_chart_by_id(cls, chart_id: str) -> Optional[Chart]:
         """Get chart by ID"""
+        parsed = cls._parse_chart_id(chart_id)
+        if parsed:
+            region, language, week = parsed
+            views = await cls.get_views_for_week(week)
+            chart = views.get(region, language) if views else None
+            if chart:
+                return chart
+
         charts = await cls._load_charts_from_files()
 
         for chart in charts:
@@ -335,6 +637,56 @@ class ChartService:
 
         return None
 
+    @staticmethod
+    def _parse_chart_id(chart_id: str) -> Optional[Tuple[ChartRegion, Optional[str], str]]:
+        """
+        Split a chart ID into (region, language key, week).
+        IDs look like india-2025-W50, global-2025-W50, regional-tamil-2025-W50.
+        """
+        parts = chart_id.split("-")
+        if parts[0] in (ChartRegion.INDIA.value, ChartRegion.GLOBAL.value) and len(parts) >= 2:
+            return ChartRegion(parts[0]), None, "-".join(parts[1:])
+        if parts[0] == ChartRegion.REGIONAL.value and len(parts) >= 3:
+            return ChartRegion.REGIONAL, parts[1], "-".join(parts[2:])
+        return None
+
+    @classmethod
+    async def get_views_for_week(cls, week: str) -> Optional[ChartViews]:
+        """
+        Get all charts for a specific week.
+
+        The current week is served from the current views. Older weeks are
+        loaded with an indexed lookup on `week`, built with the stored
+        movement fields, and kept in a small LRU since they never change.
+        """
+        current = await cls.get_current_views()
+        if current and current.week == week:
+            return current
+
+        cached = cls._week_cache.get(week)
+        if cached is not None:
+            cls._week_cache.move_to_end(week)
+            return cached
+
+        if Database.db is None:
+            return None
+
+        try:
+            chart_doc = await Database.charts().find_one({"week": week}, {"_id": 0})
+        except Exception as e:
+            logger.error(f"Error loading chart week {week} from MongoDB: {e}")
+            return None
+
+        if not chart_doc:
+            return None
+
+        views = cls._build_views(chart_doc, with_rank_changes=False)
+        cls._week_cache[week] = views
+        while len(cls._week_cache) > cls.WEEK_CACHE_SIZE:
+            cls._week_cache.popitem(last=False)
+
+        return views
+
     @classmethod
     async def list_charts(
         cls,
@@ -342,73 +694,20 @@ class ChartService:
         language: Optional[str] = None,
         limit: int = 10
     ) -> List[ChartSummary]:
-        """List available charts"""
+        """
+        List available charts
+
+        Reads the small per-week `chart_summaries` documents instead of
+        full chart documents, so cost doesn't grow with archive size.
+        """
         result = []
 
         # Try loading from MongoDB first
         if Database.db is not None:
             try:
-                # Query available weeks from MongoDB
-                cursor = Database.charts().find(
-                    {},
-                    {"week": 1, "chart": 1, "global_chart": 1, "regional": 1}
-                ).sort("week", -1).limit(limit)
-
-                async for chart_doc in cursor:
-                    week = chart_doc.get("week", "")
-
-                    # Add India chart summary
-                    if not region or region == ChartRegion.INDIA:
-                        chart_songs = chart_doc.get("chart", [])
-                        if chart_songs:
-                            result.append(ChartSummary(
-                                id=f"india-{week}",
-                                name="India Top 25",
-                                region=ChartRegion.INDIA,
-                                week=week,
-                                total_entries=len(chart_songs),
-                                top_song_title=chart_songs[0].get("title") if chart_songs else None,
-                                top_song_artist=chart_songs[0].get("artist") if chart_songs else None,
-                            ))
-
-                    # Add Global chart summary
-                    if not region or region == ChartRegion.GLOBAL:
-                        global_songs = chart_doc.get("global_chart", [])
-                        if global_songs:
-                            result.append(ChartSummary(
-                                id=f"global-{week}",
-                                name="Global Top 25",
-                                region=ChartRegion.GLOBAL,
-                                week=week,
-                                total_entries=len(global_songs),
-                                top_song_title=global_songs[0].get("title") if global_songs else None,
-                                top_song_artist=global_songs[0].get("artist") if global_songs else None,
-                            ))
-
-                    # Add Regional chart summaries
-                    if not region or region == ChartRegion.REGIONAL:
-                        regional_data = chart_doc.get("regional", {})
-                        for lang_key, region_chart in regional_data.items():
-                            if language and lang_key != language:
-                                continue
-                            regional_songs = region_chart.get("songs", [])
-                            region_name = region_chart.get("name", lang_key.title())
-                            if regional_songs:
-                                result.append(ChartSummary(
-                                    id=f"regional-{lang_key}-{week}",
-                                    name=f"{region_name} Top 10",
-                                    region=ChartRegion.REGIONAL,
-                                    week=week,
-                                    total_entries=len(regional_songs),
-                                    top_song_title=regional_songs[0].get("title") if regional_songs else None,
-                                    top_song_artist=regional_songs[0].get("artist") if regional_songs else None,
-                                ))
-
-                    if len(result) >= limit:
-                        break
-
+                result = await cls._query_summaries({}, region, language, limit)
                 if result:
-                    return result[:limit]
+                    return result
             except Exception as e:
                 logger.error(f"Error listing charts from MongoDB: {e}")
 
@@ -437,15 +736,134 @@ class ChartService:
 
         return result
 
+    @classmethod
+    async def _query_summaries(
+        cls,
+        query: dict,
+        region: Optional[ChartRegion],
+        language: Optional[str],
+        limit: int
+    ) -> List[ChartSummary]:
+        """Chart summaries for matching weeks, newest first"""
+        await cls._sync_chart_summaries()
+
+        result = []
+        cursor = Database.chart_summaries().find(query, {"_id": 0}).sort("week", -1)
+
+        async for doc in cursor:
+            result.extend(cls._summaries_from_doc(doc, region, language))
+            if len(result) >= limit:
+                break
+
+        return result[:limit]
+
+    @classmethod
+    def _summaries_from_doc(
+        cls,
+        doc: dict,
+        region: Optional[ChartRegion],
+        language: Optional[str]
+    ) -> List[ChartSummary]:
+        """Expand one week's summary document into ChartSummary items"""
+        week = doc.get("week", "")
+        result = []
+
+        # Add India chart summary
+        india = doc.get("india") or {}
+        if (not region or region == ChartRegion.INDIA) and india.get("total_entries"):
+            result.append(ChartSummary(
+                id=f"india-{week}",
+                name="India Top 25",
+                region=ChartRegion.INDIA,
+                week=week,
+                total_entries=india["total_entries"],
+                top_song_title=india.get("top_song_title"),
+                top_song_artist=india.get("top_song_artist"),
+            ))
+
+        # Add Global chart summary
+        global_chart = doc.get("global") or {}
+        if (not region or region == ChartRegion.GLOBAL) and global_chart.get("total_entries"):
+            result.append(ChartSummary(
+                id=f"global-{week}",
+                name="Global Top 25",
+                region=ChartRegion.GLOBAL,
+                week=week,
+                total_entries=global_chart["total_entries"],
+                top_song_title=global_chart.get("top_song_title"),
+                top_song_artist=global_chart.get("top_song_artist"),
+            ))
+
+        # Add Regional chart summaries
+        if not region or region == ChartRegion.REGIONAL:
+            for regional in doc.get("regional") or []:
+                lang_key = regional.get("key", "")
+                if language and lang_key != language:
+                    continue
+                if not regional.get("total_entries"):
+                    continue
+                region_name = regional.get("name") or lang_key.title()
+                result.append(ChartSummary(
+                    id=f"regional-{lang_key}-{week}",
+                    name=f"{region_name} Top 10",
+                    region=ChartRegion.REGIONAL,
+                    week=week,
+                    total_entries=regional["total_entries"],
+                    top_song_title=regional.get("top_song_title"),
+                    top_song_artist=regional.get("top_song_artist"),
+                ))
+
+        return result
+
+    @classmethod
+    async def _sync_chart_summaries(cls):
+        """
+        Backfill summaries for chart weeks that don't have one yet (e.g.
+        charts uploaded before summaries existed). Checked at most every
+        SUMMARY_SYNC_INTERVAL seconds; only week keys are compared, and
+        summaries are computed server-side.
+        """
+        now = time.monotonic()
+        if now - cls._summaries_synced_at < cls.SUMMARY_SYNC_INTERVAL:
+            return
+        cls._summaries_synced_at = now
+
+        chart_weeks = set(await Database.charts().distinct("week"))
+        summary_weeks = set(await Database.chart_summaries().distinct("week"))
+        missing = list(chart_weeks - summary_weeks)
+        if not missing:
+            return
+
+        cursor = Database.charts().aggregate([
+            {"$match": {"week": {"$in": missing}}},
+            {"$project": CHART_SUMMARY_PROJECTION}
+        ])
+        async for summary in cursor:
+            await Database.chart_summaries().replace_one(
+                {"week": summary["week"]}, summary, upsert=True
+            )
+        logger.info(f"Backfilled {len(missing)} chart summaries")
+
     @classmethod
     async def get_chart_history(
         cls,
         chart_id: str,
         limit: int = 10
     ) -> List[ChartSummary]:
-        """Get historical charts (placeholder for now)"""
-        # In production, would query historical charts from MongoDB
-        return []
+        """Get summaries of the same chart in earlier weeks"""
+        if Database.db is None:
+            return []
+
+        parsed = cls._parse_chart_id(chart_id)
+        if not parsed:
+            return []
+        region, language, week = parsed
+
+        try:
+            return await cls._query_summaries({"week": {"$lt": week}}, region, language, limit)
+        except Exception as e:
+            logger.error(f"Error loading chart history from MongoDB: {e}")
+            return []
 
     @classmethod
     async def _load_charts_from_files(cls) -> List[Chart]:
@@ -469,5 +887,8 @@ class ChartService:
 
     @classmethod
     def clear_cache(cls):
-        """Clear file cache"""
+        """Clear file and chart view caches"""
         cls._file_cache.clear()
+        cls._views_cache.clear()
+        cls._views_checked_at.clear()
+        cls._week_cache.clear()
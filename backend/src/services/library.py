@@ -1,8 +1,9 @@
 """
 Library Service - User favorites, history, playlists
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import uuid
 from bson import ObjectId
 
@@ -34,32 +35,78 @@ class LibraryService:
     @classmethod
     async def get_user_library(cls, user_id: str) -> UserLibrary:
         """Get complete user library"""
-        favorites = await cls.get_favorites(user_id, limit=100)
-        history = await cls.get_history(user_id, limit=50)
-        queue = await cls.get_queue(user_id)
-        playlists = await cls.get_user_playlists_full(user_id)
+        library, _ = await cls._load_library(user_id)
+        return library
 
-        return UserLibrary(
+    @classmethod
+    async def get_library_sync_state(
+        cls,
+        user_id: str
+    ) -> Tuple[UserLibrary, Dict[str, dict], dict, list]:
+        """
+        Everything a library sync returns, read concurrently.
+
+        Returns:
+            (library, playlist documents by playlist ID, preferences, recent searches)
+        """
+        (library, playlist_docs), preferences, recent_searches = await asyncio.gather(
+            cls._load_library(user_id),
+            cls.get_preferences(user_id),
+            cls.get_recent_searches(user_id),
+        )
+        return library, playlist_docs, preferences, recent_searches
+
+    @classmethod
+    async def _load_library(cls, user_id: str) -> Tuple[UserLibrary, Dict[str, dict]]:
+        """
+        Read favorites, history, queue and playlists concurrently.
+        The raw playlist documents are returned too, keyed by playlist ID.
+        """
+        favorites, history, queue, docs = await asyncio.gather(
+            cls.get_favorites(user_id, limit=100),
+            cls.get_history(user_id, limit=50),
+            cls.get_queue(user_id),
+            cls._get_playlist_docs(user_id),
+        )
+
+        playlists = []
+        playlist_docs = {}
+        for playlist, doc in cls._playlists_from_docs(user_id, docs):
+            playlists.append(playlist)
+            playlist_docs.setdefault(playlist.id, doc)
+
+        library = UserLibrary(
             user_id=user_id,
             favorites=favorites,
             history=history,
             queue=queue,
             playlists=playlists,
         )
+        return library, playlist_docs
 
     @classmethod
     async def get_user_playlists_full(cls, user_id: str) -> List[Playlist]:
         """Get user's playlists with full details from MongoDB"""
+        docs = await cls._get_playlist_docs(user_id)
+        return [playlist for playlist, _ in cls._playlists_from_docs(user_id, docs)]
+
+    @classmethod
+    async def _get_playlist_docs(cls, user_id: str) -> List[dict]:
+        """All of a user's playlist documents, newest first"""
         cursor = Database.playlists().find(
             {"user_id": user_id}
         ).sort("created_at", -1)
+        return await cursor.to_list(length=None)
 
+    @classmethod
+    def _playlists_from_docs(cls, user_id: str, docs: List[dict]) -> List[Tuple[Playlist, dict]]:
+        """Build Playlists from documents, skipping malformed ones"""
         playlists = []
-        async for doc in cursor:
+        for doc in docs:
             try:
                 playlist_id = str(doc.get("_id")) if "_id" in doc and "id" not in doc else doc.get("id", str(doc.get("_id")))
 
-                playlists.append(Playlist(
+                playlists.append((Playlist(
                     id=playlist_id,
                     user_id=user_id,
                     name=doc.get("name", "Untitled"),
@@ -70,7 +117,7 @@ class LibraryService:
                     total_tracks=len(doc.get("song_ids", [])),
                     created_at=doc.get("created_at", datetime.utcnow()),
                     updated_at=doc.get("updated_at", datetime.utcnow()),
-                ))
+                ), doc))
             except Exception:
                 continue
 
@@ -122,13 +169,11 @@ class LibraryService:
     @classmethod
     async def add_favorite(cls, user_id: str, song_id: str) -> bool:
         """Add song to favorites"""
-        song = await SongService.get_song_by_id(song_id)
-        if not song:
+        snapshot = (await SongService.get_snapshots([song_id])).get(song_id)
+        if not snapshot:
             return False
 
         # Create favorite entry
-        artists_map = await SongService._load_artists_map()
-        snapshot = SongService._to_snapshot(song, artists_map)
 
         favorite_doc = {
             "user_id": user_id,
@@ -227,13 +272,10 @@ class LibraryService:
         source: str = "chart"
     ):
         """Add song to history"""
-        song = await SongService.get_song_by_id(song_id)
-        if not song:
+        snapshot = (await SongService.get_snapshots([song_id])).get(song_id)
+        if not snapshot:
             return
 
-        artists_map = await SongService._load_artists_map()
-        snapshot = SongService._to_snapshot(song, artists_map)
-
         # Parse source
         try:
             play_source = PlaySource(source)
@@ -391,9 +433,18 @@ class LibraryService:
         cursor = Database.playlists().find(
             {"user_id": user_id}
         ).sort("created_at", -1)
+        docs = await cursor.to_list(length=None)
+
+        # Resolve every cover song in one lookup
+        first_song_ids = [
+            doc["song_ids"][0]
+            for doc in docs
+            if not doc.get("cover_image") and doc.get("song_ids")
+        ]
+        snapshots = await SongService.get_snapshots(first_song_ids)
 
         playlists = []
-        async for doc in cursor:
+        for doc in docs:
             try:
                 playlist_id = str(doc.get("_id")) if "_id" in doc else doc.get("id")
                 song_ids = doc.get("song_ids", [])
@@ -401,9 +452,9 @@ class LibraryService:
                 # Get cover image from first song if available
                 cover_image = doc.get("cover_image")
                 if not cover_image and song_ids:
-                    first_song = await SongService.get_song_by_id(song_ids[0])
+                    first_song = snapshots.get(song_ids[0])
                     if first_song:
-                        cover_image = first_song.get("image_url") or first_song.get("artwork_url")
+                        cover_image = first_song.artwork_url
 
                 summary = PlaylistSummary(
                     id=playlist_id,
@@ -599,8 +650,7 @@ class LibraryService:
     ) -> bool:
         """Add song to playlist"""
         # Verify song exists
-        song = await SongService.get_song_by_id(song_id)
-        if not song:
+        if not await SongService.get_snapshots([song_id]):
             return False
 
         # Build query conditions for id, client_id, and _id
@@ -690,15 +740,26 @@ class LibraryService:
             if pid:
                 client_ids.add(pid)
 
+        # Read the user's playlists once, for deletes and for matching below
+        server_docs = await cls._get_playlist_docs(user_id)
+
         # Delete playlists on server that are not in client's list
         # This handles the case where user deleted a playlist
-        server_playlists = Database.playlists().find({"user_id": user_id})
-        async for doc in server_playlists:
+        stale_ids = []
+        existing_docs = {}
+        for doc in server_docs:
             server_id = doc.get("id", str(doc.get("_id")))
             client_id = doc.get("client_id", "")
             # If neither server_id nor client_id is in the client's list, delete it
             if server_id not in client_ids and client_id not in client_ids:
-                await Database.playlists().delete_one({"_id": doc["_id"]})
+                stale_ids.append(doc["_id"])
+                continue
+            for key in (doc.get("id"), client_id):
+                if key:
+                    existing_docs.setdefault(key, doc)
+
+        if stale_ids:
+            await Database.playlists().delete_many({"_id": {"$in": stale_ids}})
 
         for playlist_data in playlists:
             client_id = playlist_data.get("id", "")
@@ -749,13 +810,7 @@ class LibraryService:
                     })
 
             # Check if playlist with this client ID already exists for this user
-            existing = await Database.playlists().find_one({
-                "user_id": user_id,
-                "$or": [
-                    {"id": client_id},
-                    {"client_id": client_id}
-                ]
-            })
+            existing = existing_docs.get(client_id) if client_id else None
 
             if existing:
                 # Update existing playlist
@@ -798,6 +853,8 @@ class LibraryService:
                     playlist_doc["custom_artwork"] = custom_artwork
 
                 await Database.playlists().insert_one(playlist_doc)
+                if client_id:
+                    existing_docs.setdefault(client_id, playlist_doc)
 
             # Use custom artwork if available, otherwise first song artwork
             artwork_url = custom_artwork or (song_snapshots[0].get("artwork_url") if song_snapshots else None)
@@ -29,6 +29,8 @@ class RankHistoryService:
     _instance = None
     _history: Dict[str, Dict[str, Dict[str, Any]]] = {}
     _history_file: Path = None
+    # Bumped whenever history changes, so derived caches can invalidate
+    version: int = 0
 
     def __new__(cls):
         if cls._instance is None:
@@ -106,6 +108,7 @@ class RankHistoryService:
             }
 
         self._history[chart_type][date_str] = snapshot
+        self.version += 1
         self._save_history()
 
         print(f"Recorded snapshot for {chart_type} on {date_str}: {len(snapshot)} songs")
@@ -274,6 +277,7 @@ class RankHistoryService:
             self._history.pop(chart_type, None)
         else:
             self._history = {}
+        self.version += 1
         self._save_history()
 
 
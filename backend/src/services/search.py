@@ -1,22 +1,297 @@
 """
 Search Service - Full-text search across entities
 """
-from typing import List, Optional, Dict, Any
-import re
+from typing import List, Optional, Dict, Any, Set
+import asyncio
+import logging
 
-from ..models import SongSnapshot, ArtistSummary, AlbumSummary, PlaylistSummary
+from ..models import Song, Artist, SongSnapshot, ArtistSummary, AlbumSummary, PlaylistSummary
+from ..config import Database, settings
 from .song import SongService
 from .artist import ArtistService
+from .search_backend import SearchBackend, LocalSearchBackend, TypesenseSearchBackend
+
+logger = logging.getLogger(__name__)
+
+# Harvester language names -> ISO 639-1 codes used by the catalog
+HARVESTER_LANGUAGES = {
+    "hindi": "hi",
+    "english": "en",
+    "tamil": "ta",
+    "telugu": "te",
+    "punjabi": "pa",
+    "bengali": "bn",
+    "kannada": "kn",
+    "malayalam": "ml",
+    "bhojpuri": "bh",
+    "marathi": "mr",
+    "gujarati": "gu",
+    "haryanvi": "hr",
+}
+
+SONG_PROJECTION = {
+    "_id": 0, "id": 1, "title": 1, "artist_ids": 1, "artist": 1, "language": 1,
+    "genres": 1, "artwork": 1, "artwork_url": 1, "sources": 1, "youtube_video_id": 1,
+    "duration_ms": 1, "play_count": 1,
+}
+ARTIST_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "images": 1, "verified": 1, "genres": 1,
+    "languages": 1, "monthly_listeners": 1,
+}
+HARVESTER_PROJECTION = {
+    "_id": 0, "video_id": 1, "title": 1, "artist": 1, "thumbnails": 1,
+    "duration_seconds": 1, "language": 1, "genre": 1, "views": 1,
+}
 
 
 class SearchService:
     """
     Handles search operations
 
-    In production, would use Typesense or Elasticsearch.
-    For development, uses simple in-memory search.
+    Queries go to a pluggable SearchBackend: Typesense when
+    SEARCH_BACKEND=typesense and it is reachable, otherwise the in-process
+    LocalSearchBackend. With Typesense and MongoDB, `reindex` bulk-loads
+    songs, artists and the harvester catalog. The local backend is for
+    tests and offline use: it only ever holds the development catalog,
+    never the full MongoDB/harvester catalog. New charts are upserted into
+    either backend as they appear.
     """
 
+    _backend: Optional[SearchBackend] = None
+    _backend_lock = asyncio.Lock()
+    _tasks: Set[asyncio.Task] = set()
+
+    # Development catalog currently in the backend
+    _indexed_sources: tuple = (None, None)
+    _file_song_ids: Set[str] = set()
+    _file_artist_ids: Set[str] = set()
+
+    # Chart document last indexed: (week, generated_at)
+    _indexed_chart: Optional[tuple] = None
+
+    # Documents per upsert during bulk indexing
+    REINDEX_BATCH_SIZE = 1000
+
+    @classmethod
+    async def start(cls):
+        """Select the search backend and start bulk indexing if needed"""
+        await cls.get_backend()
+
+    @classmethod
+    async def close(cls):
+        """Stop background indexing and close the backend"""
+        for task in list(cls._tasks):
+            task.cancel()
+        if cls._backend is not None:
+            await cls._backend.close()
+            cls._backend = None
+        cls._indexed_sources = (None, None)
+        cls._indexed_chart = None
+
+    @classmethod
+    async def get_backend(cls) -> SearchBackend:
+        """The active backend, created on first use"""
+        if cls._backend is not None:
+            return cls._backend
+
+        async with cls._backend_lock:
+            if cls._backend is None:
+                backend = await cls._create_backend()
+
+                if Database.db is not None:
+                    if isinstance(backend, LocalSearchBackend):
+                        logger.warning(
+                            "MongoDB is connected but search is local: only the "
+                            "development catalog and current chart are searchable. "
+                            "Set SEARCH_BACKEND=typesense in production."
+                        )
+                    elif not (await backend.count())["songs"]:
+                        # Typesense keeps its index; fill it once when empty
+                        cls._spawn(cls.reindex(backend))
+
+                cls._backend = backend
+
+        return cls._backend
+
+    @classmethod
+    async def _create_backend(cls) -> SearchBackend:
+        if settings.SEARCH_BACKEND == "typesense":
+            if not settings.TYPESENSE_API_KEY:
+                logger.warning("SEARCH_BACKEND=typesense but TYPESENSE_API_KEY is not set, using local search")
+            else:
+                backend = TypesenseSearchBackend(
+                    host=settings.TYPESENSE_HOST,
+                    port=settings.TYPESENSE_PORT,
+                    api_key=settings.TYPESENSE_API_KEY,
+                    protocol=settings.TYPESENSE_PROTOCOL,
+                )
+                try:
+                    await backend.start()
+                    logger.info(f"Search backend: Typesense at {settings.TYPESENSE_HOST}")
+                    return backend
+                except Exception as e:
+                    logger.warning(f"Typesense unavailable ({e}), using local search")
+                    await backend.close()
+
+        logger.info("Search backend: local")
+        return LocalSearchBackend()
+
+    @classmethod
+    def _spawn(cls, coro):
+        """Run indexing in the background, keeping a reference to the task"""
+        task = asyncio.create_task(coro)
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    async def _ensure_index(cls) -> SearchBackend:
+        """Index the development catalog, re-syncing only when it was reloaded"""
+        backend = await cls.get_backend()
+
+        # With Typesense and MongoDB, the catalog is indexed by `reindex`
+        if Database.db is not None and not isinstance(backend, LocalSearchBackend):
+            return backend
+
+        songs = await SongService._load_songs_from_files()
+        artists = await ArtistService._load_artists_from_files()
+
+        if cls._indexed_sources[0] is songs and cls._indexed_sources[1] is artists:
+            return backend
+
+        artists_map = await SongService._load_artists_map()
+
+        song_docs = [_song_doc_from_model(song, artists_map) for song in songs]
+        artist_docs = [_artist_doc_from_model(artist) for artist in artists]
+
+        song_ids = {doc["id"] for doc in song_docs}
+        artist_ids = {doc["id"] for doc in artist_docs}
+
+        await backend.delete_songs(cls._file_song_ids - song_ids)
+        await backend.delete_artists(cls._file_artist_ids - artist_ids)
+        await backend.upsert_songs(song_docs)
+        await backend.upsert_artists(artist_docs)
+
+        cls._file_song_ids = song_ids
+        cls._file_artist_ids = artist_ids
+        cls._indexed_sources = (songs, artists)
+
+        return backend
+
+    @classmethod
+    async def reindex(cls, backend: Optional[SearchBackend] = None) -> Dict[str, int]:
+        """
+        Bulk index MongoDB songs and artists and the harvester catalog.
+
+        Documents are streamed with projections and upserted in batches,
+        so memory stays bounded by REINDEX_BATCH_SIZE. Requires Typesense:
+        the full catalog is never loaded into process memory.
+        """
+        backend = backend or await cls.get_backend()
+        counts = {"songs": 0, "artists": 0, "harvester_songs": 0}
+
+        if isinstance(backend, LocalSearchBackend):
+            logger.warning("Search reindex skipped: bulk indexing requires Typesense")
+            return counts
+
+        if Database.db is not None:
+            try:
+                artist_names: Dict[str, str] = {}
+                batch = []
+                async for doc in Database.artists().find({}, ARTIST_PROJECTION):
+                    if not doc.get("id") or not doc.get("name"):
+                        continue
+                    artist_names[doc["id"]] = doc["name"]
+                    batch.append(_artist_doc_from_mongo(doc))
+                    if len(batch) >= cls.REINDEX_BATCH_SIZE:
+                        counts["artists"] += await backend.upsert_artists(batch)
+                        batch = []
+                if batch:
+                    counts["artists"] += await backend.upsert_artists(batch)
+
+                batch = []
+                async for doc in Database.songs().find({}, SONG_PROJECTION):
+                    if not doc.get("id") or not doc.get("title"):
+                        continue
+                    batch.append(_song_doc_from_mongo(doc, artist_names))
+                    if len(batch) >= cls.REINDEX_BATCH_SIZE:
+                        counts["songs"] += await backend.upsert_songs(batch)
+                        batch = []
+                if batch:
+                    counts["songs"] += await backend.upsert_songs(batch)
+            except Exception as e:
+                logger.error(f"Error indexing catalog from MongoDB: {e}")
+
+        try:
+            from ..api.routes.curated import get_harvester_db
+
+            batch = []
+            cursor = get_harvester_db()["youtube_music_songs"].find(
+                {"video_id": {"$ne": None}},
+                HARVESTER_PROJECTION
+            )
+            async for doc in cursor:
+                if not doc.get("title"):
+                    continue
+                batch.append(_song_doc_from_harvester(doc))
+                if len(batch) >= cls.REINDEX_BATCH_SIZE:
+                    counts["harvester_songs"] += await backend.upsert_songs(batch, partial=True)
+                    batch = []
+            if batch:
+                counts["harvester_songs"] += await backend.upsert_songs(batch, partial=True)
+        except Exception as e:
+            logger.error(f"Error indexing harvester catalog: {e}")
+
+        logger.info(
+            f"Search reindex ({backend.name}): {counts['songs']} songs, "
+            f"{counts['artists']} artists, {counts['harvester_songs']} harvester songs"
+        )
+        return counts
+
+    @classmethod
+    def index_chart_in_background(cls, chart_key: tuple, views):
+        """
+        Upsert the songs of a newly loaded chart document.
+
+        Called when the current chart changes (i.e. after an upload);
+        each chart document is indexed once.
+        """
+        if cls._indexed_chart == chart_key:
+            return
+        cls._indexed_chart = chart_key
+        cls._spawn(cls._index_chart(views))
+
+    @classmethod
+    async def _index_chart(cls, views):
+        docs: Dict[str, Dict[str, Any]] = {}
+
+        charts = [(views.india, None), (views.global_chart, None)]
+        charts += [(chart, code) for code, chart in views.regional.items()]
+
+        for chart, language in charts:
+            if chart is None:
+                continue
+            for entry in chart.entries:
+                if not entry.song_id or not entry.song_title:
+                    continue
+                doc = docs.setdefault(entry.song_id, {
+                    "id": entry.song_id,
+                    "title": entry.song_title,
+                    "artist": entry.song_artist,
+                    "artwork_url": entry.artwork_url or None,
+                    "youtube_video_id": entry.youtube_video_id or None,
+                    "popularity": entry.youtube_views or 0,
+                })
+                # Regional charts tell us the song's language
+                if language:
+                    doc["language"] = language
+
+        try:
+            backend = await cls.get_backend()
+            indexed = await backend.upsert_songs(list(docs.values()), partial=True)
+            logger.info(f"Indexed {indexed} chart songs for week {views.week}")
+        except Exception as e:
+            logger.error(f"Error indexing chart songs: {e}")
+
     @classmethod
     async def search(
         cls,
@@ -59,68 +334,36 @@ class SearchService:
         cls,
         query: str,
         language: Optional[str] = None,
+        genre: Optional[str] = None,
         limit: int = 25
     ) -> List[SongSnapshot]:
         """
-        Search songs by title or artist
-
-        Uses simple string matching for development.
-        Production should use Typesense/Elasticsearch.
+        Search songs by title or artist, optionally filtered by
+        language and genre
         """
-        songs = await SongService._load_songs_from_files()
-        artists_map = await SongService._load_artists_map()
-
-        query_lower = query.lower().strip()
-        query_words = query_lower.split()
-
-        results = []
-        scores = []
+        backend = await cls._ensure_index()
+        page = await backend.search_songs(query, language=language, genre=genre, limit=limit)
+        return [_song_doc_to_snapshot(doc) for doc in page.hits]
 
-        for song in songs:
-            if language and song.language != language:
-                continue
-
-            # Get artist name
-            artist_name = ""
-            if song.artist_ids:
-                artist = artists_map.get(song.artist_ids[0])
-                if artist:
-                    artist_name = artist.get("name", "").lower()
-
-            title_lower = song.title.lower()
-
-            # Calculate match score
-            score = 0
-
-            # Exact title match
-            if query_lower == title_lower:
-                score = 100
-            # Title starts with query
-            elif title_lower.startswith(query_lower):
-                score = 80
-            # Query words in title
-            elif all(word in title_lower for word in query_words):
-                score = 60
-            # Partial title match
-            elif query_lower in title_lower:
-                score = 40
-            # Artist match
-            elif query_lower in artist_name:
-                score = 30
-            # Any word matches
-            elif any(word in title_lower or word in artist_name for word in query_words):
-                score = 20
-
-            if score > 0:
-                results.append((score, song))
-
-        # Sort by score descending
-        results.sort(key=lambda x: x[0], reverse=True)
-
-        return [
-            SongService._to_snapshot(song, artists_map)
-            for score, song in results[:limit]
-        ]
+    @classmethod
+    async def get_song_facets(
+        cls,
+        query: str,
+        language: Optional[str] = None,
+        genre: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Language and genre counts for songs matching a query
+        """
+        backend = await cls._ensure_index()
+        page = await backend.search_songs(
+            query, language=language, genre=genre, limit=1, facets=True
+        )
+        return {
+            "found": page.found,
+            "language": page.facets.get("language", {}),
+            "genres": page.facets.get("genres", {}),
+        }
 
     @classmethod
     async def search_artists(
@@ -131,42 +374,17 @@ class SearchService:
         """
         Search artists by name
         """
-        artists = await ArtistService._load_artists_from_files()
-
-        query_lower = query.lower().strip()
-        query_words = query_lower.split()
-
-        results = []
-
-        for artist in artists:
-            name_lower = artist.name.lower()
-
-            # Calculate match score
-            score = 0
-
-            if query_lower == name_lower:
-                score = 100
-            elif name_lower.startswith(query_lower):
-                score = 80
-            elif query_lower in name_lower:
-                score = 50
-            elif any(word in name_lower for word in query_words):
-                score = 30
-
-            if score > 0:
-                results.append((score, artist))
-
-        # Sort by score descending
-        results.sort(key=lambda x: x[0], reverse=True)
+        backend = await cls._ensure_index()
+        page = await backend.search_artists(query, limit=limit)
 
         return [
             ArtistSummary(
-                id=artist.id,
-                name=artist.name,
-                image_url=artist.images.thumbnail if artist.images else None,
-                verified=artist.verified,
+                id=doc["id"],
+                name=doc["name"],
+                image_url=doc.get("image_url"),
+                verified=doc.get("verified") or False,
             )
-            for score, artist in results[:limit]
+            for doc in page.hits
         ]
 
     @classmethod
@@ -181,25 +399,119 @@ class SearchService:
         if len(query) < 2:
             return []
 
-        songs = await SongService._load_songs_from_files()
-        artists = await ArtistService._load_artists_from_files()
-
-        query_lower = query.lower().strip()
-
-        suggestions = set()
-
-        # Song titles
-        for song in songs:
-            if song.title.lower().startswith(query_lower):
-                suggestions.add(song.title)
-            if len(suggestions) >= limit * 2:
-                break
-
-        # Artist names
-        for artist in artists:
-            if artist.name.lower().startswith(query_lower):
-                suggestions.add(artist.name)
-            if len(suggestions) >= limit * 2:
-                break
-
-        return list(suggestions)[:limit]
+        backend = await cls._ensure_index()
+        return await backend.suggest(query, limit=limit)
+
+
+def _song_doc_from_model(song: Song, artists_map: dict) -> Dict[str, Any]:
+    """Search document for a catalog song"""
+    snapshot = SongService._to_snapshot(song, artists_map)
+
+    # Primary artist name, left empty (not "Unknown Artist") so it isn't searchable
+    artist_name = ""
+    if song.artist_ids:
+        artist = artists_map.get(song.artist_ids[0])
+        if artist:
+            artist_name = artist.get("name", "")
+
+    return {
+        "id": song.id,
+        "title": song.title,
+        "artist": artist_name,
+        "artist_ids": song.artist_ids,
+        "language": song.language,
+        "genres": song.genres,
+        "artwork_url": snapshot.artwork_url,
+        "youtube_video_id": snapshot.youtube_video_id,
+        "duration_ms": song.duration_ms,
+        "popularity": song.play_count,
+    }
+
+
+def _song_doc_from_mongo(doc: dict, artist_names: Dict[str, str]) -> Dict[str, Any]:
+    """Search document for a song from the `songs` collection"""
+    artist_ids = doc.get("artist_ids") or []
+    artist = artist_names.get(artist_ids[0], "") if artist_ids else ""
+
+    youtube_id = doc.get("youtube_video_id")
+    for source in doc.get("sources") or []:
+        if source.get("provider") == "youtube":
+            youtube_id = source.get("id")
+            break
+
+    return {
+        "id": doc["id"],
+        "title": doc["title"],
+        "artist": artist or doc.get("artist") or "",
+        "artist_ids": artist_ids,
+        "language": doc.get("language"),
+        "genres": doc.get("genres") or [],
+        "artwork_url": (doc.get("artwork") or {}).get("large") or doc.get("artwork_url"),
+        "youtube_video_id": youtube_id,
+        "duration_ms": doc.get("duration_ms"),
+        "popularity": doc.get("play_count") or 0,
+    }
+
+
+def _song_doc_from_harvester(doc: dict) -> Dict[str, Any]:
+    """Search document for a harvester song, keyed by its video ID like chart songs"""
+    artwork_url = None
+    thumbnails = doc.get("thumbnails")
+    if isinstance(thumbnails, list) and thumbnails:
+        artwork_url = max(thumbnails, key=lambda t: t.get("width", 0)).get("url")
+
+    language = doc.get("language")
+    if language:
+        language = HARVESTER_LANGUAGES.get(language.lower(), language.lower())
+
+    duration = doc.get("duration_seconds")
+
+    return {
+        "id": doc["video_id"],
+        "title": doc["title"],
+        "artist": doc.get("artist") or "",
+        "language": language,
+        "genres": [doc["genre"]] if doc.get("genre") else [],
+        "artwork_url": artwork_url,
+        "youtube_video_id": doc["video_id"],
+        "duration_ms": int(duration * 1000) if duration else None,
+        "popularity": doc.get("views") or 0,
+    }
+
+
+def _artist_doc_from_model(artist: Artist) -> Dict[str, Any]:
+    """Search document for a catalog artist"""
+    return {
+        "id": artist.id,
+        "name": artist.name,
+        "image_url": artist.images.thumbnail if artist.images else None,
+        "verified": artist.verified,
+        "genres": artist.genres,
+        "languages": artist.languages,
+        "popularity": artist.monthly_listeners,
+    }
+
+
+def _artist_doc_from_mongo(doc: dict) -> Dict[str, Any]:
+    """Search document for an artist from the `artists` collection"""
+    return {
+        "id": doc["id"],
+        "name": doc["name"],
+        "image_url": (doc.get("images") or {}).get("thumbnail"),
+        "verified": doc.get("verified", False),
+        "genres": doc.get("genres") or [],
+        "languages": doc.get("languages") or [],
+        "popularity": doc.get("monthly_listeners") or 0,
+    }
+
+
+def _song_doc_to_snapshot(doc: Dict[str, Any]) -> SongSnapshot:
+    """Search hit -> SongSnapshot"""
+    return SongSnapshot(
+        id=doc["id"],
+        title=doc["title"],
+        artist=doc.get("artist") or "Unknown Artist",
+        artwork_url=doc.get("artwork_url"),
+        youtube_video_id=doc.get("youtube_video_id"),
+        duration_ms=doc.get("duration_ms"),
+    )
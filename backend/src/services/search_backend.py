@@ -0,0 +1,513 @@
+"""
+Search Backends - Pluggable search engines for SearchService
+
+Songs and artists are indexed as flat documents carrying everything a
+search result needs, so results never require a catalog lookup:
+
+    song:   id, title, artist, artist_ids, language, genres,
+            artwork_url, youtube_video_id, duration_ms, popularity
+    artist: id, name, image_url, verified, genres, languages, popularity
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+import heapq
+import itertools
+import json
+import logging
+
+import httpx
+
+from .search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Fields returned as facet counts for song searches
+SONG_FACETS = ("language", "genres")
+
+
+class SearchPage:
+    """One page of search hits, with facet counts when requested"""
+
+    def __init__(
+        self,
+        hits: List[Dict[str, Any]],
+        found: int = 0,
+        facets: Optional[Dict[str, Dict[str, int]]] = None
+    ):
+        self.hits = hits
+        self.found = found
+        self.facets = facets or {}
+
+
+class SearchBackend(ABC):
+    """
+    Interface implemented by every search engine.
+
+    `partial` upserts only touch the given fields of an existing
+    document (e.g. chart data must not wipe a song's genres).
+    """
+
+    name = "base"
+
+    async def start(self):
+        """Prepare the engine (connections, collections)"""
+
+    async def close(self):
+        """Release connections"""
+
+    @abstractmethod
+    async def count(self) -> Dict[str, int]:
+        """Number of indexed songs and artists"""
+
+    @abstractmethod
+    async def upsert_songs(self, docs: List[Dict[str, Any]], partial: bool = False) -> int:
+        """Add or update songs, returning how many were indexed"""
+
+    @abstractmethod
+    async def upsert_artists(self, docs: List[Dict[str, Any]], partial: bool = False) -> int:
+        """Add or update artists, returning how many were indexed"""
+
+    @abstractmethod
+    async def delete_songs(self, ids: Iterable[str]):
+        """Remove songs"""
+
+    @abstractmethod
+    async def delete_artists(self, ids: Iterable[str]):
+        """Remove artists"""
+
+    @abstractmethod
+    async def search_songs(
+        self,
+        query: str,
+        language: Optional[str] = None,
+        genre: Optional[str] = None,
+        limit: int = 25,
+        facets: bool = False
+    ) -> SearchPage:
+        """Search songs by title and artist, tolerating typos"""
+
+    @abstractmethod
+    async def search_artists(self, query: str, limit: int = 10) -> SearchPage:
+        """Search artists by name, tolerating typos"""
+
+    @abstractmethod
+    async def suggest(self, query: str, limit: int = 5) -> List[str]:
+        """Song titles and artist names starting with the query"""
+
+
+class LocalSearchBackend(SearchBackend):
+    """
+    In-process search engine built on SearchIndex.
+
+    Used in development, tests and whenever Typesense is not configured
+    or unreachable. Matches query words against the start of title and
+    artist words, scored like the original substring search; words with
+    no match fall back to close spellings.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self.index = SearchIndex()
+        self.songs: Dict[str, Dict[str, Any]] = {}
+        self.artists: Dict[str, Dict[str, Any]] = {}
+
+        # Insertion order breaks score ties, like a stable sort over the catalog
+        self._order = itertools.count()
+        self._song_order: Dict[str, int] = {}
+        self._artist_order: Dict[str, int] = {}
+
+    async def count(self) -> Dict[str, int]:
+        return {"songs": len(self.songs), "artists": len(self.artists)}
+
+    async def upsert_songs(self, docs: List[Dict[str, Any]], partial: bool = False) -> int:
+        for doc in docs:
+            song_id = doc["id"]
+            if partial and song_id in self.songs:
+                # Like Typesense's emplace: unset (None) fields keep their value
+                doc = {**self.songs[song_id], **{k: v for k, v in doc.items() if v is not None}}
+            self.songs[song_id] = doc
+            self._song_order.setdefault(song_id, next(self._order))
+            self.index.set_song(song_id, doc.get("title") or "", doc.get("artist") or "", doc.get("language"))
+        return len(docs)
+
+    async def upsert_artists(self, docs: List[Dict[str, Any]], partial: bool = False) -> int:
+        for doc in docs:
+            artist_id = doc["id"]
+            if partial and artist_id in self.artists:
+                # Like Typesense's emplace: unset (None) fields keep their value
+                doc = {**self.artists[artist_id], **{k: v for k, v in doc.items() if v is not None}}
+            self.artists[artist_id] = doc
+            self._artist_order.setdefault(artist_id, next(self._order))
+            self.index.set_artist(artist_id, doc.get("name") or "")
+        return len(docs)
+
+    async def delete_songs(self, ids: Iterable[str]):
+        for song_id in ids:
+            self.songs.pop(song_id, None)
+            self._song_order.pop(song_id, None)
+            self.index.remove_song(song_id)
+
+    async def delete_artists(self, ids: Iterable[str]):
+        for artist_id in ids:
+            self.artists.pop(artist_id, None)
+            self._artist_order.pop(artist_id, None)
+            self.index.remove_artist(artist_id)
+
+    async def search_songs(
+        self,
+        query: str,
+        language: Optional[str] = None,
+        genre: Optional[str] = None,
+        limit: int = 25,
+        facets: bool = False
+    ) -> SearchPage:
+        query_lower = query.lower().strip()
+        query_words = query_lower.split()
+
+        tokens = self.index.song_tokens
+        candidates = tokens.candidates(query_lower)
+        fuzzy = tokens.fuzzy_candidates(query_lower)
+
+        results = []
+        facet_counts: Dict[str, Dict[str, int]] = {field: {} for field in SONG_FACETS}
+
+        for song_id in candidates | fuzzy:
+            doc = self.songs[song_id]
+            if language and doc.get("language") != language:
+                continue
+            if genre and genre not in (doc.get("genres") or []):
+                continue
+
+            _, title_lower, artist_name, _ = self.index.songs[song_id]
+
+            # Calculate match score
+            score = 0
+
+            # Exact title match
+            if query_lower == title_lower:
+                score = 100
+            # Title starts with query
+            elif title_lower.startswith(query_lower):
+                score = 80
+            # Query words in title
+            elif all(word in title_lower for word in query_words):
+                score = 60
+            # Partial title match
+            elif query_lower in title_lower:
+                score = 40
+            # Artist match
+            elif query_lower in artist_name:
+                score = 30
+            # Any word matches
+            elif any(word in title_lower or word in artist_name for word in query_words):
+                score = 20
+            # Close spelling
+            elif song_id in fuzzy:
+                score = 10
+
+            if score > 0:
+                results.append((-score, self._song_order[song_id], song_id))
+                if facets:
+                    _count_facets(facet_counts, doc)
+
+        # Best scores first, insertion order breaking ties
+        hits = [self.songs[song_id] for _, _, song_id in heapq.nsmallest(limit, results)]
+        return SearchPage(hits, found=len(results), facets=facet_counts if facets else None)
+
+    async def search_artists(self, query: str, limit: int = 10) -> SearchPage:
+        query_lower = query.lower().strip()
+        query_words = query_lower.split()
+
+        tokens = self.index.artist_tokens
+        candidates = tokens.candidates(query_lower)
+        fuzzy = tokens.fuzzy_candidates(query_lower)
+
+        results = []
+
+        for artist_id in candidates | fuzzy:
+            _, name_lower = self.index.artists[artist_id]
+
+            # Calculate match score
+            score = 0
+
+            if query_lower == name_lower:
+                score = 100
+            elif name_lower.startswith(query_lower):
+                score = 80
+            elif query_lower in name_lower:
+                score = 50
+            elif any(word in name_lower for word in query_words):
+                score = 30
+            elif artist_id in fuzzy:
+                score = 10
+
+            if score > 0:
+                results.append((-score, self._artist_order[artist_id], artist_id))
+
+        hits = [self.artists[artist_id] for _, _, artist_id in heapq.nsmallest(limit, results)]
+        return SearchPage(hits, found=len(results))
+
+    async def suggest(self, query: str, limit: int = 5) -> List[str]:
+        query_lower = query.lower().strip()
+
+        # Ordered, de-duplicated
+        suggestions: Dict[str, None] = {}
+
+        # Song titles
+        for _, title, _ in self.index.song_titles.starts_with(query_lower):
+            suggestions[title] = None
+            if len(suggestions) >= limit * 2:
+                break
+
+        # Artist names
+        if len(suggestions) < limit * 2:
+            for _, name, _ in self.index.artist_names.starts_with(query_lower):
+                suggestions[name] = None
+                if len(suggestions) >= limit * 2:
+                    break
+
+        return list(suggestions)[:limit]
+
+
+def _count_facets(facet_counts: Dict[str, Dict[str, int]], doc: Dict[str, Any]):
+    """Add a document's language and genres to facet counts"""
+    language = doc.get("language")
+    if language:
+        counts = facet_counts["language"]
+        counts[language] = counts.get(language, 0) + 1
+    for genre in doc.get("genres") or []:
+        counts = facet_counts["genres"]
+        counts[genre] = counts.get(genre, 0) + 1
+
+
+class TypesenseSearchBackend(SearchBackend):
+    """
+    Typesense search engine, talking to its REST API over a pooled
+    httpx client.
+
+    Collections are created on start if missing. Typo tolerance, prefix
+    matching and faceting are handled by Typesense itself; results are
+    ranked by text match, then popularity.
+    """
+
+    name = "typesense"
+
+    SONGS = "songs"
+    ARTISTS = "artists"
+
+    # Documents per import request
+    IMPORT_BATCH_SIZE = 1000
+    # IDs per delete-by-filter request
+    DELETE_BATCH_SIZE = 200
+
+    SCHEMAS = {
+        SONGS: {
+            "name": SONGS,
+            "fields": [
+                {"name": "title", "type": "string"},
+                {"name": "artist", "type": "string", "optional": True},
+                {"name": "artist_ids", "type": "string[]", "optional": True},
+                {"name": "language", "type": "string", "facet": True, "optional": True},
+                {"name": "genres", "type": "string[]", "facet": True, "optional": True},
+                {"name": "artwork_url", "type": "string", "index": False, "optional": True},
+                {"name": "youtube_video_id", "type": "string", "index": False, "optional": True},
+                {"name": "duration_ms", "type": "int64", "index": False, "optional": True},
+                {"name": "popularity", "type": "int64"},
+            ],
+            "default_sorting_field": "popularity",
+        },
+        ARTISTS: {
+            "name": ARTISTS,
+            "fields": [
+                {"name": "name", "type": "string"},
+                {"name": "image_url", "type": "string", "index": False, "optional": True},
+                {"name": "verified", "type": "bool", "optional": True},
+                {"name": "genres", "type": "string[]", "facet": True, "optional": True},
+                {"name": "languages", "type": "string[]", "facet": True, "optional": True},
+                {"name": "popularity", "type": "int64"},
+            ],
+            "default_sorting_field": "popularity",
+        },
+    }
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        api_key: str,
+        protocol: str = "http",
+        timeout: float = 5.0
+    ):
+        self._client = httpx.AsyncClient(
+            base_url=f"{protocol}://{host}:{port}",
+            headers={"X-TYPESENSE-API-KEY": api_key},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+
+    async def start(self):
+        """Create the songs and artists collections if they don't exist"""
+        for name, schema in self.SCHEMAS.items():
+            response = await self._client.get(f"/collections/{name}")
+            if response.status_code == 404:
+                logger.info(f"Creating Typesense collection '{name}'")
+                response = await self._client.post("/collections", json=schema)
+            response.raise_for_status()
+
+    async def close(self):
+        await self._client.aclose()
+
+    async def count(self) -> Dict[str, int]:
+        counts = {}
+        for key, name in (("songs", self.SONGS), ("artists", self.ARTISTS)):
+            response = await self._client.get(f"/collections/{name}")
+            response.raise_for_status()
+            counts[key] = response.json().get("num_documents", 0)
+        return counts
+
+    async def upsert_songs(self, docs: List[Dict[str, Any]], partial: bool = False) -> int:
+        return await self._import(self.SONGS, docs, partial)
+
+    async def upsert_artists(self, docs: List[Dict[str, Any]], partial: bool = False) -> int:
+        return await self._import(self.ARTISTS, docs, partial)
+
+    async def delete_songs(self, ids: Iterable[str]):
+        await self._delete(self.SONGS, ids)
+
+    async def delete_artists(self, ids: Iterable[str]):
+        await self._delete(self.ARTISTS, ids)
+
+    async def _import(self, collection: str, docs: List[Dict[str, Any]], partial: bool) -> int:
+        """Bulk import JSONL in batches; `emplace` keeps fields not sent"""
+        action = "emplace" if partial else "upsert"
+        indexed = 0
+
+        for start in range(0, len(docs), self.IMPORT_BATCH_SIZE):
+            batch = docs[start:start + self.IMPORT_BATCH_SIZE]
+            body = "\n".join(
+                json.dumps({k: v for k, v in doc.items() if v is not None}, ensure_ascii=False)
+                for doc in batch
+            )
+            response = await self._client.post(
+                f"/collections/{collection}/documents/import",
+                params={"action": action},
+                content=body.encode("utf-8"),
+                headers={"Content-Type": "text/plain"},
+            )
+            response.raise_for_status()
+
+            errors = []
+            for line in response.text.splitlines():
+                result = json.loads(line)
+                if result.get("success"):
+                    indexed += 1
+                else:
+                    errors.append(result.get("error"))
+            if errors:
+                logger.warning(
+                    f"Typesense import into '{collection}': {len(errors)} failed, "
+                    f"first error: {errors[0]}"
+                )
+
+        return indexed
+
+    async def _delete(self, collection: str, ids: Iterable[str]):
+        """Delete documents by ID using filter_by in batches"""
+        ids = list(ids)
+        for start in range(0, len(ids), self.DELETE_BATCH_SIZE):
+            batch = ids[start:start + self.DELETE_BATCH_SIZE]
+            response = await self._client.delete(
+                f"/collections/{collection}/documents",
+                params={"filter_by": f"id:[{','.join(_quote(i) for i in batch)}]"},
+            )
+            response.raise_for_status()
+
+    async def _search(self, collection: str, params: Dict[str, Any]) -> SearchPage:
+        response = await self._client.get(f"/collections/{collection}/documents/search", params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        facets = {
+            facet["field_name"]: {count["value"]: count["count"] for count in facet.get("counts", [])}
+            for facet in data.get("facet_counts", [])
+        }
+        return SearchPage(
+            [hit["document"] for hit in data.get("hits", [])],
+            found=data.get("found", 0),
+            facets=facets,
+        )
+
+    async def search_songs(
+        self,
+        query: str,
+        language: Optional[str] = None,
+        genre: Optional[str] = None,
+        limit: int = 25,
+        facets: bool = False
+    ) -> SearchPage:
+        params = {
+            "q": query,
+            "query_by": "title,artist",
+            "query_by_weights": "2,1",
+            "num_typos": "2,1",
+            "prefix": "true",
+            "sort_by": "_text_match:desc,popularity:desc",
+            "per_page": min(limit, 250),
+        }
+
+        filters = []
+        if language:
+            filters.append(f"language:={_quote(language)}")
+        if genre:
+            filters.append(f"genres:={_quote(genre)}")
+        if filters:
+            params["filter_by"] = " && ".join(filters)
+
+        if facets:
+            params["facet_by"] = ",".join(SONG_FACETS)
+            params["max_facet_values"] = 20
+
+        return await self._search(self.SONGS, params)
+
+    async def search_artists(self, query: str, limit: int = 10) -> SearchPage:
+        return await self._search(self.ARTISTS, {
+            "q": query,
+            "query_by": "name",
+            "num_typos": 2,
+            "prefix": "true",
+            "sort_by": "_text_match:desc,popularity:desc",
+            "per_page": min(limit, 250),
+        })
+
+    async def suggest(self, query: str, limit: int = 5) -> List[str]:
+        songs = await self._search(self.SONGS, {
+            "q": query,
+            "query_by": "title",
+            "prefix": "true",
+            "num_typos": 0,
+            "include_fields": "title",
+            "per_page": limit * 2,
+        })
+        artists = await self._search(self.ARTISTS, {
+            "q": query,
+            "query_by": "name",
+            "prefix": "true",
+            "num_typos": 0,
+            "include_fields": "name",
+            "per_page": limit,
+        })
+
+        # Ordered, de-duplicated
+        suggestions: Dict[str, None] = {}
+        for hit in songs.hits:
+            suggestions[hit["title"]] = None
+        for hit in artists.hits:
+            suggestions[hit["name"]] = None
+
+        return list(suggestions)[:limit]
+
+
+def _quote(value: str) -> str:
+    """Quote a filter value so commas and operators are taken literally"""
+    return "`" + value.replace("`", "") + "`"
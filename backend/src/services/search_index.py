@@ -0,0 +1,216 @@
+"""
+Search Index - In-memory inverted index for catalog search
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from bisect import bisect_left, insort
+import difflib
+import re
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a string"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class PrefixTable:
+    """
+    Sorted table of (lowercased text, display text, doc id) for
+    "starts with" lookups in O(log n + k).
+    """
+
+    def __init__(self):
+        self._rows: List[Tuple[str, str, str]] = []
+
+    def add(self, doc_id: str, text: str):
+        if text:
+            insort(self._rows, (text.lower(), text, doc_id))
+
+    def remove(self, doc_id: str, text: str):
+        if not text:
+            return
+        row = (text.lower(), text, doc_id)
+        i = bisect_left(self._rows, row)
+        if i < len(self._rows) and self._rows[i] == row:
+            del self._rows[i]
+
+    def starts_with(self, prefix: str) -> Iterable[Tuple[str, str, str]]:
+        """Rows whose lowercased text starts with `prefix`, in sorted order"""
+        i = bisect_left(self._rows, (prefix,))
+        while i < len(self._rows) and self._rows[i][0].startswith(prefix):
+            yield self._rows[i]
+            i += 1
+
+
+class TokenIndex:
+    """
+    Inverted index of normalized tokens -> document IDs.
+
+    Tokens are also kept in a sorted list, so prefix queries touch only
+    the matching tokens. Documents can be added, replaced and removed
+    individually, so the index is updated incrementally on reload.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        self._sorted_tokens: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def set(self, doc_id: str, texts: Iterable[str]):
+        """Index a document's texts, replacing any previous version"""
+        tokens = set()
+        for text in texts:
+            if text:
+                tokens.update(tokenize(text))
+
+        old_tokens = self._doc_tokens.get(doc_id, set())
+        for token in old_tokens - tokens:
+            self._unpost(token, doc_id)
+        for token in tokens - old_tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                ids = self._postings[token] = set()
+                insort(self._sorted_tokens, token)
+            ids.add(doc_id)
+
+        self._doc_tokens[doc_id] = tokens
+
+    def remove(self, doc_id: str):
+        """Drop a document from the index"""
+        for token in self._doc_tokens.pop(doc_id, set()):
+            self._unpost(token, doc_id)
+
+    def _unpost(self, token: str, doc_id: str):
+        ids = self._postings.get(token)
+        if ids is None:
+            return
+        ids.discard(doc_id)
+        if not ids:
+            del self._postings[token]
+            i = bisect_left(self._sorted_tokens, token)
+            if i < len(self._sorted_tokens) and self._sorted_tokens[i] == token:
+                del self._sorted_tokens[i]
+
+    def match_prefix(self, prefix: str) -> Set[str]:
+        """IDs of documents with a token starting with `prefix`"""
+        result: Set[str] = set()
+        i = bisect_left(self._sorted_tokens, prefix)
+        while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(prefix):
+            result |= self._postings[self._sorted_tokens[i]]
+            i += 1
+        return result
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Whether any token starts with `prefix`"""
+        i = bisect_left(self._sorted_tokens, prefix)
+        return i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(prefix)
+
+    def candidates(self, query: str) -> Set[str]:
+        """IDs of documents where any query word prefixes a token"""
+        result: Set[str] = set()
+        for word in tokenize(query):
+            result |= self.match_prefix(word)
+        return result
+
+    def match_fuzzy(self, word: str, max_tokens: int = 5) -> Set[str]:
+        """
+        IDs of documents with a token close to `word` (typo tolerance).
+
+        Only tokens sharing the first letter are compared, which keeps the
+        scan to a small slice of the sorted token list.
+        """
+        if not word:
+            return set()
+        lo = bisect_left(self._sorted_tokens, word[0])
+        hi = bisect_left(self._sorted_tokens, chr(ord(word[0]) + 1))
+        cutoff = 0.8 if len(word) <= 5 else 0.75
+
+        result: Set[str] = set()
+        for token in difflib.get_close_matches(word, self._sorted_tokens[lo:hi], max_tokens, cutoff):
+            result |= self._postings[token]
+        return result
+
+    def fuzzy_candidates(self, query: str, min_length: int = 4) -> Set[str]:
+        """IDs matching, with typos, any query word that has no prefix match"""
+        result: Set[str] = set()
+        for word in tokenize(query):
+            if len(word) >= min_length and not self.has_prefix(word):
+                result |= self.match_fuzzy(word)
+        return result
+
+
+class SearchIndex:
+    """
+    Song and artist search index built once from the catalog.
+
+    Songs keep their precomputed, lowercased title and primary artist
+    name; artists keep their lowercased name. `sync` diffs a fresh catalog
+    against what is indexed and only re-indexes changed documents.
+    """
+
+    def __init__(self):
+        self.song_tokens = TokenIndex()
+        self.artist_tokens = TokenIndex()
+        self.song_titles = PrefixTable()
+        self.artist_names = PrefixTable()
+
+        # Song ID -> (title, title_lower, artist_name_lower, language)
+        self.songs: Dict[str, Tuple[str, str, str, Optional[str]]] = {}
+        # Artist ID -> (name, name_lower)
+        self.artists: Dict[str, Tuple[str, str]] = {}
+
+    def set_song(self, song_id: str, title: str, artist_name: str, language: Optional[str]):
+        """Add or update a song"""
+        entry = (title, title.lower(), artist_name.lower(), language)
+        current = self.songs.get(song_id)
+        if current == entry:
+            return
+
+        if current:
+            self.song_titles.remove(song_id, current[0])
+        self.songs[song_id] = entry
+        self.song_tokens.set(song_id, (title, artist_name))
+        self.song_titles.add(song_id, title)
+
+    def remove_song(self, song_id: str):
+        current = self.songs.pop(song_id, None)
+        if current:
+            self.song_tokens.remove(song_id)
+            self.song_titles.remove(song_id, current[0])
+
+    def set_artist(self, artist_id: str, name: str):
+        """Add or update an artist"""
+        entry = (name, name.lower())
+        current = self.artists.get(artist_id)
+        if current == entry:
+            return
+
+        if current:
+            self.artist_names.remove(artist_id, current[0])
+        self.artists[artist_id] = entry
+        self.artist_tokens.set(artist_id, (name,))
+        self.artist_names.add(artist_id, name)
+
+    def remove_artist(self, artist_id: str):
+        current = self.artists.pop(artist_id, None)
+        if current:
+            self.artist_tokens.remove(artist_id)
+            self.artist_names.remove(artist_id, current[0])
+
+    def sync_songs(self, songs: Dict[str, Tuple[str, str, Optional[str]]]):
+        """Bring songs in line with `songs` (ID -> (title, artist name, language))"""
+        for song_id in set(self.songs) - set(songs):
+            self.remove_song(song_id)
+        for song_id, (title, artist_name, language) in songs.items():
+            self.set_song(song_id, title, artist_name, language)
+
+    def sync_artists(self, artists: Dict[str, str]):
+        """Bring artists in line with `artists` (ID -> name)"""
+        for artist_id in set(self.artists) - set(artists):
+            self.remove_artist(artist_id)
+        for artist_id, name in artists.items():
+            self.set_artist(artist_id, name)
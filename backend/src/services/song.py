@@ -1,32 +1,40 @@
 """
 Song Service - Business logic for songs
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 import json
 from pathlib import Path
 
 from ..models import Song, SongSnapshot, Lyrics
-from ..config import Database
+from ..config import settings
+from .catalog_repository import TTLCache, get_catalog_repository
 
 
 class SongService:
     """
     Handles song operations
+
+    Songs are read through the catalog repository: MongoDB when
+    connected, otherwise the JSON files below.
     """
 
     # Cache for file-based songs (development mode)
     _file_cache: dict = {}
 
+    # Song ID -> SongSnapshot, shared by all requests. Unknown IDs are not
+    # cached here: this doubles as the existence check for library writes
+    _snapshot_cache = TTLCache(settings.CATALOG_CACHE_SIZE, settings.CATALOG_CACHE_TTL_SECONDS)
+
     @classmethod
     async def get_song_by_id(cls, song_id: str) -> Optional[Song]:
         """Get song by ID"""
-        songs = await cls._load_songs_from_files()
-
-        for song in songs:
-            if song.id == song_id:
-                return song
+        songs = await get_catalog_repository().get_songs([song_id])
+        return songs.get(song_id)
 
-        return None
+    @classmethod
+    async def get_songs_by_ids(cls, song_ids: Iterable[str]) -> Dict[str, Song]:
+        """Get several songs by ID in one lookup (unknown IDs are left out)"""
+        return await get_catalog_repository().get_songs(song_ids)
 
     @classmethod
     async def get_lyrics(cls, song_id: str) -> Optional[Lyrics]:
@@ -47,28 +55,8 @@ class SongService:
 
         Based on: same artist, same language, same genre
         """
-        songs = await cls._load_songs_from_files()
-        artists = await cls._load_artists_map()
-
-        related = []
-        for s in songs:
-            if s.id == song.id:
-                continue
-
-            # Same artist
-            if set(s.artist_ids) & set(song.artist_ids):
-                related.append(cls._to_snapshot(s, artists))
-                continue
-
-            # Same language
-            if s.language == song.language and song.language:
-                related.append(cls._to_snapshot(s, artists))
-                continue
-
-            if len(related) >= limit:
-                break
-
-        return related[:limit]
+        related = await get_catalog_repository().get_related_songs(song, limit)
+        return await cls.to_snapshots(related)
 
     @classmethod
     async def list_songs(
@@ -79,19 +67,8 @@ class SongService:
         offset: int = 0
     ) -> List[SongSnapshot]:
         """List songs with optional filters"""
-        songs = await cls._load_songs_from_files()
-        artists = await cls._load_artists_map()
-
-        result = []
-        for song in songs:
-            if language and song.language != language:
-                continue
-            if genre and genre not in song.genres:
-                continue
-
-            result.append(cls._to_snapshot(song, artists))
-
-        return result[offset:offset + limit]
+        songs = await get_catalog_repository().list_songs(language, genre, limit, offset)
+        return await cls.to_snapshots(songs)
 
     @classmethod
     async def increment_play_count(cls, song_id: str):
@@ -99,6 +76,43 @@ class SongService:
         # In production, this would update MongoDB
         pass
 
+    @classmethod
+    async def get_snapshots(cls, song_ids: Iterable[str]) -> Dict[str, SongSnapshot]:
+        """
+        Hydrate snapshots for every song a response needs.
+
+        Cached snapshots are served from a shared LRU; the rest are resolved
+        together (one song lookup, one artist lookup) however many IDs are
+        requested. Unknown IDs are left out.
+        """
+        song_ids = list(dict.fromkeys(i for i in song_ids if i))
+        snapshots: Dict[str, SongSnapshot] = {}
+        missing = []
+
+        for song_id in song_ids:
+            hit, snapshot = cls._snapshot_cache.lookup(song_id)
+            if hit:
+                snapshots[song_id] = snapshot
+            else:
+                missing.append(song_id)
+
+        if missing:
+            songs = await cls.get_songs_by_ids(missing)
+            loaded = dict(zip(songs, await cls.to_snapshots(list(songs.values()))))
+            for song_id, snapshot in loaded.items():
+                cls._snapshot_cache.set(song_id, snapshot)
+            snapshots.update(loaded)
+
+        return {song_id: snapshots[song_id] for song_id in song_ids if song_id in snapshots}
+
+    @classmethod
+    async def to_snapshots(cls, songs: List[Song]) -> List[SongSnapshot]:
+        """Convert Songs to SongSnapshots, resolving artist names in one lookup"""
+        artist_ids = {song.artist_ids[0] for song in songs if song.artist_ids}
+        names = await get_catalog_repository().get_artist_names(artist_ids)
+        artists = {artist_id: {"name": name} for artist_id, name in names.items()}
+        return [cls._to_snapshot(song, artists) for song in songs]
+
     @classmethod
     def _to_snapshot(cls, song: Song, artists: dict) -> SongSnapshot:
         """Convert Song to SongSnapshot"""
@@ -167,5 +181,7 @@ class SongService:
 
     @classmethod
     def clear_cache(cls):
-        """Clear file cache"""
+        """Clear file and catalog caches"""
         cls._file_cache.clear()
+        cls._snapshot_cache.clear()
+        get_catalog_repository().clear_cache()